@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2020, muradm <mail@muradm.net>
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+'''
+Startup cost of action plugins: time to import action plugin and build
+schema definitions it validates against, measured in fresh interpreters
+with Ansible and cerberus already imported, as every action pays for them.
+Every action is compared to "all", which resolves every export of
+module_utils/linode and builds every schema definition, that is what each
+action paid for when exports were eager.
+
+    python3 benchmarks/imports.py --runs 20
+'''
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import argparse
+import json
+import os
+import sys
+
+from shutil import rmtree
+from statistics import median
+from subprocess import check_output
+from tempfile import mkdtemp
+
+
+IMPORT_DEFINITIONS = {
+    'instance': ['instance_key', 'instance_create', 'instance_update'],
+    'volume': ['volume_key', 'volume_create', 'volume_update', 'volume_remove'],
+    'domain': ['domain_key', 'domain_create', 'domain_update'],
+    'domain_record': ['domain_record_key', 'domain_record'],
+    'balancer': ['balancer_key', 'balancer_create', 'balancer_update'],
+    'balancer_config': ['balancer_config_key', 'balancer_config_create', 'balancer_config_update'],
+    'balancer_node': ['balancer_node_key', 'balancer_node_create', 'balancer_node_update'],
+    'wait': ['wait'],
+}
+
+_CHILD = '''
+import json, sys
+sys.path.insert(0, %(path)r)
+import ansible.plugins.action
+import cerberus
+from importlib import import_module
+from time import perf_counter
+
+base = 'ansible_collections.muradm.linode.plugins'
+before = set(sys.modules.keys())
+started = perf_counter()
+
+if %(action)r == 'all':
+    linode = import_module(base + '.module_utils.linode')
+    for name in linode.__all__:
+        getattr(linode, name)
+    definitions = list(import_module(base + '.module_utils.linode.validator')._definitions.keys())
+else:
+    import_module(base + '.action.' + %(action)r)
+    definitions = %(definitions)r
+
+schema = import_module(base + '.module_utils.linode').linode_schema()
+for definition in definitions:
+    schema.get(definition)
+
+elapsed = perf_counter() - started
+loaded = [m for m in set(sys.modules.keys()) - before]
+
+print(json.dumps({
+    'elapsed': elapsed,
+    'modules': len(loaded),
+    'collection_modules': len([m for m in loaded if m.startswith(base + '.module_utils')]),
+    'definitions': len(schema.schemas),
+}))
+'''
+
+
+def _collections_path(workdir):
+    # collection is imported right from the source tree
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    os.makedirs(os.path.join(workdir, 'ansible_collections', 'muradm'))
+    os.symlink(root, os.path.join(workdir, 'ansible_collections', 'muradm', 'linode'))
+    return workdir
+
+
+def measure(path, action, runs):
+    samples = []
+
+    for _ in range(runs):
+        output = check_output([sys.executable, '-c', _CHILD % {
+            'path': path,
+            'action': action,
+            'definitions': IMPORT_DEFINITIONS.get(action, []),
+        }])
+        samples.append(json.loads(output.decode('utf-8')))
+
+    result = dict(samples[-1])
+    result['elapsed'] = median([s['elapsed'] for s in samples])
+
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measures startup cost of action plugins')
+    parser.add_argument('--runs', type=int, default=10, help='interpreters per action, median is taken')
+    parser.add_argument('--actions', default=','.join(sorted(IMPORT_DEFINITIONS.keys())),
+                        help='comma separated actions, defaults to all')
+    parser.add_argument('--json', help='file to write results to')
+    args = parser.parse_args()
+
+    workdir = mkdtemp(prefix='linode-imports-')
+    results = {}
+
+    try:
+        path = _collections_path(workdir)
+        for action in ['all'] + args.actions.split(','):
+            results[action] = measure(path, action, args.runs)
+    finally:
+        rmtree(workdir, ignore_errors=True)
+
+    full = results['all']['elapsed']
+
+    print('%-16s %10s %8s %8s %12s %8s' % ('action', 'ms', 'saved', 'modules', 'collection', 'schemas'))
+    for action, r in results.items():
+        print('%-16s %10.2f %7.0f%% %8d %12d %8d' % (
+            action, r['elapsed'] * 1000, (1 - r['elapsed'] / full) * 100 if full else 0,
+            r['modules'], r['collection_modules'], r['definitions']))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
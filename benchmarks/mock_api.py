@@ -0,0 +1,864 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2020, muradm <mail@muradm.net>
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+'''
+Local stand-in for the parts of Linode API v4 used by this collection:
+instances and their IPs, volumes, domains and records, nodebalancers with
+their configs and nodes, account events of instances and volumes. Supports
+pagination, X-Filter, latency and error injection. Besides API, it serves
+control endpoints under /_mock:
+
+    GET  /_mock/stats   requests served, total and per endpoint
+    POST /_mock/reset   drops all objects and stats
+    POST /_mock/seed    creates objects, {"domains": [{...}], ...}
+    POST /_mock/config  changes latency, jitter, error_rate, error_status,
+                        page_size, provision_time at runtime
+
+    python3 benchmarks/mock_api.py --port 8080 --latency 0.05
+'''
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import argparse
+import json
+import re
+
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from random import random, uniform
+from threading import Lock, Thread
+from time import sleep, time
+from urllib.parse import parse_qs, urlparse
+
+
+MOCK_PAGE_SIZE_MAX = 500
+
+_ID = r'([0-9]+)'
+
+
+class MockState(object):
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, error_status=503, page_size=100, provision_time=0.0):
+        self.lock = Lock()
+        self.config = {
+            'latency': latency,
+            'jitter': jitter,
+            'error_rate': error_rate,
+            'error_status': error_status,
+            'page_size': page_size,
+            'provision_time': provision_time,
+        }
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.next_id = 1
+            self.next_ip = 1
+            self.instances = {}
+            self.ips = {}
+            self.volumes = {}
+            self.domains = {}
+            self.records = {}
+            self.nodebalancers = {}
+            self.configs = {}
+            self.nodes = {}
+            self.events = {}
+            self.ready = {}
+            self.stats = {'requests': 0, 'errors': 0, 'endpoints': {}}
+
+    def id(self):
+        self.next_id = self.next_id + 1
+        return self.next_id - 1
+
+    def address(self, private=False):
+        n = self.next_ip
+        self.next_ip = self.next_ip + 1
+        prefix = '192.168' if private else '10.100'
+        return '%s.%d.%d' % (prefix, n // 250, n % 250 + 1)
+
+    def count(self, endpoint, error=False):
+        with self.lock:
+            self.stats['requests'] = self.stats['requests'] + 1
+            if error:
+                self.stats['errors'] = self.stats['errors'] + 1
+            self.stats['endpoints'][endpoint] = self.stats['endpoints'].get(endpoint, 0) + 1
+
+
+class MockError(Exception):
+    def __init__(self, status, reason, field=None):
+        super(MockError, self).__init__(reason)
+        self.status = status
+        self.reason = reason
+        self.field = field
+
+
+def _now():
+    return datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%S')
+
+
+def _required(data, *fields):
+    for f in fields:
+        if data.get(f, None) in [None, '']:
+            raise MockError(400, '%s is required' % f, f)
+
+
+def _get(collection, key, what):
+    obj = collection.get(key, None)
+    if obj is None:
+        raise MockError(404, 'Not found', what)
+    return obj
+
+
+def _unique(collection, field, value):
+    for obj in collection.values():
+        if obj[field] == value:
+            raise MockError(400, '%s must be unique' % field, field)
+
+
+def _updated(obj, data, fields):
+    for f in fields:
+        if f in data:
+            obj[f] = data[f]
+    obj['updated'] = _now()
+    return obj
+
+
+def _matches(obj, flt):
+    for key, expected in flt.items():
+        if key == '+and':
+            if not all(_matches(obj, f) for f in expected):
+                return False
+        elif key == '+or':
+            if not any(_matches(obj, f) for f in expected):
+                return False
+        elif key.startswith('+'):
+            continue
+        elif not _field_matches(obj.get(key, None), expected):
+            return False
+
+    return True
+
+
+def _field_matches(value, expected):
+    if isinstance(expected, dict):
+        for op, operand in expected.items():
+            if op == '+gt' and not (value is not None and value > operand):
+                return False
+            if op == '+gte' and not (value is not None and value >= operand):
+                return False
+            if op == '+lt' and not (value is not None and value < operand):
+                return False
+            if op == '+lte' and not (value is not None and value <= operand):
+                return False
+            if op == '+neq' and value == operand:
+                return False
+            if op == '+contains' and (value is None or str(operand) not in str(value)):
+                return False
+        return True
+
+    if isinstance(value, list):
+        return expected in value
+
+    return value == expected
+
+
+class MockApi(object):
+    '''
+    Request router and object store. Every handler gets state, matched url
+    groups and request body, and returns JSON serializable response or
+    raises MockError.
+    '''
+
+    def __init__(self, state):
+        self.state = state
+        self.routes = []
+
+        self.route('GET', '/account/events', self.events_list)
+
+        self.route('GET', '/linode/instances', self.instances_list)
+        self.route('POST', '/linode/instances', self.instance_create)
+        self.route('GET', '/linode/instances/%s' % _ID, self.instance_get)
+        self.route('PUT', '/linode/instances/%s' % _ID, self.instance_update)
+        self.route('DELETE', '/linode/instances/%s' % _ID, self.instance_delete)
+        self.route('GET', '/linode/instances/%s/ips' % _ID, self.instance_ips)
+
+        self.route('POST', '/networking/ips', self.ip_allocate)
+        self.route('GET', r'/networking/ips/([0-9.]+)', self.ip_get)
+        self.route('PUT', r'/networking/ips/([0-9.]+)', self.ip_update)
+
+        self.route('GET', '/volumes', self.volumes_list)
+        self.route('POST', '/volumes', self.volume_create)
+        self.route('GET', '/volumes/%s' % _ID, self.volume_get)
+        self.route('PUT', '/volumes/%s' % _ID, self.volume_update)
+        self.route('DELETE', '/volumes/%s' % _ID, self.volume_delete)
+        self.route('POST', '/volumes/%s/attach' % _ID, self.volume_attach)
+        self.route('POST', '/volumes/%s/detach' % _ID, self.volume_detach)
+        self.route('POST', '/volumes/%s/resize' % _ID, self.volume_resize)
+
+        self.route('GET', '/domains', self.domains_list)
+        self.route('POST', '/domains', self.domain_create)
+        self.route('GET', '/domains/%s' % _ID, self.domain_get)
+        self.route('PUT', '/domains/%s' % _ID, self.domain_update)
+        self.route('DELETE', '/domains/%s' % _ID, self.domain_delete)
+        self.route('GET', '/domains/%s/records' % _ID, self.records_list)
+        self.route('POST', '/domains/%s/records' % _ID, self.record_create)
+        self.route('GET', '/domains/%s/records/%s' % (_ID, _ID), self.record_get)
+        self.route('PUT', '/domains/%s/records/%s' % (_ID, _ID), self.record_update)
+        self.route('DELETE', '/domains/%s/records/%s' % (_ID, _ID), self.record_delete)
+
+        self.route('GET', '/nodebalancers', self.nodebalancers_list)
+        self.route('POST', '/nodebalancers', self.nodebalancer_create)
+        self.route('GET', '/nodebalancers/%s' % _ID, self.nodebalancer_get)
+        self.route('PUT', '/nodebalancers/%s' % _ID, self.nodebalancer_update)
+        self.route('DELETE', '/nodebalancers/%s' % _ID, self.nodebalancer_delete)
+        self.route('GET', '/nodebalancers/%s/configs' % _ID, self.configs_list)
+        self.route('POST', '/nodebalancers/%s/configs' % _ID, self.config_create)
+        self.route('GET', '/nodebalancers/%s/configs/%s' % (_ID, _ID), self.config_get)
+        self.route('PUT', '/nodebalancers/%s/configs/%s' % (_ID, _ID), self.config_update)
+        self.route('DELETE', '/nodebalancers/%s/configs/%s' % (_ID, _ID), self.config_delete)
+        self.route('GET', '/nodebalancers/%s/configs/%s/nodes' % (_ID, _ID), self.nodes_list)
+        self.route('POST', '/nodebalancers/%s/configs/%s/nodes' % (_ID, _ID), self.node_create)
+        self.route('GET', '/nodebalancers/%s/configs/%s/nodes/%s' % (_ID, _ID, _ID), self.node_get)
+        self.route('PUT', '/nodebalancers/%s/configs/%s/nodes/%s' % (_ID, _ID, _ID), self.node_update)
+        self.route('DELETE', '/nodebalancers/%s/configs/%s/nodes/%s' % (_ID, _ID, _ID), self.node_delete)
+
+    def route(self, method, pattern, handler):
+        self.routes.append((method, re.compile('^%s$' % pattern), pattern.replace(_ID, '{id}'), handler))
+
+    def resolve(self, method, path):
+        for m, pattern, endpoint, handler in self.routes:
+            if m != method:
+                continue
+            match = pattern.match(path)
+            if match is not None:
+                return (endpoint, handler, [int(g) if g.isdigit() else g for g in match.groups()])
+
+        return (path, None, None)
+
+    def page(self, objects, query, flt):
+        if flt:
+            objects = [o for o in objects if _matches(o, flt)]
+            order_by = flt.get('+order_by', None)
+            if order_by is not None:
+                objects = sorted(objects, key=lambda o: o.get(order_by, None),
+                                 reverse=flt.get('+order', 'asc') == 'desc')
+
+        size = int(query.get('page_size', [self.state.config['page_size']])[0])
+        size = max(25, min(size, MOCK_PAGE_SIZE_MAX))
+        pages = max(1, (len(objects) + size - 1) // size)
+        page = int(query.get('page', ['1'])[0])
+        start = (page - 1) * size
+
+        return {
+            'data': objects[start:start + size],
+            'page': page,
+            'pages': pages,
+            'results': len(objects),
+        }
+
+    def _ready(self, obj, pending, ready):
+        due = self.state.ready.get((pending, obj['id']), None)
+        if obj['status'] == pending and (due is None or due <= time()):
+            obj['status'] = ready
+            self.state.ready.pop((pending, obj['id']), None)
+        return obj
+
+    def _provisioning(self, obj, pending):
+        delay = self.state.config['provision_time']
+        if delay > 0:
+            obj['status'] = pending
+            self.state.ready[(pending, obj['id'])] = time() + delay
+
+    def _event(self, action, entity_type, obj, label=None, pending=False):
+        s = self.state
+        eid = s.id()
+        event = {
+            'id': eid, 'action': action, 'status': 'finished', 'created': _now(),
+            'entity': {'id': obj['id'], 'type': entity_type, 'label': label or obj.get('label', None),
+                       'url': '/v4/%s/%d' % (entity_type, obj['id'])},
+            'percent_complete': 100, 'seen': False, 'read': False, 'username': 'bench',
+            'time_remaining': None, 'rate': None,
+        }
+        if pending and s.config['provision_time'] > 0:
+            event['status'] = 'started'
+            event['percent_complete'] = 0
+            s.ready[('started', eid)] = time() + s.config['provision_time']
+        s.events[eid] = event
+
+    def events_list(self, q, f, d):
+        events = [self._ready(e, 'started', 'finished') for e in self.state.events.values()]
+        for e in events:
+            if e['status'] == 'finished':
+                e['percent_complete'] = 100
+        if f is None or '+order_by' not in f:
+            events = sorted(events, key=lambda e: e['id'], reverse=True)
+        return self.page(events, q, f)
+
+    # instances
+
+    def instances_list(self, q, f, d):
+        return self.page([self._ready(i, 'provisioning', 'running') for i in self.state.instances.values()], q, f)
+
+    def instance_create(self, q, f, d):
+        _required(d, 'region', 'type')
+        label = d.get('label', None) or 'linode%d' % self.state.next_id
+        _unique(self.state.instances, 'label', label)
+
+        s = self.state
+        iid = s.id()
+        public = s.address()
+        s.ips[public] = {
+            'address': public, 'gateway': None, 'linode_id': iid, 'prefix': 24,
+            'public': True, 'rdns': '%s.ip.linodeusercontent.com' % public.replace('.', '-'),
+            'region': d['region'], 'subnet_mask': '255.255.255.0', 'type': 'ipv4',
+        }
+
+        instance = {
+            'id': iid, 'label': label, 'region': d['region'], 'type': d['type'],
+            'image': d.get('image', None), 'group': d.get('group', ''),
+            'tags': d.get('tags', []), 'status': 'running',
+            'ipv4': [public], 'ipv6': '2600:3c00::f03c:91ff:fe24:%x/64' % iid,
+            'hypervisor': 'kvm', 'watchdog_enabled': True,
+            'alerts': {}, 'backups': {'enabled': False, 'schedule': {}},
+            'specs': {'disk': 25600, 'memory': 1024, 'transfer': 1000, 'vcpus': 1},
+            'created': _now(), 'updated': _now(),
+        }
+        self._provisioning(instance, 'provisioning')
+        s.instances[iid] = instance
+
+        self._event('linode_create', 'linode', instance)
+        if instance['image'] is not None:
+            self._event('linode_boot', 'linode', instance, pending=True)
+
+        return instance
+
+    def instance_get(self, q, f, d, iid):
+        return self._ready(_get(self.state.instances, iid, 'linode'), 'provisioning', 'running')
+
+    def instance_update(self, q, f, d, iid):
+        return _updated(_get(self.state.instances, iid, 'linode'), d, ['label', 'group', 'tags', 'watchdog_enabled'])
+
+    def instance_delete(self, q, f, d, iid):
+        instance = _get(self.state.instances, iid, 'linode')
+        for v in self.state.volumes.values():
+            if v['linode_id'] == iid:
+                v['linode_id'] = None
+                v['linode_label'] = None
+        for address in list(self.state.ips.keys()):
+            if self.state.ips[address]['linode_id'] == instance['id']:
+                del self.state.ips[address]
+        del self.state.instances[iid]
+        self._event('linode_delete', 'linode', instance)
+        return {}
+
+    def instance_ips(self, q, f, d, iid):
+        _get(self.state.instances, iid, 'linode')
+        ips = [ip for ip in self.state.ips.values() if ip['linode_id'] == iid]
+        v6 = {
+            'address': 'fe80::f03c:91ff:fe24:%x' % iid, 'prefix': 64, 'rdns': None,
+            'linode_id': iid, 'public': False, 'type': 'ipv6', 'region': None,
+            'gateway': 'fe80::1', 'subnet_mask': 'ffff:ffff:ffff:ffff::',
+        }
+        return {
+            'ipv4': {
+                'public': [ip for ip in ips if ip['public']],
+                'private': [ip for ip in ips if not ip['public']],
+                'shared': [],
+                'reserved': [],
+            },
+            'ipv6': {'slaac': v6, 'link_local': v6, 'global': []},
+        }
+
+    def ip_allocate(self, q, f, d):
+        _required(d, 'linode_id')
+        instance = _get(self.state.instances, d['linode_id'], 'linode_id')
+        public = d.get('public', False)
+        address = self.state.address(private=not public)
+        ip = {
+            'address': address, 'gateway': None, 'linode_id': instance['id'],
+            'prefix': 17 if not public else 24, 'public': public, 'rdns': None,
+            'region': instance['region'], 'subnet_mask': '255.255.128.0', 'type': 'ipv4',
+        }
+        self.state.ips[address] = ip
+        return ip
+
+    def ip_get(self, q, f, d, address):
+        return _get(self.state.ips, address, 'address')
+
+    def ip_update(self, q, f, d, address):
+        ip = _get(self.state.ips, address, 'address')
+        if 'rdns' in d:
+            ip['rdns'] = d['rdns']
+        return ip
+
+    # volumes
+
+    def volumes_list(self, q, f, d):
+        return self.page([self._volume_ready(v) for v in self.state.volumes.values()], q, f)
+
+    def volume_create(self, q, f, d):
+        _required(d, 'label')
+        _unique(self.state.volumes, 'label', d['label'])
+
+        instance = None
+        if d.get('linode_id', None) is not None:
+            instance = _get(self.state.instances, d['linode_id'], 'linode_id')
+        elif d.get('region', None) is None:
+            raise MockError(400, 'region is required', 'region')
+
+        vid = self.state.id()
+        volume = {
+            'id': vid, 'label': d['label'], 'size': d.get('size', 20),
+            'region': d.get('region', None) or instance['region'],
+            'linode_id': instance['id'] if instance else None,
+            'linode_label': instance['label'] if instance else None,
+            'tags': d.get('tags', []), 'status': 'active',
+            'filesystem_path': '/dev/disk/by-id/scsi-0Linode_Volume_%s' % d['label'],
+            'created': _now(), 'updated': _now(),
+        }
+        self._provisioning(volume, 'creating')
+        self.state.volumes[vid] = volume
+        self._event('volume_create', 'volume', volume, pending=True)
+
+        return volume
+
+    def volume_get(self, q, f, d, vid):
+        return self._volume_ready(_get(self.state.volumes, vid, 'volume'))
+
+    def _volume_ready(self, volume):
+        return self._ready(self._ready(volume, 'creating', 'active'), 'resizing', 'active')
+
+    def volume_update(self, q, f, d, vid):
+        return _updated(_get(self.state.volumes, vid, 'volume'), d, ['label', 'tags'])
+
+    def volume_delete(self, q, f, d, vid):
+        volume = _get(self.state.volumes, vid, 'volume')
+        if volume['linode_id'] is not None:
+            raise MockError(400, 'Volume is attached', 'linode_id')
+        del self.state.volumes[vid]
+        self._event('volume_delete', 'volume', volume)
+        return {}
+
+    def volume_attach(self, q, f, d, vid):
+        volume = _get(self.state.volumes, vid, 'volume')
+        instance = _get(self.state.instances, d.get('linode_id', None), 'linode_id')
+        if volume['linode_id'] is not None:
+            raise MockError(400, 'Volume is already attached', 'linode_id')
+        volume['linode_id'] = instance['id']
+        volume['linode_label'] = instance['label']
+        self._event('volume_attach', 'volume', volume)
+        return volume
+
+    def volume_detach(self, q, f, d, vid):
+        volume = _get(self.state.volumes, vid, 'volume')
+        volume['linode_id'] = None
+        volume['linode_label'] = None
+        self._event('volume_detach', 'volume', volume)
+        return {}
+
+    def volume_resize(self, q, f, d, vid):
+        volume = _get(self.state.volumes, vid, 'volume')
+        _required(d, 'size')
+        if d['size'] < volume['size']:
+            raise MockError(400, 'Volumes can only be resized up', 'size')
+        volume['size'] = d['size']
+        self._provisioning(volume, 'resizing')
+        self._event('volume_resize', 'volume', volume, pending=True)
+        return volume
+
+    # domains
+
+    def domains_list(self, q, f, d):
+        return self.page(list(self.state.domains.values()), q, f)
+
+    def domain_create(self, q, f, d):
+        _required(d, 'domain', 'type')
+        _unique(self.state.domains, 'domain', d['domain'])
+
+        did = self.state.id()
+        domain = {
+            'id': did, 'domain': d['domain'], 'type': d['type'], 'status': 'active',
+            'soa_email': d.get('soa_email', ''), 'group': d.get('group', ''),
+            'description': d.get('description', ''), 'tags': d.get('tags', []),
+            'retry_sec': d.get('retry_sec', 0), 'expire_sec': d.get('expire_sec', 0),
+            'refresh_sec': d.get('refresh_sec', 0), 'ttl_sec': d.get('ttl_sec', 0),
+            'master_ips': d.get('master_ips', []), 'axfr_ips': d.get('axfr_ips', []),
+            'created': _now(), 'updated': _now(),
+        }
+        self.state.domains[did] = domain
+        self.state.records[did] = {}
+
+        return domain
+
+    def domain_get(self, q, f, d, did):
+        return _get(self.state.domains, did, 'domain')
+
+    def domain_update(self, q, f, d, did):
+        return _updated(_get(self.state.domains, did, 'domain'), d, [
+            'soa_email', 'group', 'description', 'tags', 'retry_sec', 'expire_sec',
+            'refresh_sec', 'ttl_sec', 'master_ips', 'axfr_ips', 'status'])
+
+    def domain_delete(self, q, f, d, did):
+        _get(self.state.domains, did, 'domain')
+        del self.state.domains[did]
+        del self.state.records[did]
+        return {}
+
+    def records_list(self, q, f, d, did):
+        _get(self.state.domains, did, 'domain')
+        return self.page(list(self.state.records[did].values()), q, f)
+
+    def record_create(self, q, f, d, did):
+        _get(self.state.domains, did, 'domain')
+        _required(d, 'type')
+
+        rid = self.state.id()
+        record = {
+            'id': rid, 'type': d['type'], 'name': d.get('name', ''),
+            'target': d.get('target', ''), 'ttl_sec': d.get('ttl_sec', 0),
+            'priority': d.get('priority', 0), 'weight': d.get('weight', 0),
+            'port': d.get('port', 0), 'service': d.get('service', None),
+            'protocol': d.get('protocol', None), 'tag': d.get('tag', None),
+            'created': _now(), 'updated': _now(),
+        }
+        self.state.records[did][rid] = record
+
+        return record
+
+    def record_get(self, q, f, d, did, rid):
+        _get(self.state.domains, did, 'domain')
+        return _get(self.state.records[did], rid, 'record')
+
+    def record_update(self, q, f, d, did, rid):
+        _get(self.state.domains, did, 'domain')
+        return _updated(_get(self.state.records[did], rid, 'record'), d, [
+            'name', 'target', 'ttl_sec', 'priority', 'weight', 'port', 'service', 'protocol', 'tag'])
+
+    def record_delete(self, q, f, d, did, rid):
+        _get(self.state.domains, did, 'domain')
+        _get(self.state.records[did], rid, 'record')
+        del self.state.records[did][rid]
+        return {}
+
+    # nodebalancers
+
+    def nodebalancers_list(self, q, f, d):
+        return self.page(list(self.state.nodebalancers.values()), q, f)
+
+    def nodebalancer_create(self, q, f, d):
+        _required(d, 'region')
+        label = d.get('label', None) or 'balancer%d' % self.state.next_id
+        _unique(self.state.nodebalancers, 'label', label)
+
+        s = self.state
+        bid = s.id()
+        public = s.address()
+        s.ips[public] = {
+            'address': public, 'gateway': None, 'linode_id': None, 'prefix': 24,
+            'public': True, 'rdns': 'nb-%s.nodebalancer.linode.com' % public.replace('.', '-'),
+            'region': d['region'], 'subnet_mask': '255.255.255.0', 'type': 'ipv4',
+        }
+
+        balancer = {
+            'id': bid, 'label': label, 'region': d['region'],
+            'client_conn_throttle': d.get('client_conn_throttle', 0),
+            'hostname': 'nb-%s.nodebalancer.linode.com' % public.replace('.', '-'),
+            'ipv4': public, 'ipv6': '2600:3c00::f03c:91ff:fe24:%x' % bid,
+            'tags': [], 'transfer': {'in': None, 'out': None, 'total': None},
+            'created': _now(), 'updated': _now(),
+        }
+        s.nodebalancers[bid] = balancer
+        s.configs[bid] = {}
+
+        for c in d.get('configs', []):
+            self.config_create(q, f, c, bid)
+
+        return balancer
+
+    def nodebalancer_get(self, q, f, d, bid):
+        return _get(self.state.nodebalancers, bid, 'nodebalancer')
+
+    def nodebalancer_update(self, q, f, d, bid):
+        return _updated(_get(self.state.nodebalancers, bid, 'nodebalancer'), d, ['label', 'client_conn_throttle'])
+
+    def nodebalancer_delete(self, q, f, d, bid):
+        balancer = _get(self.state.nodebalancers, bid, 'nodebalancer')
+        for cid in self.state.configs[bid].keys():
+            self.state.nodes.pop((bid, cid), None)
+        self.state.ips.pop(balancer['ipv4'], None)
+        del self.state.configs[bid]
+        del self.state.nodebalancers[bid]
+        return {}
+
+    def configs_list(self, q, f, d, bid):
+        _get(self.state.nodebalancers, bid, 'nodebalancer')
+        return self.page(list(self.state.configs[bid].values()), q, f)
+
+    def config_create(self, q, f, d, bid):
+        _get(self.state.nodebalancers, bid, 'nodebalancer')
+        port = d.get('port', 80)
+        for c in self.state.configs[bid].values():
+            if c['port'] == port:
+                raise MockError(400, 'Port %d is already in use' % port, 'port')
+
+        cid = self.state.id()
+        config = {
+            'id': cid, 'nodebalancer_id': bid, 'port': port,
+            'protocol': d.get('protocol', 'http'), 'algorithm': d.get('algorithm', 'roundrobin'),
+            'stickiness': d.get('stickiness', 'none'), 'check': d.get('check', 'none'),
+            'check_interval': d.get('check_interval', 0), 'check_timeout': d.get('check_timeout', 30),
+            'check_attempts': d.get('check_attempts', 3), 'check_path': d.get('check_path', ''),
+            'check_body': d.get('check_body', ''), 'check_passive': d.get('check_passive', True),
+            'proxy_protocol': d.get('proxy_protocol', 'none'), 'cipher_suite': d.get('cipher_suite', 'recommended'),
+            'ssl_cert': None if not d.get('ssl_cert', None) else '<REDACTED>',
+            'ssl_key': None if not d.get('ssl_key', None) else '<REDACTED>',
+            'ssl_commonname': '', 'ssl_fingerprint': '',
+            'nodes_status': {'up': 0, 'down': 0},
+        }
+        self.state.configs[bid][cid] = config
+        self.state.nodes[(bid, cid)] = {}
+
+        for n in d.get('nodes', []):
+            self.node_create(q, f, n, bid, cid)
+
+        return config
+
+    def config_get(self, q, f, d, bid, cid):
+        _get(self.state.nodebalancers, bid, 'nodebalancer')
+        return _get(self.state.configs[bid], cid, 'config')
+
+    def config_update(self, q, f, d, bid, cid):
+        _get(self.state.nodebalancers, bid, 'nodebalancer')
+        return _updated(_get(self.state.configs[bid], cid, 'config'), d, [
+            'port', 'protocol', 'algorithm', 'stickiness', 'check', 'check_interval',
+            'check_timeout', 'check_attempts', 'check_path', 'check_body',
+            'check_passive', 'proxy_protocol', 'cipher_suite'])
+
+    def config_delete(self, q, f, d, bid, cid):
+        _get(self.state.nodebalancers, bid, 'nodebalancer')
+        _get(self.state.configs[bid], cid, 'config')
+        del self.state.configs[bid][cid]
+        del self.state.nodes[(bid, cid)]
+        return {}
+
+    def nodes_list(self, q, f, d, bid, cid):
+        _get(self.state.nodebalancers, bid, 'nodebalancer')
+        _get(self.state.configs[bid], cid, 'config')
+        return self.page(list(self.state.nodes[(bid, cid)].values()), q, f)
+
+    def node_create(self, q, f, d, bid, cid):
+        _get(self.state.nodebalancers, bid, 'nodebalancer')
+        config = _get(self.state.configs[bid], cid, 'config')
+        _required(d, 'label', 'address')
+        nodes = self.state.nodes[(bid, cid)]
+        _unique(nodes, 'address', d['address'])
+
+        nid = self.state.id()
+        node = {
+            'id': nid, 'config_id': cid, 'nodebalancer_id': bid,
+            'label': d['label'], 'address': d['address'],
+            'mode': d.get('mode', 'accept'), 'weight': d.get('weight', 1), 'status': 'UP',
+        }
+        nodes[nid] = node
+        config['nodes_status']['up'] = len(nodes)
+
+        return node
+
+    def node_get(self, q, f, d, bid, cid, nid):
+        _get(self.state.nodebalancers, bid, 'nodebalancer')
+        _get(self.state.configs[bid], cid, 'config')
+        return _get(self.state.nodes[(bid, cid)], nid, 'node')
+
+    def node_update(self, q, f, d, bid, cid, nid):
+        _get(self.state.nodebalancers, bid, 'nodebalancer')
+        _get(self.state.configs[bid], cid, 'config')
+        return _updated(_get(self.state.nodes[(bid, cid)], nid, 'node'), d, ['label', 'address', 'mode', 'weight'])
+
+    def node_delete(self, q, f, d, bid, cid, nid):
+        _get(self.state.nodebalancers, bid, 'nodebalancer')
+        config = _get(self.state.configs[bid], cid, 'config')
+        nodes = self.state.nodes[(bid, cid)]
+        _get(nodes, nid, 'node')
+        del nodes[nid]
+        config['nodes_status']['up'] = len(nodes)
+        return {}
+
+    # control
+
+    def seed(self, data):
+        '''
+        Creates objects as if they were created through API. Nested configs
+        of nodebalancers and nodes of configs are created as well.
+        '''
+        created = {}
+
+        for d in data.get('instances', []):
+            created.setdefault('instances', []).append(self.instance_create({}, None, d)['id'])
+        for d in data.get('volumes', []):
+            created.setdefault('volumes', []).append(self.volume_create({}, None, d)['id'])
+        for d in data.get('domains', []):
+            domain = self.domain_create({}, None, d)
+            for r in d.get('records', []):
+                self.record_create({}, None, r, domain['id'])
+            created.setdefault('domains', []).append(domain['id'])
+        for d in data.get('nodebalancers', []):
+            created.setdefault('nodebalancers', []).append(self.nodebalancer_create({}, None, d)['id'])
+
+        return created
+
+
+def _handler(api):
+    state = api.state
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            self.handle_request('GET')
+
+        def do_POST(self):
+            self.handle_request('POST')
+
+        def do_PUT(self):
+            self.handle_request('PUT')
+
+        def do_DELETE(self):
+            self.handle_request('DELETE')
+
+        def reply(self, status, body, headers=None):
+            content = json.dumps(body).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(content)))
+            self.send_header('X-RateLimit-Limit', '800')
+            self.send_header('X-RateLimit-Remaining', '800')
+            self.send_header('X-RateLimit-Reset', str(int(time()) + 60))
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(content)
+
+        def handle_request(self, method):
+            length = int(self.headers.get('Content-Length', 0) or 0)
+            raw = self.rfile.read(length) if length > 0 else b''
+            url = urlparse(self.path)
+
+            if url.path.startswith('/_mock/'):
+                return self.control(method, url.path, raw)
+
+            path = re.sub(r'^/v4(beta)?', '', url.path)
+            endpoint, handler, groups = api.resolve(method, path)
+            config = state.config
+
+            if config['latency'] > 0 or config['jitter'] > 0:
+                sleep(config['latency'] + uniform(0, config['jitter']))
+
+            if config['error_rate'] > 0 and random() < config['error_rate']:
+                state.count('%s %s' % (method, endpoint), error=True)
+                headers = {'Retry-After': '1'} if config['error_status'] == 429 else None
+                return self.reply(config['error_status'], {'errors': [{'reason': 'injected error'}]}, headers)
+
+            state.count('%s %s' % (method, endpoint))
+
+            if handler is None:
+                return self.reply(404, {'errors': [{'reason': 'Not found'}]})
+
+            try:
+                data = json.loads(raw.decode('utf-8')) if raw else {}
+                flt = json.loads(self.headers['X-Filter']) if self.headers.get('X-Filter', None) else None
+                with state.lock:
+                    body = handler(parse_qs(url.query), flt, data or {}, *groups)
+            except MockError as e:
+                error = {'reason': e.reason}
+                if e.field is not None:
+                    error['field'] = e.field
+                return self.reply(e.status, {'errors': [error]})
+            except ValueError as e:
+                return self.reply(400, {'errors': [{'reason': 'Invalid JSON: %s' % e}]})
+
+            self.reply(200, body)
+
+        def control(self, method, path, raw):
+            data = json.loads(raw.decode('utf-8')) if raw else {}
+
+            if method == 'GET' and path == '/_mock/stats':
+                with state.lock:
+                    return self.reply(200, json.loads(json.dumps(state.stats)))
+
+            if method == 'POST' and path == '/_mock/reset':
+                state.reset()
+                return self.reply(200, {})
+
+            if method == 'POST' and path == '/_mock/seed':
+                with state.lock:
+                    return self.reply(200, api.seed(data))
+
+            if method == 'POST' and path == '/_mock/config':
+                state.config.update({k: v for k, v in data.items() if k in state.config})
+                return self.reply(200, state.config)
+
+            self.reply(404, {'errors': [{'reason': 'Not found'}]})
+
+    return Handler
+
+
+class MockServer(object):
+    '''
+    Mock API served from background thread, for use by benchmark harness.
+    Port 0 picks free port, see url.
+    '''
+
+    def __init__(self, port=0, **config):
+        self.state = MockState(**config)
+        self.api = MockApi(self.state)
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), _handler(self.api))
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:%d/v4' % self.httpd.server_address[1]
+
+    def start(self):
+        self.thread = Thread(target=self.httpd.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local mock of Linode API v4')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every request')
+    parser.add_argument('--jitter', type=float, default=0.0, help='random seconds added on top of latency')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='share of requests failed with error status')
+    parser.add_argument('--error-status', type=int, default=503)
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--provision-time', type=float, default=0.0,
+                        help='seconds new instances and volumes stay provisioning')
+    args = parser.parse_args()
+
+    server = MockServer(
+        port=args.port, latency=args.latency, jitter=args.jitter,
+        error_rate=args.error_rate, error_status=args.error_status,
+        page_size=args.page_size, provision_time=args.provision_time)
+
+    print('mock linode api listening on %s' % server.url)
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,479 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2020, muradm <mail@muradm.net>
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+'''
+Microbenchmarks of reconcile functions, domain_update, balancer_update and
+balancer_config_update, driven with in-memory fake objects at 10, 1k and
+10k records or nodes. Every scenario is measured for time (best of
+repeats), peak of allocated memory (tracemalloc) and deepcopy volume
+(calls and size of copied JSON).
+
+Results are compared to stored baseline, benchmarks/baselines/reconcile.json,
+and differences over threshold are reported as regressions:
+
+    python3 benchmarks/reconcile.py                 # compare to baseline
+    python3 benchmarks/reconcile.py --save          # store new baseline
+
+Scales expected to take longer than --budget seconds, judging by previous
+scale and quadratic growth, are skipped and reported with their estimate.
+'''
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import argparse
+import copy
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+from contextlib import contextmanager
+from tempfile import mkdtemp
+from time import perf_counter
+
+
+BENCHMARK_SCALES = [10, 1000, 10000]
+BENCHMARK_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines', 'reconcile.json')
+
+# modules of module_utils/linode which deepcopy API objects while reconciling
+RECONCILE_MODULES = ['domain', 'domain_record', 'balancer', 'balancer_config', 'balancer_node']
+
+
+def _module_utils():
+    # collection is imported right from the source tree
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    path = mkdtemp(prefix='linode-reconcile-')
+    os.makedirs(os.path.join(path, 'ansible_collections', 'muradm'))
+    os.symlink(root, os.path.join(path, 'ansible_collections', 'muradm', 'linode'))
+    sys.path.insert(0, path)
+
+    from importlib import import_module
+
+    return {m: import_module('ansible_collections.muradm.linode.plugins.module_utils.linode.%s' % m)
+            for m in RECONCILE_MODULES}
+
+
+class FakeSession(object):
+    '''
+    Stands in for LinodeSession, without retries and play snapshot, so that
+    reconcile functions read lists FakeClient serves. Page size is the one
+    of linode_page_size setting, see --page-size.
+    '''
+    retry = None
+    snapshots = None
+    page_size = None
+
+    def is_uncached(self):
+        return False
+
+    @contextmanager
+    def amending(self, amend):
+        yield
+
+
+class FakeClient(object):
+    '''
+    Stands in for LinodeClient. Serves lists fake objects registered, page
+    by page, to reconcile functions which read them like API lists, and
+    counts writes made through fake and linode_api4 objects.
+    '''
+
+    def __init__(self):
+        self.session = FakeSession()
+        self.next_id = 1000000
+        self.writes = 0
+        self.lists = {}
+
+    def id(self):
+        self.next_id = self.next_id + 1
+        return self.next_id
+
+    def get(self, endpoint, model=None, filters=None):
+        if filters is not None:
+            raise NotImplementedError('fake client does not filter lists')
+
+        path, _, query = endpoint.format(**vars(model)).partition('?') if model else endpoint.partition('?')
+        params = dict(p.split('=', 1) for p in query.split('&') if p)
+        page, size = int(params.get('page', 1)), int(params.get('page_size', 100))
+        data = self.lists[path]
+
+        return {
+            'data': data[(page - 1) * size:page * size],
+            'page': page,
+            'pages': max(1, (len(data) + size - 1) // size),
+            'results': len(data),
+        }
+
+    def post(self, endpoint, model=None, data=None):
+        self.writes = self.writes + 1
+        return dict(data, id=self.id())
+
+    def put(self, endpoint, model=None, data=None):
+        self.writes = self.writes + 1
+        return data
+
+    def delete(self, endpoint, model=None):
+        self.writes = self.writes + 1
+        return {}
+
+
+class FakeObject(object):
+    def __init__(self, client, json):
+        self._client = client
+        self._raw_json = json
+        for k, v in json.items():
+            setattr(self, k, v)
+
+    def save(self):
+        self._client.writes = self._client.writes + 1
+
+    def delete(self):
+        self._client.writes = self._client.writes + 1
+
+
+class FakeDomain(FakeObject):
+    def __init__(self, client, json, records):
+        super(FakeDomain, self).__init__(client, json)
+        client.lists['/domains/%s/records' % self.id] = records
+
+    def record_create(self, type, **kwargs):
+        self._client.writes = self._client.writes + 1
+        record = FakeObject(self._client, _record(self._client.id(), dict(kwargs, type=type)))
+        record.domain_id = self.id
+        return record
+
+
+class FakeBalancer(FakeObject):
+    def __init__(self, client, json, configs):
+        super(FakeBalancer, self).__init__(client, json)
+        client.lists['/nodebalancers/%s/configs' % self.id] = [c._raw_json for c in configs]
+
+    def config_create(self, label=None, **kwargs):
+        self._client.writes = self._client.writes + 1
+        return FakeConfig(self._client, _config(self._client.id(), self.id, kwargs), [])
+
+
+class FakeConfig(FakeObject):
+    def __init__(self, client, json, nodes):
+        super(FakeConfig, self).__init__(client, json)
+        client.lists['/nodebalancers/%s/configs/%s/nodes' % (self.nodebalancer_id, self.id)] = nodes
+
+    def node_create(self, label, address, **kwargs):
+        self._client.writes = self._client.writes + 1
+        return FakeObject(self._client, _node(self._client.id(), self.id, dict(kwargs, label=label, address=address)))
+
+
+def _record(id, args):
+    record = {
+        'id': id, 'type': 'A', 'name': '', 'target': '', 'ttl_sec': 300,
+        'priority': 0, 'weight': 0, 'port': 0, 'service': None, 'protocol': None, 'tag': None,
+        'created': '2020-01-01T00:00:00', 'updated': '2020-01-01T00:00:00',
+    }
+    record.update(args)
+    return record
+
+
+def _config(id, balancer_id, args):
+    config = {
+        'id': id, 'nodebalancer_id': balancer_id, 'port': 80, 'protocol': 'http',
+        'algorithm': 'roundrobin', 'stickiness': 'none', 'check': 'none', 'check_interval': 0,
+        'check_timeout': 30, 'check_attempts': 3, 'check_path': '', 'check_body': '',
+        'check_passive': True, 'proxy_protocol': 'none', 'cipher_suite': 'recommended',
+        'ssl_cert': None, 'ssl_key': None, 'ssl_commonname': '', 'ssl_fingerprint': '',
+        'nodes_status': {'up': 0, 'down': 0},
+    }
+    config.update({k: v for k, v in args.items() if k != 'nodes'})
+    return config
+
+
+def _node(id, config_id, args):
+    node = {
+        'id': id, 'config_id': config_id, 'nodebalancer_id': 1, 'label': '', 'address': '',
+        'mode': 'accept', 'weight': 1, 'status': 'UP',
+    }
+    node.update(args)
+    return node
+
+
+def _address(i):
+    return '192.168.%d.%d:80' % (i // 250, i % 250 + 1)
+
+
+def _mix(n):
+    '''
+    Splits n existing objects into kept as is, changed and unknown ones, and
+    adds a tenth of new ones, like a typical converge run.
+    '''
+    tenth = n // 10
+    return range(n - 2 * tenth), range(n - 2 * tenth, n - tenth), range(n - tenth, n), range(n, n + tenth)
+
+
+def _domain_scenario(n):
+    same, changed, unknown, new = _mix(n)
+
+    def setup():
+        client = FakeClient()
+        records = [_record(i, {'name': 'host-%d' % i, 'target': '10.0.0.%d' % i}) for i in range(n)]
+        domain = FakeDomain(client, {
+            'id': 1, 'domain': 'bench.example.com', 'type': 'master', 'soa_email': 'admin@example.com',
+            'group': '', 'description': '', 'retry_sec': 0, 'expire_sec': 0, 'refresh_sec': 0,
+            'ttl_sec': 0, 'tags': [], 'master_ips': [], 'axfr_ips': [], 'status': 'active',
+        }, records)
+        args = {
+            'domain': 'bench.example.com', 'master_ips': [], 'axfr_ips': [], 'tags': [],
+            'keep_unknown_records': False, 'return_unknown_records': False,
+            'records': [{'type': 'A', 'name': 'host-%d' % i, 'target': '10.0.0.%d' % i, 'ttl_sec': 300}
+                        for i in same] +
+                       [{'type': 'A', 'name': 'host-%d' % i, 'target': '10.0.0.%d' % i, 'ttl_sec': 600}
+                        for i in changed] +
+                       [{'type': 'A', 'name': 'host-%d' % i, 'target': '10.0.0.%d' % i, 'ttl_sec': 300}
+                        for i in new],
+        }
+        return (domain, args)
+
+    return setup, lambda m, d, a: m['domain'].domain_update(d, a)
+
+
+def _config_args(port, same, changed, new):
+    return {
+        'port': port, 'protocol': 'http', 'algorithm': 'roundrobin', 'stickiness': 'none',
+        'proxy_protocol': 'none', 'cipher_suite': 'recommended', 'check': 'none',
+        'keep_unknown_nodes': False, 'return_unknown_nodes': False,
+        'nodes': [{'label': 'node-%d' % i, 'address': _address(i), 'mode': 'accept', 'weight': 1}
+                  for i in same] +
+                 [{'label': 'node-%d' % i, 'address': _address(i), 'mode': 'drain', 'weight': 1}
+                  for i in changed] +
+                 [{'label': 'node-%d' % i, 'address': _address(i), 'mode': 'accept', 'weight': 1}
+                  for i in new],
+    }
+
+
+def _fake_config(client, id, port, n):
+    nodes = [_node(id * 100000 + i, id, {'label': 'node-%d' % i, 'address': _address(i)}) for i in range(n)]
+    return FakeConfig(client, _config(id, 1, {'port': port}), nodes)
+
+
+def _balancer_config_scenario(n):
+    same, changed, unknown, new = _mix(n)
+
+    def setup():
+        client = FakeClient()
+        return (_fake_config(client, 1, 80, n), _config_args(80, same, changed, new))
+
+    return setup, lambda m, c, a: m['balancer_config'].balancer_config_update(c, a)
+
+
+def _balancer_scenario(n):
+    # n nodes in total, in configs of up to 10 nodes each
+    per_config = min(n, 10)
+    configs = n // per_config
+    same, changed, unknown, new = _mix(configs)
+    nsame, nchanged, nunknown, nnew = _mix(per_config)
+
+    def setup():
+        client = FakeClient()
+        balancer = FakeBalancer(client, {
+            'id': 1, 'label': 'bench-lb', 'region': 'eu-central', 'client_conn_throttle': 0,
+        }, [_fake_config(client, i + 1, 10000 + i, per_config) for i in range(configs)])
+        args = {
+            'keep_unknown_configs': False, 'return_unknown_configs': False,
+            'configs': [_config_args(10000 + i, nsame, nchanged, nnew) for i in same] +
+                       [dict(_config_args(10000 + i, nsame, nchanged, nnew), algorithm='leastconn') for i in changed] +
+                       [_config_args(10000 + i, range(per_config), [], []) for i in new],
+        }
+        return (balancer, args)
+
+    return setup, lambda m, b, a: m['balancer'].balancer_update(b, a)
+
+
+BENCHMARK_SCENARIOS = {
+    'domain_update': _domain_scenario,
+    'balancer_update': _balancer_scenario,
+    'balancer_config_update': _balancer_config_scenario,
+}
+
+
+class DeepcopyCounter(object):
+    '''
+    Replaces deepcopy imported by reconcile modules, counting its calls and
+    size of copied objects as JSON.
+    '''
+
+    def __init__(self, modules):
+        self.modules = modules
+        self.calls = 0
+        self.bytes = 0
+
+    def __call__(self, obj, *args, **kwargs):
+        self.calls = self.calls + 1
+        self.bytes = self.bytes + len(json.dumps(obj, default=str))
+        return copy.deepcopy(obj, *args, **kwargs)
+
+    def __enter__(self):
+        for m in self.modules.values():
+            if hasattr(m, 'deepcopy'):
+                m.deepcopy = self
+        return self
+
+    def __exit__(self, *exc):
+        for m in self.modules.values():
+            if hasattr(m, 'deepcopy'):
+                m.deepcopy = copy.deepcopy
+
+
+def measure(modules, scenario, n, repeat):
+    setup, reconcile = BENCHMARK_SCENARIOS[scenario](n)
+
+    times = []
+    for _ in range(repeat):
+        obj, args = setup()
+        gc.collect()
+        started = perf_counter()
+        reconcile(modules, obj, args)
+        times.append(perf_counter() - started)
+
+    obj, args = setup()
+    gc.collect()
+    tracemalloc.start()
+    reconcile(modules, obj, args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    obj, args = setup()
+    with DeepcopyCounter(modules) as copies:
+        reconcile(modules, obj, args)
+
+    return {
+        'time': round(min(times), 6),
+        'peak_kb': round(peak / 1024.0, 1),
+        'deepcopy_calls': copies.calls,
+        'deepcopy_kb': round(copies.bytes / 1024.0, 1),
+        'writes': obj._client.writes,
+    }
+
+
+def run(args):
+    modules = _module_utils()
+    FakeSession.page_size = args.page_size
+    results = {}
+
+    for scenario in args.scenarios:
+        previous = None
+        for n in args.scales:
+            key = '%s/%d' % (scenario, n)
+
+            if previous is not None:
+                estimate = previous[1]['time'] * (float(n) / previous[0]) ** 2
+                if estimate > args.budget:
+                    results[key] = {'skipped': True, 'estimate': round(estimate, 1)}
+                    print('%-32s skipped, estimated %.1fs' % (key, estimate))
+                    continue
+
+            # one run is enough once a single one takes long
+            result = measure(modules, scenario, n, args.repeat if n <= 1000 else 1)
+            results[key] = result
+            previous = (n, result)
+
+            print('%-32s time=%10.6fs peak=%10.1fKB deepcopy=%7d calls %10.1fKB writes=%d' % (
+                key, result['time'], result['peak_kb'], result['deepcopy_calls'],
+                result['deepcopy_kb'], result['writes']))
+            sys.stdout.flush()
+
+    return results
+
+
+def compare(baseline, results, threshold, time_threshold):
+    '''
+    Prints every metric next to its baseline, returns number of metrics
+    which grew over threshold. Time is noisier than counts, so it has its
+    own threshold.
+    '''
+    regressions = 0
+
+    print('')
+    print('%-32s %-15s %14s %14s %9s' % ('scenario', 'metric', 'baseline', 'current', 'change'))
+
+    for key in sorted(results.keys()):
+        base = baseline.get(key, None)
+        current = results[key]
+
+        if base is None or base.get('skipped', False) or current.get('skipped', False):
+            print('%-32s %-15s %14s %14s' % (
+                key, '-', 'skipped' if base is not None and base.get('skipped', False) else 'missing' if base is None else '-',
+                'skipped' if current.get('skipped', False) else '-'))
+            continue
+
+        for metric in ['time', 'peak_kb', 'deepcopy_calls', 'deepcopy_kb']:
+            b, c = base[metric], current[metric]
+            change = (c - b) / b if b else 0.0
+            limit = time_threshold if metric == 'time' else threshold
+            flag = ''
+            if change > limit:
+                flag = ' REGRESSION'
+                regressions = regressions + 1
+            elif change < -limit:
+                flag = ' improved'
+            print('%-32s %-15s %14s %14s %+8.1f%%%s' % (key, metric, b, c, change * 100, flag))
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks reconcile functions with fake objects')
+    parser.add_argument('--scales', default=','.join(str(s) for s in BENCHMARK_SCALES),
+                        help='comma separated number of records or nodes, defaults to %(default)s')
+    parser.add_argument('--scenarios', default=','.join(sorted(BENCHMARK_SCENARIOS.keys())),
+                        help='comma separated scenarios, defaults to all')
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs per scale, best one is taken')
+    parser.add_argument('--budget', type=float, default=120.0,
+                        help='seconds, scales estimated to take longer are skipped')
+    parser.add_argument('--page-size', type=int, help='page size lists are read with, defaults to API default of 100')
+    parser.add_argument('--baseline', default=BENCHMARK_BASELINE, help='baseline file')
+    parser.add_argument('--save', action='store_true', help='store results as new baseline')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='relative growth reported as regression, defaults to %(default)s')
+    parser.add_argument('--time-threshold', type=float, default=0.5,
+                        help='relative growth of time reported as regression, defaults to %(default)s')
+    parser.add_argument('--fail-on-regression', action='store_true', help='exit with 1 on regressions')
+    parser.add_argument('--json', help='file to write results to')
+    args = parser.parse_args()
+
+    args.scales = [int(s) for s in args.scales.split(',')]
+    args.scenarios = args.scenarios.split(',')
+    for scenario in args.scenarios:
+        if scenario not in BENCHMARK_SCENARIOS:
+            parser.error('unknown scenario %s' % scenario)
+
+    results = run(args)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if args.save:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print('baseline stored to %s' % args.baseline)
+        return
+
+    if not os.path.exists(args.baseline):
+        print('no baseline at %s, store one with --save' % args.baseline)
+        return
+
+    with open(args.baseline, 'r') as f:
+        baseline = json.load(f)
+
+    regressions = compare(baseline, results, args.threshold, args.time_threshold)
+    if regressions > 0 and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
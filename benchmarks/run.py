@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2020, muradm <mail@muradm.net>
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+'''
+End to end benchmark of action plugins against local mock API. For every
+action and scale, playbook managing that many resources is run twice with
+ansible-playbook: first run creates them (apply), second one finds them
+all in place (converge). Every run reports API requests served by mock,
+wall time and peak memory of ansible-playbook with its workers.
+
+    python3 benchmarks/run.py --scales 1,100 --actions domain,instance --json out.json
+'''
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import argparse
+import json
+import os
+import sys
+
+from shutil import rmtree
+from subprocess import Popen, DEVNULL, STDOUT
+from tempfile import mkdtemp
+from time import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_api import MockServer  # noqa: E402
+
+
+BENCHMARK_SCALES = [1, 100, 1000]
+BENCHMARK_REGION = 'eu-central'
+BENCHMARK_DOMAIN = 'bench.example.com'
+BENCHMARK_BALANCER = 'bench-lb'
+
+
+def _address(i):
+    return '192.168.%d.%d:80' % (i // 250, i % 250 + 1)
+
+
+def _task(action, args, loop=None):
+    task = {'name': action, 'muradm.linode.%s' % action: args}
+    if loop is not None:
+        task['loop'] = list(range(loop))
+    return task
+
+
+def _balancer_config(port, nodes):
+    return {
+        'port': port, 'protocol': 'http', 'algorithm': 'roundrobin', 'stickiness': 'none',
+        'nodes': [{'label': 'node-%d' % i, 'address': _address(i), 'weight': 1} for i in range(nodes)],
+    }
+
+
+# every scenario returns objects to be seeded before the first run, and tasks
+# of playbook managing n resources
+
+def _instance(n):
+    return ({}, [_task('instance', {
+        'label': 'bench-{{ item }}', 'region': BENCHMARK_REGION,
+        'type': 'g6-nanode-1', 'image': 'linode/debian10', 'root_pass': 'bench-Pass-1234',
+    }, loop=n)])
+
+
+def _volume(n):
+    return ({}, [_task('volume', {
+        'label': 'bench-{{ item }}', 'region': BENCHMARK_REGION, 'size': 20, 'state': 'detached',
+    }, loop=n)])
+
+
+def _domain(n):
+    return ({}, [_task('domain', {
+        'domain': BENCHMARK_DOMAIN, 'type': 'master', 'soa_email': 'admin@example.com',
+        'records': [{'type': 'A', 'name': 'host-%d' % i, 'target': '10.0.%d.%d' % (i // 250, i % 250 + 1)}
+                    for i in range(n)],
+    })])
+
+
+def _domain_record(n):
+    return ({'domains': [{'domain': BENCHMARK_DOMAIN, 'type': 'master', 'soa_email': 'admin@example.com'}]},
+            [_task('domain_record', {
+                'domain': BENCHMARK_DOMAIN, 'type': 'A', 'name': 'host-{{ item }}',
+                'target': '10.0.{{ item // 250 }}.{{ item % 250 + 1 }}',
+            }, loop=n)])
+
+
+def _balancer(n):
+    return ({}, [_task('balancer', {
+        'label': BENCHMARK_BALANCER, 'region': BENCHMARK_REGION,
+        'configs': [_balancer_config(10000 + i, 1) for i in range(n)],
+    })])
+
+
+def _balancer_config_scenario(n):
+    return ({'nodebalancers': [{'label': BENCHMARK_BALANCER, 'region': BENCHMARK_REGION}]},
+            [_task('balancer_config', dict(balancer=BENCHMARK_BALANCER, **_balancer_config(80, n)))])
+
+
+def _balancer_node(n):
+    return ({'nodebalancers': [{'label': BENCHMARK_BALANCER, 'region': BENCHMARK_REGION,
+                                'configs': [_balancer_config(80, 0)]}]},
+            [_task('balancer_node', {
+                'balancer': BENCHMARK_BALANCER, 'port': 80, 'label': 'node-{{ item }}',
+                'address': '192.168.{{ item // 250 }}.{{ item % 250 + 1 }}:80', 'weight': 1,
+            }, loop=n)])
+
+
+BENCHMARK_SCENARIOS = {
+    'instance': _instance,
+    'volume': _volume,
+    'domain': _domain,
+    'domain_record': _domain_record,
+    'balancer': _balancer,
+    'balancer_config': _balancer_config_scenario,
+    'balancer_node': _balancer_node,
+}
+
+
+def _collections_path(workdir):
+    # collection is used right from the source tree
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    path = os.path.join(workdir, 'collections')
+    os.makedirs(os.path.join(path, 'ansible_collections', 'muradm'))
+    os.symlink(root, os.path.join(path, 'ansible_collections', 'muradm', 'linode'))
+    return path
+
+
+def _post(server, path, data):
+    from urllib.request import Request, urlopen
+
+    url = server.url.replace('/v4', path)
+    request = Request(url, data=json.dumps(data).encode('utf-8'), method='POST')
+    with urlopen(request) as response:
+        return json.loads(response.read().decode('utf-8'))
+
+
+def _run_playbook(args, env, playbook):
+    log = playbook + '.log'
+    started = time()
+
+    with open(log, 'wb') as out:
+        process = Popen([args.ansible_playbook, '-i', 'localhost,', '-c', 'local', playbook],
+                        env=env, stdin=DEVNULL,
+                        stdout=None if args.verbose else out, stderr=None if args.verbose else STDOUT)
+
+        # rusage of this very child, including its own waited for workers
+        _, status, rusage = os.wait4(process.pid, 0)
+        process.returncode = os.WEXITSTATUS(status) if os.WIFEXITED(status) else -1
+
+    wall = time() - started
+
+    if process.returncode != 0:
+        with open(log, 'r') as f:
+            sys.stderr.write(f.read())
+        raise SystemExit('ansible-playbook failed for %s' % playbook)
+
+    return wall, rusage.ru_maxrss
+
+
+def run(args):
+    workdir = mkdtemp(prefix='linode-bench-')
+    server = MockServer(latency=args.latency, jitter=args.jitter,
+                        error_rate=args.error_rate, page_size=args.page_size).start()
+
+    env = dict(os.environ)
+    env['ANSIBLE_COLLECTIONS_PATH'] = _collections_path(workdir)
+    env['ANSIBLE_COLLECTIONS_PATHS'] = env['ANSIBLE_COLLECTIONS_PATH']
+    env['ANSIBLE_NOCOLOR'] = '1'
+    env['LINODE_API_URL'] = server.url
+    env['LINODE_ACCESS_TOKEN'] = 'benchmark'
+    env.setdefault('LINODE_RATE_LIMIT', 'false')
+
+    results = []
+
+    try:
+        for action in args.actions:
+            for scale in args.scales:
+                _post(server, '/_mock/reset', {})
+                seed, tasks = BENCHMARK_SCENARIOS[action](scale)
+                _post(server, '/_mock/seed', seed)
+
+                playbook = os.path.join(workdir, '%s-%d.yml' % (action, scale))
+                with open(playbook, 'w') as f:
+                    json.dump([{'hosts': 'localhost', 'gather_facts': False, 'tasks': tasks}], f)
+
+                for phase in ['apply', 'converge']:
+                    before = server.state.stats['requests']
+                    wall, rss = _run_playbook(args, env, playbook)
+                    row = {
+                        'action': action,
+                        'scale': scale,
+                        'phase': phase,
+                        'calls': server.state.stats['requests'] - before,
+                        'wall': round(wall, 3),
+                        'peak_rss_kb': rss,
+                    }
+                    results.append(row)
+                    print('%-16s %6d %-9s calls=%-7d wall=%8.3fs peak_rss=%s KB' % (
+                        action, scale, phase, row['calls'], row['wall'], rss))
+                    sys.stdout.flush()
+    finally:
+        server.stop()
+        rmtree(workdir, ignore_errors=True)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks action plugins against local mock API')
+    parser.add_argument('--scales', default=','.join(str(s) for s in BENCHMARK_SCALES),
+                        help='comma separated number of resources, defaults to %(default)s')
+    parser.add_argument('--actions', default=','.join(sorted(BENCHMARK_SCENARIOS.keys())),
+                        help='comma separated actions, defaults to all')
+    parser.add_argument('--latency', type=float, default=0.0, help='mock latency per request in seconds')
+    parser.add_argument('--jitter', type=float, default=0.0, help='mock random latency on top in seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='share of mock requests failed with 503')
+    parser.add_argument('--page-size', type=int, default=100, help='mock page size')
+    parser.add_argument('--ansible-playbook', default='ansible-playbook', help='ansible-playbook executable')
+    parser.add_argument('--json', help='file to write results to')
+    parser.add_argument('--verbose', action='store_true', help='show ansible-playbook output')
+    args = parser.parse_args()
+
+    args.scales = [int(s) for s in args.scales.split(',')]
+    args.actions = args.actions.split(',')
+    for action in args.actions:
+        if action not in BENCHMARK_SCENARIOS:
+            parser.error('unknown action %s' % action)
+
+    results = run(args)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                'latency': args.latency,
+                'jitter': args.jitter,
+                'error_rate': args.error_rate,
+                'page_size': args.page_size,
+                'results': results,
+            }, f, indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -8,7 +8,8 @@ __metaclass__ = type
 
 from ansible.errors import AnsibleError
 from ansible.plugins.action import ActionBase
-from ..module_utils.linode.__init__ import linode_client, linode_schema, linode_action_input_validated
+from ..module_utils.linode.__init__ import linode_client, linode_client_stats, linode_metrics, linode_schema, linode_action_input_validated
+from ..module_utils.linode.__init__ import linode_ids, linode_id, linode_ids_update, linode_ids_facts
 from ..module_utils.linode.__init__ import balancer_find, balancer_config_find
 from ..module_utils.linode.__init__ import balancer_node_find, balancer_node_create, balancer_node_update, balancer_node_remove
 
@@ -21,22 +22,29 @@ class ActionModule(ActionBase):
         task_args = self._task.args
         check_mode = self._play_context.check_mode
         client = linode_client(task_args, task_vars)
+        client_stats = linode_client_stats(client)
         schema = linode_schema()
 
         args = linode_action_input_validated(
             schema, 'balancer_node_key', task_args)
 
-        balancer = balancer_find(client, args['balancer'])
+        ids = linode_ids(task_vars)
+        balancer = balancer_find(client, args['balancer'], linode_id(
+            ids, 'balancer', args['balancer'], args.get('balancer_id', None)))
         if balancer is None:
             raise AnsibleError('%s balancer not found for config %s and node %s' % (
                 args['balancer'], args['port'], args['address']))
 
-        config = balancer_config_find(balancer, args['port'])
+        config_key = '%s:%s' % (balancer.id, args['port'])
+        config = balancer_config_find(balancer, args['port'], linode_id(
+            ids, 'balancer_config', config_key, args.get('config_id', None)))
         if config is None:
             raise AnsibleError('%s balancer config %s not found for node %s' % (
                 args['balancer'], args['port'], args['address']))
 
-        node = balancer_node_find(config, args['address'])
+        node_key = '%s:%s' % (config.id, args['address'])
+        node = balancer_node_find(config, args['address'], linode_id(
+            ids, 'balancer_node', node_key, args.get('id', None)))
 
         result = {'changed': False}
 
@@ -60,4 +68,12 @@ class ActionModule(ActionBase):
             result['balancer_node'] = balancer_node_remove(node, check_mode)
             result['changed'] = True
 
+        linode_ids_update(ids, 'balancer', balancer.label, balancer)
+        linode_ids_update(ids, 'balancer_config', config_key, config)
+        linode_ids_update(ids, 'balancer_node', node_key, result.get('balancer_node', None))
+        result['ansible_facts'] = linode_ids_facts(ids)
+
+        result['_linode_metrics'] = linode_metrics(client, since=client_stats)
+        result['linode_retries'] = result['_linode_metrics']['retries']
+
         return result
@@ -7,7 +7,8 @@ from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
 from ansible.plugins.action import ActionBase
-from ..module_utils.linode.__init__ import linode_client, linode_schema, linode_action_input_validated
+from ..module_utils.linode.__init__ import linode_client, linode_client_stats, linode_metrics, linode_schema, linode_action_input_validated
+from ..module_utils.linode.__init__ import linode_ids, linode_id, linode_ids_update, linode_ids_facts
 from ..module_utils.linode.__init__ import domain_find, domain_create, domain_update, domain_remove
 
 
@@ -19,11 +20,14 @@ class ActionModule(ActionBase):
         task_args = self._task.args
         check_mode = self._play_context.check_mode
         client = linode_client(task_args, task_vars)
+        client_stats = linode_client_stats(client)
         schema = linode_schema()
 
         args = linode_action_input_validated(
             schema, 'domain_key', task_args)
-        domain = domain_find(client, args['domain'])
+        name = args['domain']
+        ids = linode_ids(task_vars)
+        domain = domain_find(client, name, linode_id(ids, 'domain', name, args.get('id', None)))
 
         result = {'changed': False}
 
@@ -47,4 +51,10 @@ class ActionModule(ActionBase):
             result['domain'] = domain_remove(domain, check_mode)
             result['changed'] = True
 
+        linode_ids_update(ids, 'domain', name, result.get('domain', None))
+        result['ansible_facts'] = linode_ids_facts(ids)
+
+        result['_linode_metrics'] = linode_metrics(client, since=client_stats)
+        result['linode_retries'] = result['_linode_metrics']['retries']
+
         return result
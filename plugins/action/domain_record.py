@@ -8,9 +8,10 @@ __metaclass__ = type
 
 from ansible.errors import AnsibleError
 from ansible.plugins.action import ActionBase
-from ..module_utils.linode.__init__ import linode_client, linode_schema, linode_action_input_validated
+from ..module_utils.linode.__init__ import linode_client, linode_client_stats, linode_metrics, linode_schema, linode_action_input_validated
+from ..module_utils.linode.__init__ import linode_ids, linode_id, linode_ids_update, linode_ids_facts
 from ..module_utils.linode.__init__ import domain_find
-from ..module_utils.linode.__init__ import domain_record_find, domain_record_create, domain_record_update, domain_record_remove
+from ..module_utils.linode.__init__ import domain_record_identity, domain_record_find, domain_record_create, domain_record_update, domain_record_remove
 
 
 class ActionModule(ActionBase):
@@ -21,12 +22,15 @@ class ActionModule(ActionBase):
         task_args = self._task.args
         check_mode = self._play_context.check_mode
         client = linode_client(task_args, task_vars)
+        client_stats = linode_client_stats(client)
         schema = linode_schema()
 
         key_args = linode_action_input_validated(
             schema, 'domain_record_key', task_args)
 
-        domain = domain_find(client, key_args['domain'])
+        ids = linode_ids(task_vars)
+        domain = domain_find(client, key_args['domain'], linode_id(
+            ids, 'domain', key_args['domain'], key_args.get('domain_id', None)))
         if domain is None:
             raise AnsibleError(u'%s domain not found for record %s:%s' % (
                 key_args['domain'], key_args['type'], key_args['name']))
@@ -34,7 +38,9 @@ class ActionModule(ActionBase):
         args = linode_action_input_validated(
             schema, 'domain_record', task_args)
 
-        record = domain_record_find(domain, args)
+        key = '%s:%s' % (domain.id, domain_record_identity(args))
+        record = domain_record_find(domain, args, linode_id(
+            ids, 'domain_record', key, key_args.get('id', None)))
 
         result = {'changed': False}
 
@@ -52,4 +58,11 @@ class ActionModule(ActionBase):
             result['domain_record'] = domain_record_remove(record, check_mode)
             result['changed'] = True
 
+        linode_ids_update(ids, 'domain', key_args['domain'], domain)
+        linode_ids_update(ids, 'domain_record', key, result.get('domain_record', None))
+        result['ansible_facts'] = linode_ids_facts(ids)
+
+        result['_linode_metrics'] = linode_metrics(client, since=client_stats)
+        result['linode_retries'] = result['_linode_metrics']['retries']
+
         return result
@@ -7,7 +7,8 @@ from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
 from ansible.plugins.action import ActionBase
-from ..module_utils.linode.__init__ import linode_client, linode_schema, linode_action_input_validated
+from ..module_utils.linode.__init__ import linode_client, linode_client_stats, linode_metrics, linode_schema, linode_action_input_validated
+from ..module_utils.linode.__init__ import linode_ids, linode_id, linode_ids_update, linode_ids_facts
 from ..module_utils.linode.__init__ import instance_find, instance_create, instance_update, instance_remove
 
 
@@ -19,11 +20,14 @@ class ActionModule(ActionBase):
         task_args = self._task.args
         check_mode = self._play_context.check_mode
         client = linode_client(task_args, task_vars)
+        client_stats = linode_client_stats(client)
         schema = linode_schema()
 
         args = linode_action_input_validated(
             schema, 'instance_key', task_args)
-        instance = instance_find(client, args['label'])
+        ids = linode_ids(task_vars)
+        instance = instance_find(
+            client, args['label'], linode_id(ids, 'instance', args['label'], args.get('id', None)))
 
         result = {'changed': False}
 
@@ -34,6 +38,10 @@ class ActionModule(ActionBase):
             result['instance'] = instance_create(client, args, check_mode)
             result['changed'] = True
 
+            job = result['instance'].pop('job', None)
+            if job is not None:
+                result['job'] = job
+
         elif instance is not None and args['state'] == 'present':
             args = linode_action_input_validated(
                 schema, 'instance_update', task_args)
@@ -47,4 +55,10 @@ class ActionModule(ActionBase):
             result['instance'] = instance_remove(instance, check_mode)
             result['changed'] = True
 
+        linode_ids_update(ids, 'instance', args['label'], result.get('instance', None))
+        result['ansible_facts'] = linode_ids_facts(ids)
+
+        result['_linode_metrics'] = linode_metrics(client, since=client_stats)
+        result['linode_retries'] = result['_linode_metrics']['retries']
+
         return result
@@ -7,7 +7,8 @@ from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
 from ansible.plugins.action import ActionBase
-from ..module_utils.linode.__init__ import linode_client, linode_schema, linode_action_input_validated
+from ..module_utils.linode.__init__ import linode_client, linode_client_stats, linode_metrics, linode_schema, linode_action_input_validated
+from ..module_utils.linode.__init__ import linode_ids, linode_id, linode_ids_update, linode_ids_facts
 from ..module_utils.linode.__init__ import volume_find, volume_create, volume_update, volume_remove
 
 
@@ -19,11 +20,14 @@ class ActionModule(ActionBase):
         task_args = self._task.args
         check_mode = self._play_context.check_mode
         client = linode_client(task_args, task_vars)
+        client_stats = linode_client_stats(client)
         schema = linode_schema()
 
         args = linode_action_input_validated(
             schema, 'volume_key', task_args)
-        volume = volume_find(client, args['label'])
+        ids = linode_ids(task_vars)
+        volume = volume_find(
+            client, args['label'], linode_id(ids, 'volume', args['label'], args.get('id', None)))
 
         result = {'changed': False}
 
@@ -34,6 +38,10 @@ class ActionModule(ActionBase):
             result['volume'] = volume_create(client, args, check_mode)
             result['changed'] = True
 
+            job = result['volume'].pop('job', None)
+            if job is not None:
+                result['job'] = job
+
         elif volume is not None and args['state'] in ['attached', 'detached']:
             args = linode_action_input_validated(
                 schema, 'volume_update', task_args)
@@ -46,4 +54,10 @@ class ActionModule(ActionBase):
             result['volume'] = volume_remove(client, volume, check_mode)
             result['changed'] = True
 
+        linode_ids_update(ids, 'volume', args['label'], result.get('volume', None))
+        result['ansible_facts'] = linode_ids_facts(ids)
+
+        result['_linode_metrics'] = linode_metrics(client, since=client_stats)
+        result['linode_retries'] = result['_linode_metrics']['retries']
+
         return result
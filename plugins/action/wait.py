@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2020, muradm <mail@muradm.net>
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from ansible.plugins.action import ActionBase
+from ..module_utils.linode.__init__ import linode_client, linode_client_stats, linode_metrics, linode_schema, linode_action_input_validated
+from ..module_utils.linode.__init__ import linode_join
+
+
+class ActionModule(ActionBase):
+    def run(self, tmp=None, task_vars=None):
+        task_vars = {} if task_vars is None else task_vars
+        result = super(ActionModule, self).run(tmp, task_vars)
+        del tmp  # tmp no longer has any effect
+        task_args = self._task.args
+        check_mode = self._play_context.check_mode
+        client = linode_client(task_args, task_vars)
+        client_stats = linode_client_stats(client)
+        schema = linode_schema()
+
+        args = linode_action_input_validated(
+            schema, 'wait', task_args)
+
+        joined = linode_join(
+            client, args['jobs'], timeout=args['timeout'], check_mode=check_mode)
+
+        result = {'changed': False}
+        result['instances'] = joined['ready']['instance']
+        result['volumes'] = joined['ready']['volume']
+        result['timed_out'] = joined['timed_out']
+        result['time_to_ready'] = joined['time_to_ready']
+
+        if len(joined['timed_out']) > 0:
+            result['failed'] = True
+            result['msg'] = 'timed out waiting for %s' % ', '.join(
+                ['%s %s' % (j['kind'], j['label']) for j in joined['timed_out']])
+
+        result['_linode_metrics'] = linode_metrics(client, since=client_stats)
+        result['linode_retries'] = result['_linode_metrics']['retries']
+
+        return result
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2020, muradm <mail@muradm.net>
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+callback: linode
+type: aggregate
+short_description: Summarizes Linode API usage per task, host and play
+description:
+    - Collects C(_linode_metrics) returned by actions of this collection and at the end of
+      playbook prints top tasks, hosts and endpoints by time spent in Linode API calls and
+      status waits, followed by totals of the whole playbook. Every task and host is shown
+      with its slowest endpoint, the one it spent most time in.
+    - Optionally writes all collected figures to JSON file, to track them between runs.
+requirements:
+  - enable in configuration
+options:
+  top:
+    description: Number of rows to print in every table.
+    type: int
+    default: 10
+    env:
+      - name: LINODE_CALLBACK_TOP
+    ini:
+      - section: callback_linode
+        key: top
+  json_path:
+    description: Path to JSON file to write summary to. Nothing is written if not set.
+    type: path
+    env:
+      - name: LINODE_CALLBACK_JSON_PATH
+    ini:
+      - section: callback_linode
+        key: json_path
+author:
+- muradm (@muradm)
+'''
+
+from ansible.plugins.callback import CallbackBase
+from datetime import datetime
+from json import dump
+from time import time
+
+
+class CallbackModule(CallbackBase):
+    CALLBACK_VERSION = 2.0
+    CALLBACK_TYPE = 'aggregate'
+    CALLBACK_NAME = 'muradm.linode.linode'
+    CALLBACK_NEEDS_WHITELIST = True
+    CALLBACK_NEEDS_ENABLED = True
+
+    def __init__(self):
+        super(CallbackModule, self).__init__()
+        self.play = None
+        self.task = None
+        self.task_started = None
+        self.tasks = {}
+        self.hosts = {}
+        self.total = _empty()
+        self.endpoints = self.total['endpoints']
+
+    def v2_playbook_on_play_start(self, play):
+        self.play = play.get_name()
+
+    def v2_playbook_on_task_start(self, task, is_conditional):
+        self.task = '%s: %s' % (self.play, task.get_name())
+        self.task_started = time()
+
+    def v2_playbook_on_handler_task_start(self, task):
+        self.v2_playbook_on_task_start(task, False)
+
+    def v2_runner_on_ok(self, result):
+        self._collect(result)
+
+    def v2_runner_on_failed(self, result, ignore_errors=False):
+        self._collect(result)
+
+    def _collect(self, result):
+        metrics = [result._result.get('_linode_metrics', None)]
+        for item in result._result.get('results', []):
+            if isinstance(item, dict):
+                metrics.append(item.get('_linode_metrics', None))
+
+        metrics = [m for m in metrics if m]
+        if len(metrics) == 0:
+            return
+
+        host = result._host.get_name()
+        wall = time() - self.task_started if self.task_started else 0.0
+
+        task = self.tasks.setdefault(self.task, _empty())
+        task['wall'] = max(task['wall'], wall)
+        task['hosts'] = task['hosts'] + 1
+
+        for m in metrics:
+            for target in [task, self.hosts.setdefault(host, _empty()), self.total]:
+                _add(target, m)
+
+            for target in [task['endpoints'], self.hosts[host]['endpoints'], self.total['endpoints']]:
+                _add_endpoints(target, m.get('endpoints', {}))
+
+    def v2_playbook_on_stats(self, stats):
+        if self.total['calls'] == 0:
+            return
+
+        top = self.get_option('top')
+
+        self._display.banner('LINODE API USAGE')
+
+        self._table('tasks', self.tasks, top, ['calls', 'reused', 'latency', 'wait', 'retries', 'wall'])
+        self._table('hosts', self.hosts, top, ['calls', 'latency', 'wait', 'retries'])
+
+        self._display.display('slowest endpoints:')
+        for name, e in _slowest(self.endpoints)[:top]:
+            self._display.display('  %s' % _endpoint_row(name, e))
+
+        t = self.total
+        self._display.display(
+            'total: calls=%d requests=%d bytes=%d latency=%.3fs wait=%.3fs polls=%d queued=%.3fs retries=%d '
+            'connections=%d reused=%d' % (
+                t['calls'], t['requests'], t['bytes'], t['latency'], t['wait'], t['polls'], t['queued'], t['retries'],
+                t['connections'], t['reused']))
+
+        path = self.get_option('json_path')
+        if path:
+            with open(path, 'w') as f:
+                dump({
+                    'finished': datetime.now().isoformat(),
+                    'total': self.total,
+                    'tasks': self.tasks,
+                    'hosts': self.hosts,
+                    'endpoints': self.endpoints,
+                }, f, indent=2, sort_keys=True)
+
+    def _table(self, title, rows, top, columns):
+        self._display.display('top %s by api time:' % title)
+
+        rows = sorted(rows.items(), key=lambda r: r[1]['latency'] + r[1]['wait'], reverse=True)
+        for name, r in rows[:top]:
+            self._display.display('  %-50s %s' % (name[:50], ' '.join(
+                ['%s=%s' % (c, ('%.3fs' % r[c]) if isinstance(r[c], float) else r[c]) for c in columns])))
+
+            slowest = _slowest(r['endpoints'])
+            if len(slowest) > 0:
+                self._display.display('    slowest %s' % _endpoint_row(*slowest[0]))
+
+
+def _empty():
+    return {
+        'calls': 0, 'requests': 0, 'bytes': 0, 'retries': 0, 'hosts': 0, 'polls': 0,
+        'connections': 0, 'reused': 0,
+        'latency': 0.0, 'wait': 0.0, 'queued': 0.0, 'wall': 0.0, 'endpoints': {},
+    }
+
+
+def _add(target, metrics):
+    for k in ['calls', 'requests', 'bytes', 'retries', 'polls', 'connections', 'reused', 'latency', 'wait', 'queued']:
+        target[k] = target[k] + metrics.get(k, 0)
+
+
+def _add_endpoints(target, endpoints):
+    for name, e in endpoints.items():
+        t = target.setdefault(name, {'calls': 0, 'bytes': 0, 'latency': 0.0, 'max': 0.0})
+        t['calls'] = t['calls'] + e['calls']
+        t['bytes'] = t['bytes'] + e['bytes']
+        t['latency'] = t['latency'] + e['latency']
+        t['max'] = max(t['max'], e.get('max', 0.0))
+
+
+def _slowest(endpoints):
+    return sorted(endpoints.items(), key=lambda e: e[1]['latency'], reverse=True)
+
+
+def _endpoint_row(name, e):
+    return '%-50s calls=%-6d latency=%8.3fs avg=%.3fs max=%.3fs' % (
+        name, e['calls'], e['latency'], e['latency'] / max(e['calls'], 1), e['max'])
@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2020, muradm <mail@muradm.net>
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+name: linode
+short_description: Linode instances inventory
+description:
+    - Builds inventory of Linode instances, one host per instance named by its label, from paginated
+      list of instances. Host variables are the same the C(muradm.linode.instance) role sets,
+      C(ansible_host) is first public IPv4 address, C(ansible_linode_instance) is the instance in JSON
+      serialized form and C(ansible_private_ipv4_address) is first private IPv4 address if any.
+    - Hosts are grouped by tags, region and type, more groups and variables can be constructed.
+    - With cache enabled, cached inventory is not loaded again, but refreshed with instances updated
+      since it was cached, and instances deleted since then are removed by C(linode_delete) events
+      of account. That is two requests regardless of number of instances.
+    - Configuration file name should end with C(linode.yml) or C(linode.yaml).
+options:
+  plugin:
+    description: Token that ensures this is a source file for the plugin.
+    required: true
+    choices: ['muradm.linode.linode']
+  access_token:
+    description: Linode API access token.
+    type: str
+    required: true
+    env:
+      - name: LINODE_ACCESS_TOKEN
+  api_url:
+    description: Linode API base URL.
+    type: str
+    default: https://api.linode.com/v4
+    env:
+      - name: LINODE_API_URL
+  tags:
+    description: Only instances having any of these tags are included.
+    type: list
+    elements: str
+  regions:
+    description: Only instances in these regions are included.
+    type: list
+    elements: str
+  types:
+    description: Only instances of these types are included.
+    type: list
+    elements: str
+  group_by:
+    description: Instance fields to group hosts by, into C(tag_<tag>), C(region_<region>) and C(type_<type>) groups.
+    type: list
+    elements: str
+    choices: ['tags', 'region', 'type']
+    default: ['tags', 'region', 'type']
+  incremental:
+    description:
+      - Refresh cached inventory with changes since it was cached, instead of using it as is.
+      - Takes effect only when cache is enabled, cached inventory older than I(cache_timeout) is
+        loaded again entirely.
+    type: bool
+    default: true
+requirements: [ "linode_api4" ]
+extends_documentation_fragment:
+  - constructed
+  - inventory_cache
+author:
+- muradm (@muradm)
+'''
+
+EXAMPLES = r'''
+# inventory.linode.yml
+plugin: muradm.linode.linode
+tags:
+  - web
+  - db
+cache: true
+cache_plugin: ansible.builtin.jsonfile
+cache_connection: ~/.cache/ansible-linode
+cache_timeout: 86400
+keyed_groups:
+  - key: ansible_linode_instance.specs.vcpus
+    prefix: vcpus
+compose:
+  ansible_user: "'root'"
+'''
+
+from ansible.plugins.inventory import BaseInventoryPlugin, Cacheable, Constructable
+from ..module_utils.linode.__init__ import linode_client, linode_filter, linode_find_all
+
+
+# cached inventory format, cache of other versions is loaded again
+LINODE_INVENTORY_VERSION = 1
+
+# addresses Linode allocates private IPv4 from
+LINODE_PRIVATE_NETWORK = u'192.168.128.0/17'
+
+LINODE_INVENTORY_GROUPS = {
+    'tags': 'tag',
+    'region': 'region',
+    'type': 'type',
+}
+
+
+class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
+    NAME = 'muradm.linode.linode'
+
+    def verify_file(self, path):
+        if super(InventoryModule, self).verify_file(path):
+            return path.endswith(('linode.yml', 'linode.yaml'))
+        return False
+
+    def parse(self, inventory, loader, path, cache=True):
+        super(InventoryModule, self).parse(inventory, loader, path, cache)
+        self._read_config_data(path)
+
+        self.client = linode_client(
+            {'access_token': self.get_option('access_token')},
+            {'linode_api_url': self.get_option('api_url')},
+        )
+
+        scope = {
+            'tags': self.get_option('tags') or None,
+            'region': self.get_option('regions') or None,
+            'type': self.get_option('types') or None,
+        }
+
+        cache_key = self.get_cache_key(path)
+        use_cache = self.get_option('cache') and cache
+
+        cached = None
+        if use_cache:
+            try:
+                cached = self._cache[cache_key]
+            except KeyError:
+                pass
+
+        if cached is None or cached.get('version', None) != LINODE_INVENTORY_VERSION or cached['scope'] != scope:
+            state = self._load(scope)
+        elif self.get_option('incremental'):
+            state = self._refresh(cached, scope)
+        else:
+            state = cached
+
+        if self.get_option('cache'):
+            self._cache[cache_key] = state
+
+        self._populate(state['instances'])
+
+    def _load(self, scope):
+        from linode_api4 import Instance
+
+        # cursor is the latest deletion, taken first, so that instances
+        # deleted while they are listed are not missed
+        state = {
+            'version': LINODE_INVENTORY_VERSION,
+            'scope': scope,
+            'cursor': self._events_cursor(),
+            'instances': {},
+        }
+
+        for instance in linode_find_all(self.client, Instance, linode_filter(**scope)):
+            state['instances'][str(instance.id)] = instance._raw_json
+
+        state['updated'] = _latest_updated(state['instances'])
+
+        return state
+
+    def _refresh(self, state, scope):
+        from linode_api4 import Instance
+        from ..module_utils.linode.events import linode_events_list
+        from ..module_utils.linode.instance import _instance_matches
+
+        instances = dict(state['instances'])
+
+        # updates are not filtered by scope, so that instances which left
+        # it are dropped as well
+        filters = {'updated': {'+gte': state['updated']}} if state['updated'] else None
+        updated = linode_find_all(self.client, Instance, filters)
+        for instance in updated:
+            if _instance_matches(instance._raw_json, scope):
+                instances[str(instance.id)] = instance._raw_json
+            else:
+                instances.pop(str(instance.id), None)
+
+        deleted = linode_events_list(self.client, {
+            '+and': [{'id': {'+gt': state['cursor']}}, {'action': 'linode_delete'}],
+        })
+        for event in deleted:
+            entity = event.get('entity', None) or {}
+            instances.pop(str(entity.get('id', None)), None)
+
+        self.display.vvv('linode inventory: refreshed, %d updated, %d deleted' % (len(updated), len(deleted)))
+
+        return {
+            'version': LINODE_INVENTORY_VERSION,
+            'scope': scope,
+            'cursor': max([e['id'] for e in deleted] + [state['cursor']]),
+            'instances': instances,
+            'updated': _latest_updated(instances) or state['updated'],
+        }
+
+    def _events_cursor(self):
+        from ..module_utils.linode.events import linode_events_list
+
+        latest = linode_events_list(
+            self.client, {'action': 'linode_delete', '+order_by': 'id', '+order': 'desc'}, pages=1)
+
+        return max([e['id'] for e in latest]) if len(latest) > 0 else 0
+
+    def _populate(self, instances):
+        strict = self.get_option('strict')
+        group_by = self.get_option('group_by')
+
+        for instance in sorted(instances.values(), key=lambda i: i['label']):
+            host = instance['label']
+            self.inventory.add_host(host)
+
+            hostvars = _instance_hostvars(instance)
+            for k, v in hostvars.items():
+                self.inventory.set_variable(host, k, v)
+
+            for field in group_by:
+                values = instance.get(field, None)
+                values = values if isinstance(values, list) else [values]
+                for value in values:
+                    if value is None:
+                        continue
+                    group = self._sanitize_group_name('%s_%s' % (LINODE_INVENTORY_GROUPS[field], value))
+                    self.inventory.add_group(group)
+                    self.inventory.add_child(group, host)
+
+            self._set_composite_vars(self.get_option('compose'), hostvars, host, strict=strict)
+            self._add_host_to_composed_groups(self.get_option('groups'), hostvars, host, strict=strict)
+            self._add_host_to_keyed_groups(self.get_option('keyed_groups'), hostvars, host, strict=strict)
+
+
+def _instance_hostvars(instance):
+    from ipaddress import ip_address, ip_network
+
+    network = ip_network(LINODE_PRIVATE_NETWORK)
+    public = [a for a in instance.get('ipv4', []) if ip_address(a) not in network]
+    private = [a for a in instance.get('ipv4', []) if ip_address(a) in network]
+
+    hostvars = {'ansible_linode_instance': instance}
+    if len(public) > 0:
+        hostvars['ansible_host'] = public[0]
+    if len(private) > 0:
+        hostvars['ansible_private_ipv4_address'] = private[0]
+
+    return hostvars
+
+
+def _latest_updated(instances):
+    updated = [i['updated'] for i in instances.values() if i.get('updated', None)]
+
+    return max(updated) if len(updated) > 0 else None
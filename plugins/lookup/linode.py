@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2020, muradm <mail@muradm.net>
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+name: linode
+short_description: Look up Linode instances, volumes, domains and balancers by label
+description:
+    - Resolves many labels, or domain names, at once into Linode objects in JSON serialized form, or
+      into one of their attributes. Labels are looked up with single filtered list request per up to
+      50 labels.
+    - Results are remembered for the run and shared by all workers, so that the same labels looked up
+      again by other tasks or hosts cost no requests. Labels which are not found are not remembered.
+      Remembered results are dropped once this collection changes objects of the same kind.
+options:
+  _terms:
+    description: Labels of objects to look up, domain names for I(kind) C(domain).
+    required: true
+  kind:
+    description: Kind of objects to look up.
+    type: str
+    choices: ['instance', 'volume', 'domain', 'balancer']
+    default: instance
+  attribute:
+    description: Dot separated path of attribute to return instead of whole object, like C(ipv4.0).
+    type: str
+  on_missing:
+    description: What to do for labels which are not found, C(error) fails, C(warn) and C(skip) return None for them.
+    type: str
+    choices: ['error', 'warn', 'skip']
+    default: error
+  ttl:
+    description: Seconds results are remembered for.
+    type: float
+    default: 300
+requirements: [ "linode_api4" ]
+notes:
+  - Access token and other client settings are taken from variables, like C(linode_access_token), or
+    environment, the same way as for actions.
+author:
+- muradm (@muradm)
+'''
+
+EXAMPLES = r'''
+- name: backends of load balancer
+  ansible.builtin.template:
+    src: haproxy.cfg.j2
+    dest: /etc/haproxy/haproxy.cfg
+  vars:
+    backends: "{{ query('muradm.linode.linode', *groups['web'], attribute='ipv4.0') }}"
+
+- name: path of data volume
+  ansible.builtin.debug:
+    msg: "{{ lookup('muradm.linode.linode', 'db-data', kind='volume', attribute='filesystem_path') }}"
+'''
+
+RETURN = r'''
+_list:
+  description: Objects or their attributes, in order of given labels.
+  type: list
+'''
+
+from ansible.errors import AnsibleError
+from ansible.plugins.lookup import LookupBase
+from ansible.utils.display import Display
+from ..module_utils.linode.__init__ import (
+    linode_client, balancer_find_many, domain_find_many, instance_find_many, volume_find_many)
+
+
+display = Display()
+
+# snapshot entries, and find functions by kind
+LINODE_LOOKUP_KINDS = {
+    'instance': ('linode/instances#lookup', instance_find_many),
+    'volume': ('volumes#lookup', volume_find_many),
+    'domain': ('domains#lookup', domain_find_many),
+    'balancer': ('nodebalancers#lookup', balancer_find_many),
+}
+
+
+class LookupModule(LookupBase):
+    def run(self, terms, variables=None, **kwargs):
+        from ..module_utils.linode.snapshot import LinodeSnapshot
+
+        self.set_options(var_options=variables, direct=kwargs)
+
+        labels = [str(t) for t in terms]
+        client = linode_client({}, variables or {})
+        key, find = LINODE_LOOKUP_KINDS[self.get_option('kind')]
+
+        snapshot = LinodeSnapshot(client.token, ttl=self.get_option('ttl'))
+        found = snapshot.get_many(key, sorted(set(labels)), lambda missing: {
+            k: v._raw_json for k, v in find(client, missing).items()
+        })
+
+        missing = [label for label in labels if label not in found]
+        if len(missing) > 0:
+            message = 'linode %s not found: %s' % (self.get_option('kind'), ', '.join(missing))
+            if self.get_option('on_missing') == 'error':
+                raise AnsibleError(message)
+            if self.get_option('on_missing') == 'warn':
+                display.warning(message)
+
+        attribute = self.get_option('attribute')
+
+        return [
+            _attribute(found[label], attribute) if label in found and attribute else found.get(label, None)
+            for label in labels
+        ]
+
+
+def _attribute(data, path):
+    for part in path.split('.'):
+        if isinstance(data, list):
+            try:
+                data = data[int(part)]
+            except (ValueError, IndexError):
+                raise AnsibleError('no %s in %s' % (part, path))
+        elif isinstance(data, dict):
+            if part not in data:
+                raise AnsibleError('no %s in %s' % (part, path))
+            data = data[part]
+        else:
+            raise AnsibleError('no %s in %s' % (part, path))
+
+    return data
@@ -6,12 +6,42 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
-from .client import linode_client, linode_wait_for_status, linode_wait_for_status_changed
-from .validator import linode_schema, linode_action_input_validated
-from .domain import domain_find, domain_create, domain_update, domain_remove
-from .domain_record import domain_record_find, domain_record_create, domain_record_update, domain_record_remove, domain_record_match
-from .instance import instance_find, instance_create, instance_update, instance_remove
-from .volume import volume_find, volume_create, volume_update, volume_remove
-from .balancer import balancer_find, balancer_create, balancer_update, balancer_remove
-from .balancer_config import balancer_config_find, balancer_config_create, balancer_config_update, balancer_config_remove
-from .balancer_node import balancer_node_find, balancer_node_create, balancer_node_update, balancer_node_remove
+from importlib import import_module
+
+
+# exports are resolved on first access, so that action only loads modules
+# of resources it manages
+_exports = {
+    'client': ['linode_client', 'linode_client_stats', 'linode_metrics', 'linode_uncached', 'linode_wait_for_all', 'linode_wait_for_status', 'linode_wait_for_status_changed'],
+    'job': ['linode_job', 'linode_join'],
+    'filter': ['linode_filter', 'linode_find_all', 'linode_find_first', 'linode_find_many', 'linode_find_id'],
+    'paging': ['linode_pages', 'linode_objects'],
+    'ids': ['linode_ids', 'linode_id', 'linode_ids_update', 'linode_ids_facts'],
+    'validator': ['linode_schema', 'linode_action_input_validated'],
+    'domain': ['domain_find', 'domain_find_many', 'domain_create', 'domain_update', 'domain_remove'],
+    'domain_record': ['domain_record_find', 'domain_record_create', 'domain_record_update', 'domain_record_remove', 'domain_record_match', 'domain_record_identity'],
+    'instance': ['instance_find', 'instance_find_many', 'instance_create', 'instance_update', 'instance_remove'],
+    'volume': ['volume_find', 'volume_find_many', 'volume_create', 'volume_update', 'volume_remove'],
+    'balancer': ['balancer_find', 'balancer_find_many', 'balancer_create', 'balancer_update', 'balancer_remove'],
+    'balancer_config': ['balancer_config_find', 'balancer_config_create', 'balancer_config_update', 'balancer_config_remove'],
+    'balancer_node': ['balancer_node_find', 'balancer_node_create', 'balancer_node_update', 'balancer_node_remove'],
+}
+
+_modules = {name: module for module, names in _exports.items() for name in names}
+
+__all__ = sorted(_modules.keys())
+
+
+def __getattr__(name):
+    module = _modules.get(name, None)
+    if module is None:
+        raise AttributeError('module %s has no attribute %s' % (__name__, name))
+
+    value = getattr(import_module('.%s' % module, __package__), name)
+    globals()[name] = value
+
+    return value
+
+
+def __dir__():
+    return sorted(list(globals().keys()) + __all__)
@@ -8,14 +8,26 @@ __metaclass__ = type
 
 from copy import deepcopy
 from datetime import datetime
-from .balancer_config import balancer_config_create, balancer_config_update, balancer_config_remove
+from .balancer_config import balancer_config_create, balancer_config_update, balancer_config_remove, _balancer_configs
 from .error import linode_raise_client_error
+from .filter import linode_filter, linode_find_all, linode_find_id, linode_find_many
+from .retry import linode_retry_create
 from .util import _filter_dict_keys, _update_if_needed
 
 
-def balancer_find(client, label):
+def balancer_find(client, label, id=None):
     from linode_api4 import NodeBalancer
 
+    snapshot = _balancer_snapshot(client)
+    if snapshot is not None:
+        i = snapshot['labels'].get(label, None)
+        return NodeBalancer(client, int(i), snapshot['ids'][i]) if i is not None else None
+
+    if id is not None:
+        balancer = linode_find_id(client, NodeBalancer, id, lambda b: b.label == label)
+        if balancer is not None:
+            return balancer
+
     try:
         return client.nodebalancers(NodeBalancer.label == label)[0]
     except IndexError:
@@ -24,13 +36,52 @@ def balancer_find(client, label):
         linode_raise_client_error(e)
 
 
+def balancer_find_many(client, labels=None, region=None):
+    from linode_api4 import NodeBalancer
+
+    criteria = {'region': region}
+
+    if labels is None:
+        balancers = linode_find_all(client, NodeBalancer, linode_filter(**criteria))
+        return {b.label: b for b in balancers}
+
+    return linode_find_many(client, NodeBalancer, 'label', labels, **criteria)
+
+
+def _balancer_snapshot(client):
+    '''
+    Balancers of play snapshot indexed by id and label, None if snapshot
+    is not enabled or reads are to bypass caches.
+    '''
+    snapshots = client.session.snapshots
+    if snapshots is None or client.session.is_uncached():
+        return None
+
+    return snapshots.get('nodebalancers', lambda: _balancer_snapshot_load(client))
+
+
+def _balancer_snapshot_load(client):
+    from linode_api4 import NodeBalancer
+
+    balancers = linode_find_all(client, NodeBalancer)
+
+    return {
+        'ids': {str(b.id): b._raw_json for b in balancers},
+        'labels': {b.label: str(b.id) for b in balancers},
+    }
+
+
 def balancer_create(client, args, check_mode=False):
     non_optional = ['region']
     remaining = _filter_dict_keys(args, non_optional)
 
     try:
         if not check_mode:
-            balancer = client.nodebalancer_create(args['region'], **remaining)
+            balancer = linode_retry_create(
+                client,
+                lambda: client.nodebalancer_create(args['region'], **remaining),
+                lambda: balancer_find(client, args['label']),
+            )
             result = deepcopy(balancer._raw_json)
             result['nodes'] = []
 
@@ -90,11 +141,14 @@ def balancer_update(balancer, args, check_mode=False):
             keep_unknown_configs = args['keep_unknown_configs'] if 'keep_unknown_configs' in args else False
             return_unknown_configs = args['return_unknown_configs'] if 'return_unknown_configs' in args else False
             aconfigs = args['configs']
-            cconfigs = balancer.configs
+            cconfigs = _balancer_configs(balancer)
             rconfigs = []
 
             for cconfig in cconfigs:
-                if not _is_config_configured(cconfig, aconfigs):
+                # port is read once, linode_api4 resolves every attribute
+                # access of its objects
+                port = cconfig.port
+                if not _is_config_configured(port, aconfigs):
                     if not keep_unknown_configs:
                         balancer_config_remove(cconfig, check_mode)
                         updated = True
@@ -102,7 +156,7 @@ def balancer_update(balancer, args, check_mode=False):
                         rconfigs.append(cconfig._raw_json)
                 else:
                     for aconfig in aconfigs:
-                        if cconfig.port == aconfig['port']:
+                        if port == aconfig['port']:
                             upd, config = balancer_config_update(
                                 cconfig, aconfig, check_mode)
                             rconfigs.append(config)
@@ -139,9 +193,9 @@ def balancer_remove(balancer, check_mode=False):
         linode_raise_client_error(e)
 
 
-def _is_config_configured(cconfig, aconfigs):
+def _is_config_configured(port, aconfigs):
     for aconfig in aconfigs:
-        if aconfig['port'] == cconfig.port:
+        if aconfig['port'] == port:
             return True
     return False
 
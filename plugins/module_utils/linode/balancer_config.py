@@ -8,19 +8,35 @@ __metaclass__ = type
 
 from copy import deepcopy
 from .balancer_node import balancer_node_create, balancer_node_update, balancer_node_remove
+from .balancer_node import _balancer_nodes, _balancer_nodes_load, _balancer_node_of
 from .error import linode_raise_client_error
+from .filter import linode_find_all, linode_find_first, linode_find_id
+from .retry import linode_retry_create
 from .util import _filter_dict_keys, _update_if_needed
 
 
-def balancer_config_find(balancer, port):
-    try:
-        for config in balancer.configs:
+LINODE_CONFIGS_ENDPOINT = '/nodebalancers/{id}/configs'
+
+
+def balancer_config_find(balancer, port, id=None):
+    from linode_api4 import NodeBalancerConfig
+
+    configs = _balancer_configs_snapshot(balancer)
+    if configs is not None:
+        for config in configs:
             if config.port == port:
                 return config
-
         return None
-    except Exception as e:
-        linode_raise_client_error(e)
+
+    if id is not None:
+        config = linode_find_id(
+            balancer._client, NodeBalancerConfig, id, lambda c: c.port == port, parent_id=balancer.id)
+        if config is not None:
+            return config
+
+    return linode_find_first(
+        balancer._client, NodeBalancerConfig, lambda c: c.port == port,
+        endpoint=LINODE_CONFIGS_ENDPOINT, model=balancer, parent_id=balancer.id)
 
 
 def balancer_config_create(balancer, args, check_mode=False):
@@ -29,7 +45,11 @@ def balancer_config_create(balancer, args, check_mode=False):
 
     try:
         if not check_mode:
-            config = balancer.config_create(label=None, **remaining)
+            config = linode_retry_create(
+                balancer._client,
+                lambda: balancer.config_create(label=None, **remaining),
+                lambda: balancer_config_find(balancer, args['port']),
+            )
             result = deepcopy(config._raw_json)
             result['nodes'] = []
 
@@ -89,20 +109,22 @@ def balancer_config_update(config, args, check_mode=False):
             keep_unknown_nodes = args['keep_unknown_nodes'] if 'keep_unknown_nodes' in args else True
             return_unknown_nodes = args['return_unknown_nodes'] if 'return_unknown_nodes' in args else False
             anodes = args['nodes']
-            cnodes = config.nodes
+            cnodes = _balancer_nodes(config)
             rnodes = []
 
             for cnode in cnodes:
-                if not _is_node_configured(cnode, anodes):
+                # address is read once, linode_api4 resolves every
+                # attribute access of its objects
+                address = cnode.address
+                if not _is_node_configured(address, anodes):
                     if not keep_unknown_nodes:
                         balancer_node_remove(cnode, check_mode)
                         updated = True
                     elif return_unknown_nodes:
-                        cnode.address  # touch node address, so that linode_api4 loads it
                         rnodes.append(cnode._raw_json)
                 else:
                     for anode in anodes:
-                        if cnode.address == anode['address']:
+                        if address == anode['address']:
                             upd, node = balancer_node_update(
                                 cnode, anode, check_mode)
                             rnodes.append(node)
@@ -132,9 +154,64 @@ def balancer_config_remove(config, check_mode=False):
         linode_raise_client_error(e)
 
 
-def _is_node_configured(cnode, anodes):
+def _balancer_configs(balancer):
+    '''
+    Configs of balancer, from play snapshot with their nodes if it is
+    enabled.
+    '''
+    from linode_api4 import NodeBalancerConfig
+
+    configs = _balancer_configs_snapshot(balancer)
+    if configs is not None:
+        return configs
+
+    return linode_find_all(
+        balancer._client, NodeBalancerConfig,
+        endpoint=LINODE_CONFIGS_ENDPOINT, model=balancer, parent_id=balancer.id)
+
+
+def _balancer_configs_snapshot(balancer):
+    '''
+    Configs of balancer of play snapshot, with their nodes loaded, None if
+    snapshot is not enabled or reads are to bypass caches. Snapshot takes
+    single list request for configs and one per config for its nodes.
+    '''
+    from linode_api4 import NodeBalancerConfig
+
+    session = balancer._client.session
+    if session.snapshots is None or session.is_uncached():
+        return None
+
+    snapshot = session.snapshots.get(
+        'nodebalancers/%s/configs' % balancer.id, lambda: _balancer_configs_load(balancer))
+
+    configs = []
+    for c in snapshot:
+        config = NodeBalancerConfig(balancer._client, c['config']['id'], balancer.id, c['config'])
+        _balancer_nodes(config, [
+            _balancer_node_of(balancer._client, balancer.id, config.id, n) for n in c['nodes'].values()
+        ])
+        configs.append(config)
+
+    return configs
+
+
+def _balancer_configs_load(balancer):
+    from linode_api4 import NodeBalancerConfig
+
+    configs = linode_find_all(
+        balancer._client, NodeBalancerConfig,
+        endpoint=LINODE_CONFIGS_ENDPOINT, model=balancer, parent_id=balancer.id)
+
+    return [
+        {'config': c._raw_json, 'nodes': {str(n['id']): n for n in _balancer_nodes_load(c)}}
+        for c in configs
+    ]
+
+
+def _is_node_configured(address, anodes):
     for anode in anodes:
-        if anode['address'] == cnode.address:
+        if anode['address'] == address:
             return True
     return False
 
@@ -6,14 +6,40 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
+from contextlib import contextmanager
 from copy import deepcopy
 from .error import linode_raise_client_error
+from .filter import linode_find_id
+from .paging import linode_pages
+from .retry import linode_retry_create
 from .util import _filter_dict_keys, _update_if_needed
 
 
-def balancer_node_find(config, address):
+LINODE_NODES_ENDPOINT = '/nodebalancers/{nodebalancer_id}/configs/{id}/nodes'
+
+
+def balancer_node_find(config, address, id=None):
+    from linode_api4 import NodeBalancerNode
+
+    # nodes of config from snapshot are loaded already
+    if id is not None and not hasattr(config, '_nodes'):
+        node = linode_find_id(
+            config._client, NodeBalancerNode, id, lambda n: n.address == address,
+            parent_id=(config.id, config.nodebalancer_id))
+        if node is not None:
+            return node
+
+    # nodes not loaded yet are read only until the one is found
+    if hasattr(config, '_nodes'):
+        nodes = config._nodes
+    else:
+        nodes = (
+            _balancer_node_of(config._client, config.nodebalancer_id, config.id, n)
+            for n in linode_pages(config._client, LINODE_NODES_ENDPOINT, model=config)
+        )
+
     try:
-        for node in config.nodes:
+        for node in nodes:
             if node.address == address:
                 return node
 
@@ -22,17 +48,30 @@ def balancer_node_find(config, address):
         linode_raise_client_error(e)
 
 
+def _balancer_node_refind(config, address):
+    # config caches its nodes list once loaded
+    if hasattr(config, '_nodes'):
+        del config._nodes
+
+    return balancer_node_find(config, address)
+
+
 def balancer_node_create(config, args, check_mode=False):
     non_optional = ['address', 'label']
     remaining = _filter_dict_keys(args, non_optional)
 
     try:
         if not check_mode:
-            node = config.node_create(
-                label=args['label'],
-                address=args['address'],
-                **remaining
-            )
+            with _balancer_nodes_amending(config._client, config.nodebalancer_id):
+                node = linode_retry_create(
+                    config._client,
+                    lambda: config.node_create(
+                        label=args['label'],
+                        address=args['address'],
+                        **remaining
+                    ),
+                    lambda: _balancer_node_refind(config, args['address']),
+                )
 
             result = deepcopy(node._raw_json)
         else:
@@ -54,7 +93,8 @@ def balancer_node_update(node, args, check_mode=False):
                 node, result, args, f, check_mode)
 
         if updated and not check_mode:
-            node.save()
+            with _balancer_nodes_amending(node._client, node.nodebalancer_id):
+                node.save()
 
         return (updated, result)
     except Exception as e:
@@ -64,13 +104,68 @@ def balancer_node_update(node, args, check_mode=False):
 def balancer_node_remove(node, check_mode=False):
     try:
         if not check_mode:
-            node.delete()
+            with _balancer_nodes_amending(node._client, node.nodebalancer_id):
+                node.delete()
 
         return {'status': 'deleted'}
     except Exception as e:
         linode_raise_client_error(e)
 
 
+def _balancer_nodes(config, nodes=None):
+    '''
+    Nodes of config, loaded once with their JSON, or given ones, like of
+    snapshot, kept as plain attribute of config. linode_api4 builds nodes
+    of list without it, passing it where nodebalancer_id is expected, so
+    that every node would be loaded again on first access.
+    '''
+    if nodes is not None:
+        config._nodes = nodes
+    elif not hasattr(config, '_nodes'):
+        config._nodes = [
+            _balancer_node_of(config._client, config.nodebalancer_id, config.id, n)
+            for n in _balancer_nodes_load(config)
+        ]
+
+    return config._nodes
+
+
+def _balancer_nodes_load(config):
+    return list(linode_pages(config._client, LINODE_NODES_ENDPOINT, model=config))
+
+
+def _balancer_node_of(client, balancer_id, config_id, node):
+    from linode_api4 import NodeBalancerNode
+
+    return NodeBalancerNode(client, node['id'], (config_id, balancer_id), json=node)
+
+
+def _balancer_configs_amended(configs, path, response):
+    # path is nodebalancers/<id>/configs/<id>/nodes[/<id>], response is
+    # created or updated node, empty for deleted one
+    parts = path.split('/')
+    for config in configs:
+        if str(config['config']['id']) != parts[3]:
+            continue
+        if 'id' in response:
+            config['nodes'][str(response['id'])] = response
+        else:
+            config['nodes'].pop(parts[-1], None)
+
+    return configs
+
+
+@contextmanager
+def _balancer_nodes_amending(client, balancer_id):
+    # node writes keep balancers snapshot as is, and update configs
+    # snapshot of the balancer, instead of dropping both
+    with client.session.amending({
+        'nodebalancers': lambda snapshot, path, response: snapshot,
+        'nodebalancers/%s/configs' % balancer_id: _balancer_configs_amended,
+    }):
+        yield
+
+
 def _fake_balancer_node(args):
     return {
         "address": args['address'],
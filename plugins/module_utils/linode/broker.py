@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2020, muradm <mail@muradm.net>
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+
+from ansible.module_utils._text import to_bytes, to_native, to_text
+from ansible.module_utils.connection import recv_data, send_data
+from hashlib import sha256
+from json import dumps, loads
+from os.path import exists, join
+from threading import Lock, Thread
+from time import sleep, time
+from .ratelimit import LinodeRateLimiter
+from .session import LinodeSession, LinodeResponse
+from .util import log, _linode_runtime_dir, _linode_run_id
+
+
+class LinodeBroker(object):
+    '''
+    Client side of local broker process. Broker is started on demand by
+    first worker of a play and serves API requests of all the other workers
+    of the same play over unix socket, so that they share its connections,
+    response cache and rate limit state. Messages are framed the same way
+    as for ansible persistent connections.
+    '''
+
+    def __init__(self, token, pool_maxsize=10, connect_timeout=10, read_timeout=60, rate_limits=None, retry=None, cache_ttl=10, idle_timeout=60):
+        self.run_id = _linode_run_id()
+        self.path = join(_linode_runtime_dir(str(self.run_id)), 'broker.sock')
+        self.settings = {
+            'token': token,
+            'rate_limits': rate_limits,
+            'retry': retry,
+            'pool_maxsize': pool_maxsize,
+            'connect_timeout': connect_timeout,
+            'read_timeout': read_timeout,
+            'cache_ttl': cache_ttl,
+            'idle_timeout': idle_timeout,
+        }
+        self.sock = None
+        self.lock = Lock()
+        self.disabled = False
+
+    def request(self, method, url, headers=None, data=None, timeout=None, uncached=False):
+        if self.disabled:
+            return None
+
+        message = {
+            'method': method,
+            'url': url,
+            'headers': dict(headers or {}),
+            'data': data,
+            'timeout': timeout,
+            'uncached': uncached,
+        }
+
+        with self.lock:
+            try:
+                if self.sock is None:
+                    self.sock = self._connect()
+                send_data(self.sock, to_bytes(dumps(message)))
+                response = recv_data(self.sock)
+            except Exception as e:
+                log.warning('linode broker %s failed, using direct connection: %s' % (
+                    self.path, to_native(e)))
+                self.close()
+                self.disabled = True
+                return None
+
+            if response is None:
+                # broker went away between requests, let it be respawned
+                self.close()
+                return None
+
+        result = loads(to_text(response))
+        if 'error' in result:
+            from requests import ConnectionError
+            raise ConnectionError(result['error'])
+
+        return LinodeResponse(
+            result['status'], result['headers'], to_bytes(result['body']),
+            result['retries'], result['shared'])
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+    def _connect(self):
+        import fcntl
+
+        sock = self._try_connect()
+        if sock is not None:
+            return sock
+
+        with open(self.path + '.lock', 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                sock = self._try_connect()
+                if sock is not None:
+                    return sock
+
+                self._spawn(lock)
+
+                for _ in range(50):
+                    sock = self._try_connect()
+                    if sock is not None:
+                        return sock
+                    sleep(0.1)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+        raise Exception('broker did not start')
+
+    def _try_connect(self):
+        import socket
+
+        if not exists(self.path):
+            return None
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.settings['connect_timeout'] + self.settings['read_timeout'])
+        try:
+            sock.connect(self.path)
+        except (socket.error, OSError):
+            sock.close()
+            return None
+
+        return sock
+
+    def _spawn(self, lock):
+        log.vvv('linode broker: starting at %s' % self.path)
+
+        pid = os.fork()
+        if pid != 0:
+            os.waitpid(pid, 0)
+            return
+
+        try:
+            lock.close()
+            os.setsid()
+            if os.fork() != 0:
+                os._exit(0)
+
+            devnull = os.open(os.devnull, os.O_RDWR)
+            for fd in [0, 1, 2]:
+                os.dup2(devnull, fd)
+
+            _linode_broker_serve(self.path, self.run_id, **self.settings)
+        finally:
+            os._exit(0)
+
+
+def _linode_broker_serve(path, run_id, token, rate_limits, retry, pool_maxsize, connect_timeout, read_timeout, cache_ttl, idle_timeout):
+    from requests import Session
+    from socketserver import BaseRequestHandler, ThreadingMixIn, UnixStreamServer
+
+    class Handler(BaseRequestHandler):
+        def handle(self):
+            while True:
+                data = recv_data(self.request)
+                if data is None:
+                    return
+
+                response = self.server.broker.serve(loads(to_text(data)))
+                send_data(self.request, to_bytes(dumps(response)))
+
+    class Server(ThreadingMixIn, UnixStreamServer):
+        daemon_threads = True
+
+    if exists(path):
+        os.unlink(path)
+
+    # socket is created private, there is no moment it is open to others
+    umask = os.umask(0o077)
+    try:
+        server = Server(path, Handler)
+    finally:
+        os.umask(umask)
+    server.broker = _LinodeBrokerState(
+        LinodeSession(
+            Session(), pool_maxsize, connect_timeout, read_timeout,
+            rate_limiter=LinodeRateLimiter(token, rate_limits) if rate_limits else None,
+            retry=retry,
+        ),
+        cache_ttl,
+    )
+
+    def _watch():
+        while True:
+            sleep(1)
+            if time() - server.broker.last_activity > idle_timeout or not _pid_alive(run_id):
+                server.shutdown()
+                return
+
+    Thread(target=_watch, daemon=True).start()
+
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if exists(path):
+            os.unlink(path)
+
+
+class _LinodeBrokerState(object):
+    def __init__(self, session, cache_ttl):
+        self.session = session
+        self.cache_ttl = cache_ttl
+        self.cache = {}
+        self.lock = Lock()
+        self.last_activity = time()
+
+    def serve(self, message):
+        self.last_activity = time()
+
+        headers = message['headers']
+        owner = sha256(to_bytes(headers.get('Authorization', ''))).hexdigest()
+        key = None
+
+        if message['method'] == 'GET' and self.cache_ttl > 0:
+            key = (owner, message['url'], headers.get('X-Filter', None))
+            with self.lock:
+                cached = self.cache.get(key, None)
+            if cached is not None and cached[0] > time() and not message['uncached']:
+                return dict(cached[1], retries=0, shared='cached')
+        else:
+            # any write may change what was read before, drop whatever was
+            # cached for the same access token
+            with self.lock:
+                for k in [k for k in self.cache.keys() if k[0] == owner]:
+                    del self.cache[k]
+
+        try:
+            response, shared = self.session.coalesce(
+                message['method'], message['url'], headers=headers,
+                data=message['data'], timeout=tuple(message['timeout']) if message['timeout'] else None)
+        except Exception as e:
+            return {'error': to_native(e)}
+
+        result = {
+            'status': response.status_code,
+            'headers': dict(response.headers),
+            'body': to_text(response.content),
+            'retries': 0 if shared else response.linode_retries,
+            'shared': 'coalesced' if shared else None,
+        }
+
+        if key is not None and 200 <= response.status_code < 300:
+            with self.lock:
+                self.cache[key] = (time() + self.cache_ttl, result)
+
+        self.last_activity = time()
+
+        return result
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except OSError:
+        return False
+    return True
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2020, muradm <mail@muradm.net>
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+
+from ansible.module_utils._text import to_bytes, to_text
+from hashlib import sha256
+from json import dumps, loads
+from os.path import join
+from tempfile import NamedTemporaryFile
+from time import time
+from .util import log
+
+
+class LinodeResponseCache(object):
+    '''
+    On disk cache of API list responses, one file per request, in directory
+    per access token. Entries younger than ttl are returned as is, older ones
+    are revalidated with conditional request when API provided ETag or
+    Last-Modified for them. Least recently used entries are evicted once
+    cache grows over max_size bytes.
+    '''
+
+    def __init__(self, directory, token, ttl=60, max_size=64 * 1024 * 1024):
+        owner = sha256(to_bytes(token)).hexdigest()[:16]
+        self.path = join(os.path.expanduser(directory), owner)
+        self.ttl = ttl
+        self.max_size = max_size
+        os.makedirs(self.path, mode=0o700, exist_ok=True)
+
+    def get(self, url, headers):
+        path = self._entry_path(url, headers)
+
+        try:
+            with open(path, 'r') as f:
+                entry = loads(f.read())
+            # other worker may have evicted it right after it was read
+            os.utime(path, None)
+        except (IOError, OSError, ValueError):
+            return None
+
+        entry['fresh'] = entry['stored'] + self.ttl > time()
+
+        return entry
+
+    def conditional_headers(self, entry, headers):
+        headers = dict(headers)
+
+        if entry['etag'] is not None:
+            headers['If-None-Match'] = entry['etag']
+        if entry['last_modified'] is not None:
+            headers['If-Modified-Since'] = entry['last_modified']
+
+        return headers
+
+    def store(self, url, headers, response):
+        entry = {
+            'status': response.status_code,
+            'headers': dict(response.headers),
+            'body': to_text(response.content),
+            'etag': response.headers.get('ETag', None),
+            'last_modified': response.headers.get('Last-Modified', None),
+            'stored': time(),
+        }
+        self._write(self._entry_path(url, headers), entry)
+        self._evict()
+
+    def refresh(self, url, headers, entry):
+        entry = dict(entry)
+        del entry['fresh']
+        entry['stored'] = time()
+        self._write(self._entry_path(url, headers), entry)
+
+    def invalidate(self):
+        for name in self._entries():
+            try:
+                os.unlink(join(self.path, name))
+            except OSError:
+                pass
+
+    def _entry_path(self, url, headers):
+        key = '%s\n%s' % (url, headers.get('X-Filter', ''))
+        return join(self.path, sha256(to_bytes(key)).hexdigest() + '.json')
+
+    def _write(self, path, entry):
+        # other workers may read it at the same time, so it is replaced at
+        # once; store is skipped if it fails, entry is only missed then
+        try:
+            with NamedTemporaryFile('w', dir=self.path, suffix='.tmp', delete=False) as f:
+                f.write(dumps(entry))
+            os.replace(f.name, path)
+        except OSError as e:
+            log.vvvv('linode response cache: not stored %s: %s' % (path, str(e)))
+
+    def _entries(self):
+        # temporary files are entries being written by other workers
+        return [name for name in os.listdir(self.path) if name.endswith('.json')]
+
+    def _evict(self):
+        entries = []
+        total = 0
+
+        for name in self._entries():
+            try:
+                st = os.stat(join(self.path, name))
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, name))
+            total = total + st.st_size
+
+        for mtime, size, name in sorted(entries):
+            if total <= self.max_size:
+                break
+            log.vvvv('linode response cache: evicting %s' % name)
+            try:
+                os.unlink(join(self.path, name))
+            except OSError:
+                pass
+            total = total - size
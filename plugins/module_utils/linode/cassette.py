@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2020, muradm <mail@muradm.net>
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from ansible.errors import AnsibleError
+from ansible.module_utils._text import to_bytes, to_text
+from ansible.module_utils.six.moves.urllib.parse import urlparse
+from contextlib import contextmanager
+from hashlib import sha256
+from json import dumps, loads
+from os.path import abspath, expanduser, join
+from threading import Lock
+from time import sleep
+from .session import LinodeResponse
+from .util import _linode_runtime_dir, _linode_run_id
+
+
+LINODE_CASSETTE_MODES = ['record', 'replay']
+
+# values of these fields never get to cassette, neither in requests nor in
+# responses; access token is not recorded at all
+LINODE_CASSETTE_REDACTED = [
+    'root_pass', 'password', 'ssl_key', 'authorized_keys', 'token', 'secret_key',
+]
+
+
+class LinodeCassette(object):
+    '''
+    Records API requests with their responses as JSON lines, or replays them
+    in place of API. In replay, requests are matched by method, path with
+    query, X-Filter and body, and responses recorded for the same request
+    are returned in recorded order; the last one is repeated, so that polls
+    ending earlier than recorded still complete. Recorded latency is slept,
+    multiplied by latency_scale.
+
+    Ansible runs every task in its own forked worker, so replay progress,
+    offset of next response by request, is kept in a file locked on every
+    replayed request and shared by all workers of the run. Next run of
+    playbook starts from the first responses again. Likewise, recording
+    run starts cassette anew, its workers append to it.
+    '''
+
+    def __init__(self, path, mode='replay', latency_scale=1.0):
+        if mode not in LINODE_CASSETTE_MODES:
+            raise AnsibleError(u'linode cassette mode should be one of %s, but got %s' % (
+                ','.join(LINODE_CASSETTE_MODES), mode))
+
+        self.path = expanduser(path)
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self.lock = Lock()
+        self.tapes = None
+        self.state = join(
+            _linode_runtime_dir(str(_linode_run_id())),
+            'cassette-%s.json' % sha256(to_bytes(abspath(self.path))).hexdigest()[:16])
+
+    @property
+    def replaying(self):
+        return self.mode == 'replay'
+
+    def record(self, method, url, headers, data, response, elapsed):
+        entry = {
+            'key': _key(method, url, headers, data),
+            'status': response.status_code,
+            'headers': {k: v for k, v in response.headers.items() if k.lower().startswith('x-') or k.lower() in ['etag', 'last-modified', 'retry-after']},
+            'body': _redacted_body(response.content),
+            'elapsed': round(elapsed, 4),
+        }
+
+        line = to_bytes(dumps(entry, separators=(',', ':'), sort_keys=True) + '\n')
+        with self.lock, self._state() as state:
+            with open(self.path, 'ab' if state.get('recording', False) else 'wb') as f:
+                f.write(line)
+            state['recording'] = True
+
+    def replay(self, method, url, headers, data):
+        with self.lock:
+            if self.tapes is None:
+                self.tapes = self._load()
+
+            key = dumps(_key(method, url, headers, data), sort_keys=True)
+            tape = self.tapes.get(key, None)
+            if tape is None:
+                raise AnsibleError(u'linode cassette %s has no response for %s %s' % (
+                    self.path, method, loads(key)[1]))
+
+            with self._state() as state:
+                offsets = state.setdefault('offsets', {})
+                offset = min(offsets.get(key, 0), len(tape) - 1)
+                offsets[key] = offset + 1
+
+            entry = tape[offset]
+
+        if self.latency_scale > 0:
+            sleep(entry['elapsed'] * self.latency_scale)
+
+        body = b'' if entry['body'] is None else to_bytes(dumps(entry['body']))
+        return LinodeResponse(entry['status'], entry['headers'], body)
+
+    @contextmanager
+    def _state(self):
+        import fcntl
+
+        with open(self.state, 'a+') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                content = f.read()
+                try:
+                    state = loads(content) if content else {}
+                except ValueError:
+                    state = {}
+
+                yield state
+
+                f.seek(0)
+                f.truncate()
+                f.write(dumps(state))
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _load(self):
+        tapes = {}
+
+        try:
+            with open(self.path, 'rb') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = loads(to_text(line))
+                    tapes.setdefault(dumps(entry['key'], sort_keys=True), []).append(entry)
+        except (IOError, OSError) as e:
+            raise AnsibleError(u'could not read linode cassette %s: %s' % (self.path, e))
+
+        return tapes
+
+
+def _key(method, url, headers, data):
+    parsed = urlparse(url)
+    path = parsed.path + ('?' + parsed.query if parsed.query else '')
+    flt = (headers or {}).get('X-Filter', None)
+
+    return [
+        method,
+        path,
+        loads(flt) if flt else None,
+        _redacted(loads(data)) if data else None,
+    ]
+
+
+def _redacted_body(content):
+    if not content:
+        return None
+
+    try:
+        return _redacted(loads(to_text(content)))
+    except ValueError:
+        return None
+
+
+def _redacted(value):
+    if isinstance(value, dict):
+        return {
+            k: ('REDACTED' if k in LINODE_CASSETTE_REDACTED and v else _redacted(v))
+            for k, v in value.items()
+        }
+
+    if isinstance(value, list):
+        return [_redacted(v) for v in value]
+
+    return value
@@ -8,11 +8,73 @@ __metaclass__ = type
 
 from ansible.errors import AnsibleError
 from ansible.module_utils.ansible_release import __version__ as ansible_version
-from os import environ
-from time import sleep
+from ansible.module_utils.parsing.convert_bool import boolean
+from os import environ, getpid
+from threading import Lock
+from random import uniform
+from time import sleep, time
+from .paging import linode_page_size
+from .ratelimit import LinodeRateLimiter, linode_rate_limits, LINODE_RATE_LIMIT_DEFAULT
+from .retry import LinodeRetryPolicy
+from .session import LinodeSession
+from .util import log
+
+
+LINODE_API_URL = 'https://api.linode.com/v4'
+
+# status polls start this often and back off up to the max, in seconds
+LINODE_WAIT_INTERVAL = 1.0
+LINODE_WAIT_INTERVAL_MAX = 15.0
+
+# settings client is built with, pooled client is built again with new
+# ones once any of them changes
+LINODE_CLIENT_SETTINGS = [
+    'pool_maxsize', 'connect_timeout', 'read_timeout', 'page_size',
+    'cassette', 'cassette_mode', 'cassette_latency',
+    'rate_limit', 'rate_limits', 'retries', 'retry_backoff', 'retry_backoff_max',
+    'broker', 'broker_cache_ttl', 'broker_idle_timeout',
+    'cache_dir', 'cache_ttl', 'cache_max_size',
+    'wait_strategy', 'events_interval',
+    'snapshot', 'snapshot_ttl', 'snapshot_tags', 'snapshot_region',
+]
+
+_clients = {}
+_clients_lock = Lock()
+
+
+def _linode_setting(vars, env, name, default=None, convert=str):
+    value = vars.get(
+        'linode_%s' % name,
+        env.get('LINODE_%s' % name.upper(), None)
+    )
+
+    if value is None:
+        return default
+
+    try:
+        return convert(value)
+    except (TypeError, ValueError):
+        raise AnsibleError(u'invalid linode_%s value: %s' % (name, value))
+
+
+def _linode_list(value):
+    if isinstance(value, (list, tuple)):
+        return list(value)
+
+    return [v.strip() for v in str(value).split(',') if v.strip()]
+
+
+def _linode_settings(vars, env):
+    return [vars.get('linode_%s' % name, env.get('LINODE_%s' % name.upper(), None))
+            for name in LINODE_CLIENT_SETTINGS]
 
 
 def linode_client(args, vars, env=environ):
+    '''
+    Client of access token and API URL, pooled within the process, so that
+    keep-alive connections are reused by following calls. Settings are
+    resolved on every call, pooled client is built again if they changed.
+    '''
     try:
         from linode_api4 import LinodeClient
     except ImportError:
@@ -29,36 +91,316 @@ def linode_client(args, vars, env=environ):
     if at is None:
         raise AnsibleError(u'could not resolve linode access token')
 
-    user_agent = 'Ansible-linode_api4/%s' % ansible_version
+    base_url = _linode_setting(vars, env, 'api_url', LINODE_API_URL)
+    key = (at, base_url)
+    settings = _linode_settings(vars, env)
+
+    with _clients_lock:
+        client = _clients.get(key, None)
+
+        # connections of a parent process must not be shared with forked
+        # worker, they are not aware of each other and will break the stream
+        if client is not None and client.session.pid != getpid():
+            client = None
+        elif client is not None and client.session.settings != settings:
+            log.vvvv('linode_client: settings changed, closing pooled client %s' %
+                     str(client.session.snapshot()))
+            client.session.close()
+            client = None
+
+        if client is None:
+            user_agent = 'Ansible-linode_api4/%s' % ansible_version
+            pool_maxsize = _linode_setting(vars, env, 'pool_maxsize', 10, int)
+            connect_timeout = _linode_setting(vars, env, 'connect_timeout', 10, float)
+            read_timeout = _linode_setting(vars, env, 'read_timeout', 60, float)
+
+            cassette = None
+            cassette_path = _linode_setting(vars, env, 'cassette', None)
+            if cassette_path:
+                from .cassette import LinodeCassette
+
+                cassette = LinodeCassette(
+                    cassette_path,
+                    mode=_linode_setting(vars, env, 'cassette_mode', 'replay'),
+                    latency_scale=_linode_setting(vars, env, 'cassette_latency', 1.0, float),
+                )
+
+            # replayed responses are not subject to API limits
+            rate_limits = None
+            if _linode_setting(vars, env, 'rate_limit', True, boolean) and \
+                    (cassette is None or not cassette.replaying):
+                rate_limits = linode_rate_limits(_linode_setting(
+                    vars, env, 'rate_limits', LINODE_RATE_LIMIT_DEFAULT))
+
+            retry = LinodeRetryPolicy(
+                attempts=_linode_setting(vars, env, 'retries', 3, int),
+                backoff=_linode_setting(vars, env, 'retry_backoff', 0.5, float),
+                backoff_max=_linode_setting(vars, env, 'retry_backoff_max', 30, float),
+            )
+
+            # broker process sends requests on its own, so that it would
+            # bypass cassette
+            broker = None
+            if _linode_setting(vars, env, 'broker', False, boolean) and cassette is None:
+                from .broker import LinodeBroker
+
+                broker = LinodeBroker(
+                    at,
+                    pool_maxsize=pool_maxsize,
+                    connect_timeout=connect_timeout,
+                    read_timeout=read_timeout,
+                    rate_limits=rate_limits,
+                    retry=retry,
+                    cache_ttl=_linode_setting(vars, env, 'broker_cache_ttl', 10, float),
+                    idle_timeout=_linode_setting(vars, env, 'broker_idle_timeout', 60, float),
+                )
+
+            cache = None
+            cache_dir = _linode_setting(vars, env, 'cache_dir', None)
+            if cache_dir:
+                from .cache import LinodeResponseCache
+
+                cache = LinodeResponseCache(
+                    cache_dir, at,
+                    ttl=_linode_setting(vars, env, 'cache_ttl', 60, float),
+                    max_size=_linode_setting(vars, env, 'cache_max_size', 64 * 1024 * 1024, int),
+                )
+
+            client = LinodeClient(at, base_url=base_url, user_agent=user_agent)
+            client.session = LinodeSession(
+                client.session,
+                pool_maxsize=pool_maxsize,
+                connect_timeout=connect_timeout,
+                read_timeout=read_timeout,
+                broker=broker,
+                rate_limiter=LinodeRateLimiter(at, rate_limits) if rate_limits else None,
+                retry=retry,
+                cache=cache,
+                cassette=cassette,
+            )
+
+            client.session.settings = settings
+            client.session.page_size = _linode_setting(vars, env, 'page_size', None, linode_page_size)
+
+            strategy = _linode_setting(vars, env, 'wait_strategy', 'poll')
+            if strategy == 'events':
+                from .events import LinodeEventFeed
+
+                client.session.events = LinodeEventFeed(
+                    client, at, interval=_linode_setting(vars, env, 'events_interval', 2.0, float))
+            elif strategy != 'poll':
+                raise AnsibleError(u'invalid linode_wait_strategy value: %s' % strategy)
+
+            if _linode_setting(vars, env, 'snapshot', False, boolean):
+                from .snapshot import LinodeSnapshot
+
+                client.session.snapshots = LinodeSnapshot(
+                    at,
+                    ttl=_linode_setting(vars, env, 'snapshot_ttl', 300, float),
+                    scope={
+                        'tags': _linode_setting(vars, env, 'snapshot_tags', None, _linode_list),
+                        'region': _linode_setting(vars, env, 'snapshot_region', None),
+                    },
+                )
+            else:
+                from .snapshot import LinodeSnapshot
+
+                # lookup plugin remembers results in snapshot state of the
+                # run, writes drop them even if snapshot is not enabled
+                client.session.lookups = LinodeSnapshot(at)
+
+            _clients[key] = client
+        else:
+            log.vvvv('linode_client: reusing pooled client %s' %
+                     str(client.session.snapshot()))
+
+    return client
+
+
+def linode_uncached(client):
+    return client.session.uncached()
 
-    return LinodeClient(at, user_agent=user_agent)
+
+def linode_client_stats(client, since=None):
+    stats = client.session.snapshot()
+
+    if since is not None:
+        stats = _stats_delta(stats, since)
+
+    return stats
+
+
+def linode_metrics(client, since=None):
+    '''
+    Compact summary of API usage for task result, since given client stats.
+    '''
+    stats = linode_client_stats(client, since=since)
+    called = (since or {}).get('endpoints', {})
+
+    return {
+        'calls': stats['calls'],
+        'requests': stats['requests'],
+        'bytes': stats['bytes'],
+        'latency': round(stats['latency'], 3),
+        'retries': stats['retries'],
+        'queued': round(stats.get('queued', 0), 3),
+        'wait': round(stats['wait'], 3),
+        'polls': stats.get('polls', 0),
+        'connections': stats['connections'],
+        'reused': _reused(stats),
+        'endpoints': {
+            k: {
+                'calls': v['calls'], 'bytes': v['bytes'], 'latency': round(v['latency'], 3),
+                'max': round(client.session.peak(k, called.get(k, {}).get('calls', 0)), 3),
+            }
+            for k, v in stats['endpoints'].items() if v['calls'] > 0
+        },
+    }
+
+
+def _reused(stats):
+    # replayed requests are not sent over connections
+    return max(stats['requests'] - stats.get('replayed', 0) - stats['connections'], 0)
+
+
+def _stats_delta(stats, since):
+    delta = {}
+
+    for k, v in stats.items():
+        if isinstance(v, dict):
+            delta[k] = _stats_delta(v, since.get(k, {}))
+        else:
+            delta[k] = v - since.get(k, 0)
+
+    return delta
 
 
 def linode_wait_for_status(obj, status, timeout=600):
+    return _linode_wait(
+        obj, lambda current: current.status == status, timeout,
+        u'%s status wait timeout for: %s' % (status, str(obj)))
+
+
+def linode_wait_for_status_changed(obj, current_status, timeout=600):
+    return _linode_wait(
+        obj, lambda current: current.status != current_status, timeout,
+        u'%s current status change wait timeout for: %s' % (current_status, str(obj)))
+
+
+def _linode_wait(obj, done, timeout, message):
+    '''
+    Polls object until done(obj), starting with short interval which
+    grows exponentially up to LINODE_WAIT_INTERVAL_MAX, with jitter. Object
+    is refreshed from API on every poll. Returns number of polls and seconds
+    waited, which are also counted in client stats.
+    '''
     if not hasattr(obj, 'status'):
         raise AnsibleError(
             u'cannot wait for object without status: %s' % str(obj))
 
-    waited = 0
-    wait_by = 10
-    while obj.status != status:
-        sleep(wait_by)
-        waited = waited + wait_by
-        if waited > timeout and obj.status != status:
+    session = obj._client.session
+    started = time()
+    deadline = started + timeout
+    interval = LINODE_WAIT_INTERVAL
+    polls = 0
+
+    with linode_uncached(obj._client):
+        while not done(obj):
+            remaining = deadline - time()
+            if remaining <= 0:
+                raise AnsibleError(message)
+
+            delay = min(uniform(interval / 2, interval), remaining)
+            sleep(delay)
+            session.count('wait', delay)
+            interval = min(interval * 2, LINODE_WAIT_INTERVAL_MAX)
+
+            # status is volatile, but is cached for 15 seconds by linode_api4
+            obj.invalidate()
+            polls = polls + 1
+
+    session.count('polls', polls)
+
+    return {'polls': polls, 'waited': round(time() - started, 3)}
+
+
+def linode_wait_for_all(objects, status, timeout=600):
+    '''
+    Waits until all objects, instances or volumes, are in status. Instead of
+    polling every object on its own, on every tick objects still pending are
+    listed by id, one filtered request per type (per LINODE_FILTER_CHUNK of
+    them), and refreshed in place. Interval backs off like in
+    linode_wait_for_status. Does not raise on timeout, returns objects which
+    got ready and which did not, with seconds each one took to get ready by
+    type and id. Status can be given per type, as dictionary by class.
+    '''
+    from .filter import linode_find_many
+
+    def target(obj):
+        return status.get(type(obj), None) if isinstance(status, dict) else status
+
+    objects = list(objects)
+    pending = {}
+    for obj in objects:
+        if not hasattr(obj, 'status'):
             raise AnsibleError(
-                u'%s status wait timeout for: %s' % (status, str(obj)))
+                u'cannot wait for object without status: %s' % str(obj))
+        if obj.status != target(obj):
+            pending[(type(obj), obj.id)] = obj
 
+    started = time()
+    deadline = started + timeout
+    interval = LINODE_WAIT_INTERVAL
+    ready_in = {}
+    polls = 0
+    session = objects[0]._client.session if len(objects) > 0 else None
 
-def linode_wait_for_status_changed(obj, current_status, timeout=600):
-    if not hasattr(obj, 'status'):
-        raise AnsibleError(
-            u'cannot wait for object without status: %s' % str(obj))
+    for obj in objects:
+        if (type(obj), obj.id) not in pending:
+            ready_in[(type(obj), obj.id)] = 0.0
+
+    while len(pending) > 0:
+        remaining = deadline - time()
+        if remaining <= 0:
+            break
+
+        delay = min(uniform(interval / 2, interval), remaining)
+        sleep(delay)
+        session.count('wait', delay)
+        interval = min(interval * 2, LINODE_WAIT_INTERVAL_MAX)
+        polls = polls + 1
+
+        for cls in set([k[0] for k in pending.keys()]):
+            ids = [k[1] for k in pending.keys() if k[0] is cls]
+            client = pending[(cls, ids[0])]._client
+
+            with linode_uncached(client):
+                found = linode_find_many(client, cls, 'id', ids)
+
+            for i, fresh in found.items():
+                obj = pending[(cls, i)]
+                obj._populate(fresh._raw_json)
+                if obj.status == target(obj):
+                    ready_in[(cls, i)] = round(time() - started, 3)
+                    del pending[(cls, i)]
+
+    if session is not None:
+        session.count('polls', polls)
+
+    ready = [obj for obj in objects if (type(obj), obj.id) not in pending]
+    timings = sorted(ready_in.values())
 
-    waited = 0
-    wait_by = 10
-    while obj.status == current_status:
-        sleep(wait_by)
-        waited = waited + wait_by
-        if waited > timeout and obj.status == current_status:
-            raise AnsibleError(u'%s current status change wait timeout for: %s' % (
-                current_status, str(obj)))
+    return {
+        'ready': ready,
+        'timed_out': [obj for obj in objects if (type(obj), obj.id) in pending],
+        'ready_in': ready_in,
+        'polls': polls,
+        'waited': round(time() - started, 3),
+        'time_to_ready': {
+            'min': timings[0] if timings else None,
+            'max': timings[-1] if timings else None,
+            'mean': round(sum(timings) / len(timings), 3) if timings else None,
+            'p50': timings[len(timings) // 2] if timings else None,
+            'p95': timings[min(int(len(timings) * 0.95), len(timings) - 1)] if timings else None,
+        },
+    }
@@ -8,14 +8,26 @@ __metaclass__ = type
 
 from copy import deepcopy
 from datetime import datetime
-from .domain_record import domain_record_create, domain_record_update, domain_record_remove, domain_record_match
+from .domain_record import domain_record_create, domain_record_update, domain_record_remove, domain_record_match, _domain_records
 from .error import linode_raise_client_error
-from .util import _filter_dict_keys, _update_if_needed
+from .filter import linode_filter, linode_find_all, linode_find_id, linode_find_many
+from .retry import linode_retry_create
+from .util import _filter_dict_keys, _update_if_needed, objview
 
 
-def domain_find(client, domain):
+def domain_find(client, domain, id=None):
     from linode_api4 import Domain
 
+    snapshot = _domain_snapshot(client)
+    if snapshot is not None:
+        i = snapshot['names'].get(domain, None)
+        return Domain(client, int(i), snapshot['ids'][i]) if i is not None else None
+
+    if id is not None:
+        found = linode_find_id(client, Domain, id, lambda d: d.domain == domain)
+        if found is not None:
+            return found
+
     try:
         return client.domains(Domain.domain == domain)[0]
     except IndexError:
@@ -24,14 +36,53 @@ def domain_find(client, domain):
         linode_raise_client_error(e)
 
 
+def domain_find_many(client, domains=None, tags=None):
+    from linode_api4 import Domain
+
+    criteria = {'tags': tags}
+
+    if domains is None:
+        found = linode_find_all(client, Domain, linode_filter(**criteria))
+        return {d.domain: d for d in found}
+
+    return linode_find_many(client, Domain, 'domain', domains, **criteria)
+
+
+def _domain_snapshot(client):
+    '''
+    Domains of play snapshot indexed by id and domain name, None if
+    snapshot is not enabled or reads are to bypass caches.
+    '''
+    snapshots = client.session.snapshots
+    if snapshots is None or client.session.is_uncached():
+        return None
+
+    return snapshots.get('domains', lambda: _domain_snapshot_load(client))
+
+
+def _domain_snapshot_load(client):
+    from linode_api4 import Domain
+
+    domains = linode_find_all(client, Domain)
+
+    return {
+        'ids': {str(d.id): d._raw_json for d in domains},
+        'names': {d.domain: str(d.id) for d in domains},
+    }
+
+
 def domain_create(client, args, check_mode=False):
     non_optional = ['domain', 'type', 'records']
     remaining = _filter_dict_keys(args, non_optional)
 
     try:
         if not check_mode:
-            domain = client.domain_create(
-                args['domain'], args['type'] == 'master', **remaining)
+            domain = linode_retry_create(
+                client,
+                lambda: client.domain_create(
+                    args['domain'], args['type'] == 'master', **remaining),
+                lambda: domain_find(client, args['domain']),
+            )
             result = deepcopy(domain._raw_json)
         else:
             domain = None
@@ -71,12 +122,15 @@ def domain_update(domain, args, check_mode=False):
         if 'records' in args:
             keep_unknown_records = args['keep_unknown_records'] if 'keep_unknown_records' in args else True
             return_unknown_records = args['return_unknown_records'] if 'return_unknown_records' in args else False
-            drecords = domain.records
+            drecords = _domain_records(domain)
             arecords = args['records']
             rrecords = []
 
             for drec in drecords:
-                if not _domain_record_configured(drec, arecords):
+                # fields are matched on JSON, linode_api4 resolves every
+                # attribute access of its objects
+                dview = objview(drec._raw_json)
+                if not _domain_record_configured(dview, arecords):
                     if not keep_unknown_records:
                         domain_record_remove(drec, check_mode)
                         updated = True
@@ -84,7 +138,7 @@ def domain_update(domain, args, check_mode=False):
                         rrecords.append(drec._raw_json)
                 else:
                     for arec in arecords:
-                        if domain_record_match(drec, arec):
+                        if domain_record_match(dview, arec):
                             upd, rec = domain_record_update(
                                 drec, arec, check_mode)
                             rrecords.append(rec)
@@ -6,9 +6,12 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
+from contextlib import contextmanager
 from copy import deepcopy
 from datetime import datetime
 from .error import linode_raise_client_error
+from .filter import linode_filter, linode_find_all, linode_find_first, linode_find_id
+from .retry import linode_retry_create
 from .util import _filter_dict_keys, _update_if_needed, objview
 
 
@@ -44,15 +47,40 @@ def domain_record_match(_a, _b):
     return _are_same(a, b, ['name', 'target'])
 
 
-def domain_record_find(domain, arec):
-    try:
-        for record in domain.records:
-            if domain_record_match(record, arec):
-                return record
+def domain_record_identity(arec):
+    '''
+    Fields domain_record_match compares, joined, for keeping record ids by.
+    '''
+    a = objview(arec) if isinstance(arec, dict) else arec
+    fields = ['target', 'service', 'protocol', 'port'] if str(a.type).lower() == 'srv' else ['name', 'target']
+
+    return ':'.join([str(a.type).upper()] + [str(getattr(a, f, None)) for f in fields])
+
+
+def domain_record_find(domain, arec, id=None):
+    from linode_api4 import DomainRecord
 
+    snapshot = _domain_records_snapshot(domain)
+    if snapshot is not None:
+        i = snapshot['index'].get(domain_record_identity(arec), None)
+        if i is not None and domain_record_match(snapshot['ids'][i], arec):
+            return DomainRecord(domain._client, int(i), domain.id, snapshot['ids'][i])
         return None
-    except Exception as e:
-        linode_raise_client_error(e)
+
+    if id is not None:
+        record = linode_find_id(
+            domain._client, DomainRecord, id, lambda r: domain_record_match(r, arec), parent_id=domain.id)
+        if record is not None:
+            return record
+
+    # target is part of every match key and is filterable by API, so only
+    # records with the same target are fetched to be matched, and only
+    # until first match
+    target = arec['target'] if isinstance(arec, dict) else arec.target
+
+    return linode_find_first(
+        domain._client, DomainRecord, lambda r: domain_record_match(r, arec), linode_filter(target=target),
+        endpoint='/domains/{id}/records', model=domain, parent_id=domain.id)
 
 
 def domain_record_create(domain, args, check_mode=False):
@@ -61,7 +89,12 @@ def domain_record_create(domain, args, check_mode=False):
 
     try:
         if not check_mode:
-            record = domain.record_create(args['type'], **remaining)
+            with _domain_records_amending(domain._client, domain.id):
+                record = linode_retry_create(
+                    domain._client,
+                    lambda: domain.record_create(args['type'], **remaining),
+                    lambda: domain_record_find(domain, args),
+                )
             result = deepcopy(record._raw_json)
         else:
             result = _fake_domain_record(args)
@@ -101,7 +134,8 @@ def domain_record_update(record, args, check_mode=False):
                 record, result, args, 'tag', check_mode, to_be_lower=True)
 
         if updated and not check_mode:
-            record.save()
+            with _domain_records_amending(record._client, record.domain_id):
+                record.save()
 
         return (updated, result)
     except Exception as e:
@@ -111,13 +145,79 @@ def domain_record_update(record, args, check_mode=False):
 def domain_record_remove(record, check_mode=False):
     try:
         if not check_mode:
-            record.delete()
+            with _domain_records_amending(record._client, record.domain_id):
+                record.delete()
 
         return {'status': 'deleted'}
     except Exception as e:
         linode_raise_client_error(e)
 
 
+def _domain_records_snapshot(domain):
+    '''
+    Records of domain of play snapshot, by id and indexed by identity
+    domain_record_match compares, None if snapshot is not enabled or reads
+    are to bypass caches.
+    '''
+    session = domain._client.session
+    if session.snapshots is None or session.is_uncached():
+        return None
+
+    return session.snapshots.get('domains/%s/records' % domain.id, lambda: _domain_records_load(domain))
+
+
+def _domain_records(domain):
+    from linode_api4 import DomainRecord
+
+    snapshot = _domain_records_snapshot(domain)
+    if snapshot is None:
+        return linode_find_all(
+            domain._client, DomainRecord,
+            endpoint='/domains/{id}/records', model=domain, parent_id=domain.id)
+
+    return [DomainRecord(domain._client, int(i), domain.id, r) for i, r in snapshot['ids'].items()]
+
+
+def _domain_records_load(domain):
+    from linode_api4 import DomainRecord
+
+    records = linode_find_all(
+        domain._client, DomainRecord,
+        endpoint='/domains/{id}/records', model=domain, parent_id=domain.id)
+
+    return _domain_records_indexed({str(r.id): r._raw_json for r in records})
+
+
+def _domain_records_indexed(ids):
+    index = {}
+    for i, record in ids.items():
+        index.setdefault(domain_record_identity(record), i)
+
+    return {'ids': ids, 'index': index}
+
+
+def _domain_records_amended(snapshot, path, response):
+    # response is created or updated record, empty for deleted one
+    ids = snapshot['ids']
+    if 'id' in response:
+        ids[str(response['id'])] = response
+    else:
+        ids.pop(path.rsplit('/', 1)[-1], None)
+
+    return _domain_records_indexed(ids)
+
+
+@contextmanager
+def _domain_records_amending(client, domain_id):
+    # record writes keep domains snapshot as is, and update records
+    # snapshot of the domain, instead of dropping both
+    with client.session.amending({
+        'domains': lambda snapshot, path, response: snapshot,
+        'domains/%s/records' % domain_id: _domain_records_amended,
+    }):
+        yield
+
+
 def _fake_domain_record(args):
     return {
         'created': datetime.now().isoformat(),
@@ -12,6 +12,7 @@ from ansible.module_utils._text import to_native
 
 def linode_raise_client_error(e):
     from linode_api4 import ApiError, UnexpectedResponseError
+    from requests import RequestException
 
     try:
         raise e
@@ -21,3 +22,5 @@ def linode_raise_client_error(e):
         raise AnsibleError(to_native(','.join(e.errors)))
     except UnexpectedResponseError as e:
         raise AnsibleError(u'unexpected client error: %s' % to_native(e))
+    except RequestException as e:
+        raise AnsibleError(u'linode api request failed: %s' % to_native(e))
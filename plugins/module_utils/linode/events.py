@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2020, muradm <mail@muradm.net>
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from ansible.errors import AnsibleError
+from ansible.module_utils._text import to_bytes
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from hashlib import sha256
+from json import dumps, loads
+from os.path import join
+from random import uniform
+from time import sleep, time
+from .util import log, _linode_runtime_dir, _linode_run_id
+
+
+# events which are not going to change anymore
+LINODE_EVENT_DONE = ['finished', 'failed', 'notification']
+
+# events of a run are kept in state file, oldest are dropped beyond this
+LINODE_EVENTS_KEPT = 5000
+
+# first poll of a run looks back this far, to catch events of objects
+# created right before waiting for them
+LINODE_EVENTS_LOOKBACK = 120
+
+# local clock may be ahead of API one
+LINODE_EVENTS_SKEW = 10
+
+
+class LinodeEventFeed(object):
+    '''
+    Follows account events feed with a cursor, on behalf of all processes of
+    the same run using the same access token. Feed state is kept in a file
+    locked on every access; whoever comes first after interval elapsed polls
+    the feed, everyone else reads events it fetched. Cursor is the oldest
+    event which may still change, so that events are seen again until they
+    finish.
+    '''
+
+    def __init__(self, client, token, interval=2.0):
+        owner = sha256(to_bytes(token)).hexdigest()[:16]
+        self.client = client
+        self.interval = interval
+        self.path = join(_linode_runtime_dir(str(_linode_run_id())), 'events-%s.json' % owner)
+
+    def event(self, entity_type, entity_id, action, since):
+        '''
+        Returns latest event of action for the entity created after since,
+        polling feed first if it was not polled within interval.
+        '''
+        with self._state() as state:
+            if state.get('polled', 0) + self.interval <= time():
+                self._poll(state, since)
+
+            found = None
+            for event in state['events'].values():
+                entity = event.get('entity', None) or {}
+                if entity.get('type', None) == entity_type and entity.get('id', None) == entity_id and \
+                        event['action'] == action and event['created'] >= since:
+                    if found is None or event['id'] > found['id']:
+                        found = event
+
+            return found
+
+    def _poll(self, state, since):
+        events = state.setdefault('events', {})
+
+        if 'cursor' in state:
+            filters = {'id': {'+gte': state['cursor']}}
+        else:
+            lookback = datetime.strptime(since, '%Y-%m-%dT%H:%M:%S') - timedelta(seconds=LINODE_EVENTS_LOOKBACK)
+            filters = {'created': {'+gte': lookback.strftime('%Y-%m-%dT%H:%M:%S')}}
+        filters['+order_by'] = 'id'
+        filters['+order'] = 'asc'
+
+        for event in linode_events_list(self.client, filters):
+            events[str(event['id'])] = event
+
+        self.client.session.count('events')
+        state['polled'] = time()
+
+        ids = sorted([int(k) for k in events.keys()])
+        pending = [i for i in ids if events[str(i)]['status'] not in LINODE_EVENT_DONE]
+        if len(pending) > 0:
+            state['cursor'] = pending[0]
+        elif len(ids) > 0:
+            state['cursor'] = ids[-1] + 1
+        else:
+            state['cursor'] = state.get('cursor', 0)
+
+        for i in ids[:max(len(ids) - LINODE_EVENTS_KEPT, 0)]:
+            del events[str(i)]
+
+        log.vvvv('linode event feed: polled, cursor %d, %d pending' %
+                 (state['cursor'], len(pending)))
+
+    @contextmanager
+    def _state(self):
+        import fcntl
+
+        with open(self.path, 'a+') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                content = f.read()
+                try:
+                    state = loads(content) if content else {}
+                except ValueError:
+                    state = {}
+                state.setdefault('events', {})
+
+                yield state
+
+                f.seek(0)
+                f.truncate()
+                f.write(dumps(state))
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def linode_events_list(client, filters, pages=None):
+    '''
+    Returns raw events matching X-Filter dictionary, bypassing caches,
+    reading all pages or only first ones if pages is given.
+    '''
+    from .client import linode_uncached
+    from .paging import linode_pages
+
+    with linode_uncached(client):
+        return list(linode_pages(client, '/account/events', filters=filters, pages=pages))
+
+
+def linode_events_now():
+    '''
+    Current time in format of event timestamps, taken before request which
+    triggers an event, to be given as since to linode_wait_for_event.
+    '''
+    now = datetime.utcnow() - timedelta(seconds=LINODE_EVENTS_SKEW)
+    return now.strftime('%Y-%m-%dT%H:%M:%S')
+
+
+def linode_wait_for_event(client, entity_type, entity_id, action, since, timeout=600):
+    '''
+    Waits until event of action for the entity, created after since, is
+    finished. Raises if it fails or does not finish in time. Returns number
+    of checks and seconds waited, like linode_wait_for_status.
+    '''
+    feed = client.session.events
+    session = client.session
+    started = time()
+    deadline = started + timeout
+    polls = 0
+
+    while True:
+        event = feed.event(entity_type, entity_id, action, since)
+
+        if event is not None and event['status'] == 'finished':
+            break
+
+        if event is not None and event['status'] == 'failed':
+            raise AnsibleError(u'%s event failed for %s %s' % (action, entity_type, entity_id))
+
+        remaining = deadline - time()
+        if remaining <= 0:
+            raise AnsibleError(u'%s event wait timeout for %s %s' % (action, entity_type, entity_id))
+
+        delay = min(uniform(feed.interval / 2, feed.interval), remaining)
+        sleep(delay)
+        session.count('wait', delay)
+        polls = polls + 1
+
+    session.count('polls', polls)
+
+    return {'polls': polls, 'waited': round(time() - started, 3)}
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2020, muradm <mail@muradm.net>
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from .error import linode_raise_client_error
+from .paging import linode_objects
+
+
+# X-Filter header has to stay reasonably small, long value lists are split
+# into several requests
+LINODE_FILTER_CHUNK = 50
+
+
+def linode_filter(**criteria):
+    '''
+    Builds X-Filter dictionary. Every keyword is a field, which should be
+    equal to the given value, or to any of them if list is given. For list
+    fields like tags, equality means membership. Criteria are combined with
+    +and. None values are skipped.
+
+        linode_filter(label=['a', 'b'], region='eu-central', tags='db')
+    '''
+    clauses = []
+
+    for field in sorted(criteria.keys()):
+        value = criteria[field]
+        if value is None:
+            continue
+
+        if isinstance(value, (list, tuple, set)):
+            values = list(value)
+            if len(values) == 1:
+                clauses.append({field: values[0]})
+            else:
+                clauses.append({'+or': [{field: v} for v in values]})
+        else:
+            clauses.append({field: value})
+
+    if len(clauses) == 0:
+        return None
+
+    if len(clauses) == 1:
+        return clauses[0]
+
+    return {'+and': clauses}
+
+
+def linode_find_all(client, cls, filters=None, endpoint=None, model=None, parent_id=None):
+    '''
+    Returns list of objects of cls matching filters built by linode_filter,
+    reading all pages of the result.
+    '''
+    return list(linode_objects(client, cls, filters, endpoint=endpoint, model=model, parent_id=parent_id))
+
+
+def linode_find_first(client, cls, match, filters=None, endpoint=None, model=None, parent_id=None):
+    '''
+    Returns first object of cls matching filters for which match(obj)
+    holds, None if there is none. Pages are read only until it is found.
+    '''
+    for obj in linode_objects(client, cls, filters, endpoint=endpoint, model=model, parent_id=parent_id):
+        if match(obj):
+            return obj
+
+    return None
+
+
+def linode_find_many(client, cls, field, values, **criteria):
+    '''
+    Resolves many objects by field in as few requests as possible, values
+    are pushed down to API as +or lists in chunks. Returns dictionary of
+    found objects by field value, missing values are not in it.
+    '''
+    values = sorted(set(values))
+    found = {}
+
+    for i in range(0, len(values), LINODE_FILTER_CHUNK):
+        chunk = values[i:i + LINODE_FILTER_CHUNK]
+        criteria[field] = chunk
+        for obj in linode_find_all(client, cls, linode_filter(**criteria)):
+            found[getattr(obj, field)] = obj
+
+    return found
+
+
+def linode_find_id(client, cls, id, match, parent_id=None):
+    '''
+    Loads object of cls by id with single request, instead of searching
+    by label. Returns it only if match(obj) holds, so that ids which went
+    stale, of objects deleted or relabeled since, are misses. Returns None
+    on miss, callers fall back to search then.
+    '''
+    from linode_api4 import ApiError
+
+    try:
+        obj = client.load(cls, id, parent_id)
+    except ApiError as e:
+        if e.status == 404:
+            return None
+        linode_raise_client_error(e)
+    except Exception as e:
+        linode_raise_client_error(e)
+
+    return obj if match(obj) else None
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2020, muradm <mail@muradm.net>
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+# host fact actions keep ids in, persisted across runs by fact cache
+LINODE_IDS_FACT = 'linode_ids'
+
+
+def linode_ids(task_vars):
+    '''
+    Ids of objects by kind and key, like label, as previous tasks or runs
+    left them in linode_ids fact, for finders to load objects by id.
+    '''
+    ids = task_vars.get(LINODE_IDS_FACT, None)
+    if ids is None:
+        ids = (task_vars.get('ansible_facts', None) or {}).get(LINODE_IDS_FACT, None)
+
+    if not isinstance(ids, dict):
+        return {}
+
+    return {
+        str(kind): {str(k): v for k, v in keys.items() if isinstance(v, int)}
+        for kind, keys in ids.items() if isinstance(keys, dict)
+    }
+
+
+def linode_id(ids, kind, key, given=None):
+    '''
+    Id given to task explicitly, or remembered for key otherwise.
+    '''
+    if given is not None:
+        return given
+
+    return ids.get(kind, {}).get(str(key), None)
+
+
+def linode_ids_update(ids, kind, key, obj):
+    '''
+    Remembers id of obj, object or its JSON serialized form, for key.
+    Forgets key if obj is None or has no id, like deleted one. Fake
+    objects of check mode are not remembered.
+    '''
+    id = obj.get('id', None) if isinstance(obj, dict) else getattr(obj, 'id', None)
+    keys = ids.setdefault(kind, {})
+
+    if id is None:
+        keys.pop(str(key), None)
+    elif id > 0:
+        keys[str(key)] = id
+
+    return ids
+
+
+def linode_ids_facts(ids):
+    return {LINODE_IDS_FACT: ids}
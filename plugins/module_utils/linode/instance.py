@@ -10,12 +10,28 @@ from copy import deepcopy
 from datetime import datetime
 from .client import linode_wait_for_status
 from .error import linode_raise_client_error
+from .events import linode_events_now, linode_wait_for_event
+from .filter import linode_filter, linode_find_all, linode_find_id, linode_find_many
+from .job import linode_job
+from .retry import linode_retry_create
 from .util import _filter_dict_keys, _update_if_needed
 
 
-def instance_find(client, label):
+def instance_find(client, label, id=None):
     from linode_api4 import Instance
 
+    snapshot = _instance_snapshot(client)
+    if snapshot is not None:
+        if label in snapshot['labels']:
+            return _instance_of(client, snapshot, snapshot['labels'][label])
+        if not snapshot['scoped']:
+            return None
+
+    if id is not None:
+        instance = linode_find_id(client, Instance, id, lambda i: i.label == label)
+        if instance is not None:
+            return instance
+
     try:
         return client.linode.instances(Instance.label == label)[0]
     except IndexError:
@@ -24,19 +40,102 @@ def instance_find(client, label):
         linode_raise_client_error(e)
 
 
+def instance_find_many(client, labels=None, tags=None, region=None, type=None):
+    from linode_api4 import Instance
+
+    criteria = {'tags': tags, 'region': region, 'type': type}
+
+    snapshot = _instance_snapshot(client)
+    if snapshot is not None and labels is None and not snapshot['scoped']:
+        return {
+            label: _instance_of(client, snapshot, i) for label, i in snapshot['labels'].items()
+            if _instance_matches(snapshot['ids'][i], criteria)
+        }
+
+    found = {}
+    if snapshot is not None and labels is not None:
+        for label in labels:
+            i = snapshot['labels'].get(label, None)
+            if i is not None and _instance_matches(snapshot['ids'][i], criteria):
+                found[label] = _instance_of(client, snapshot, i)
+        if not snapshot['scoped']:
+            return found
+        labels = [label for label in labels if label not in found]
+
+    if labels is None:
+        instances = linode_find_all(client, Instance, linode_filter(**criteria))
+        return {i.label: i for i in instances}
+
+    if len(labels) > 0:
+        found.update(linode_find_many(client, Instance, 'label', labels, **criteria))
+
+    return found
+
+
+def _instance_snapshot(client):
+    '''
+    Instances of play snapshot indexed by id and label, None if snapshot is
+    not enabled or reads are to bypass caches. Snapshot is scoped when it
+    is loaded for some tags or region only, instances missing in it may
+    still exist then.
+    '''
+    snapshots = client.session.snapshots
+    if snapshots is None or client.session.is_uncached():
+        return None
+
+    return snapshots.get('linode/instances', lambda: _instance_snapshot_load(client, snapshots.scope))
+
+
+def _instance_snapshot_load(client, scope):
+    from linode_api4 import Instance
+
+    instances = linode_find_all(client, Instance, linode_filter(**scope))
+
+    return {
+        'scoped': any([v is not None for v in scope.values()]),
+        'ids': {str(i.id): i._raw_json for i in instances},
+        'labels': {i.label: str(i.id) for i in instances},
+    }
+
+
+def _instance_of(client, snapshot, i):
+    from linode_api4 import Instance
+
+    return Instance(client, int(i), snapshot['ids'][i])
+
+
+def _instance_matches(instance, criteria):
+    for field, value in criteria.items():
+        if value is None:
+            continue
+        values = value if isinstance(value, (list, tuple, set)) else [value]
+        current = instance.get(field, None)
+        if isinstance(current, list):
+            if not any([v in current for v in values]):
+                return False
+        elif current not in values:
+            return False
+    return True
+
+
 def instance_create(client, args, check_mode=False):
-    non_optional = ['region', 'type', 'image', 'label', 'authorized_keys']
+    non_optional = ['region', 'type', 'image', 'label', 'authorized_keys', 'wait']
     remaining = _filter_dict_keys(args, non_optional)
 
     try:
         if not check_mode:
-            response = client.linode.instance_create(
-                ltype=args['type'],
-                region=args['region'],
-                image=args['image'],
-                authorized_keys=args['authorized_keys'],
-                label=args['label'],
-                **remaining
+            since = linode_events_now()
+            response = linode_retry_create(
+                client,
+                lambda: client.linode.instance_create(
+                    ltype=args['type'],
+                    region=args['region'],
+                    image=args['image'],
+                    authorized_keys=args['authorized_keys'],
+                    label=args['label'],
+                    **remaining
+                ),
+                lambda: instance_find(client, args['label']),
             )
 
             if isinstance(response, tuple):
@@ -51,10 +150,17 @@ def instance_create(client, args, check_mode=False):
                 instance.ips.ipv4.public[0].rdns = '' if not args['ipv4_public_rdns'] else args['ipv4_public_rdns']
                 instance.ips.ipv4.public[0].save()
 
-            linode_wait_for_status(instance, "running")
+            if not args.get('wait', True):
+                result['job'] = linode_job('instance', instance)
+            elif client.session.events is not None:
+                linode_wait_for_event(client, 'linode', instance.id, 'linode_boot', since)
+            else:
+                linode_wait_for_status(instance, "running")
 
         else:
             result = _fake_instance(args)
+            if not args.get('wait', True):
+                result['job'] = linode_job('instance', result)
 
         return result
 
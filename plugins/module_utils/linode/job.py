@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2020, muradm <mail@muradm.net>
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from ansible.errors import AnsibleError
+from copy import deepcopy
+from .client import linode_uncached, linode_wait_for_all
+from .error import linode_raise_client_error
+from .filter import linode_find_many
+
+
+# status objects of a kind are ready in
+LINODE_JOB_STATUS = {
+    'instance': 'running',
+    'volume': 'active',
+}
+
+
+def linode_job(kind, obj, **extra):
+    '''
+    Handle of object created without waiting for it, to be given to
+    linode_join later. Handle is plain dictionary, so that it can be
+    registered and passed between tasks.
+    '''
+    job = {
+        'kind': kind,
+        'id': obj['id'] if isinstance(obj, dict) else obj.id,
+        'label': obj['label'] if isinstance(obj, dict) else obj.label,
+        'status': LINODE_JOB_STATUS[kind],
+    }
+    job.update(extra)
+
+    return job
+
+
+def _job_classes():
+    from linode_api4 import Instance, Volume
+
+    return {'instance': Instance, 'volume': Volume}
+
+
+def linode_join(client, jobs, timeout=600, check_mode=False):
+    '''
+    Waits for objects of job handles to get ready with linode_wait_for_all,
+    loading them first with one request per kind. Volumes to be attached
+    are attached once they are active. Returns objects which are ready as
+    JSON by kind, handles which timed out and time to ready statistics.
+    '''
+    classes = _job_classes()
+    jobs = [j for j in jobs if j is not None]
+
+    for job in jobs:
+        if job.get('kind', None) not in classes:
+            raise AnsibleError(u'unknown job kind in %s' % str(job))
+
+    # objects faked in check mode do not exist
+    if check_mode:
+        jobs = [j for j in jobs if j['id'] >= 0]
+
+    objects = []
+    missing = []
+
+    try:
+        with linode_uncached(client):
+            for kind, cls in classes.items():
+                ids = [j['id'] for j in jobs if j['kind'] == kind]
+                if len(ids) == 0:
+                    continue
+
+                found = linode_find_many(client, cls, 'id', ids)
+                for job in jobs:
+                    if job['kind'] != kind:
+                        continue
+                    if job['id'] in found:
+                        objects.append((job, found[job['id']]))
+                    else:
+                        missing.append(job)
+
+        if len(missing) > 0:
+            raise AnsibleError(u'objects of jobs not found: %s' %
+                               ', '.join(['%s %s' % (j['kind'], j['label']) for j in missing]))
+
+        status = {classes[kind]: st for kind, st in LINODE_JOB_STATUS.items()}
+        waited = linode_wait_for_all([obj for job, obj in objects], status, timeout=timeout)
+
+        # volume can be attached only once it is active
+        attaching = [(job, obj) for job, obj in objects
+                     if job.get('attach', None) is not None and obj in waited['ready'] and obj.linode_id is None]
+        if len(attaching) > 0:
+            for job, obj in attaching:
+                obj.attach(job['attach'])
+
+            attached = linode_wait_for_all([obj for job, obj in attaching], status, timeout=timeout)
+            waited['ready'] = [o for o in waited['ready'] if o not in attached['timed_out']]
+            waited['timed_out'] = waited['timed_out'] + attached['timed_out']
+            waited['polls'] = waited['polls'] + attached['polls']
+
+    except Exception as e:
+        linode_raise_client_error(e)
+
+    ready = {kind: [] for kind in classes.keys()}
+    for job, obj in objects:
+        if obj in waited['ready']:
+            ready[job['kind']].append(deepcopy(obj._raw_json))
+
+    timed_out = [job for job, obj in objects if obj in waited['timed_out']]
+
+    return {
+        'ready': ready,
+        'timed_out': timed_out,
+        'polls': waited['polls'],
+        'time_to_ready': waited['time_to_ready'],
+    }
+
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2020, muradm <mail@muradm.net>
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from .error import linode_raise_client_error
+
+
+# page sizes API accepts, it uses 100 if none is given
+LINODE_PAGE_SIZE_MIN = 25
+LINODE_PAGE_SIZE_MAX = 500
+
+
+def linode_page_size(value):
+    size = int(value)
+    if size < LINODE_PAGE_SIZE_MIN or size > LINODE_PAGE_SIZE_MAX:
+        raise ValueError('page size should be between %d and %d' % (LINODE_PAGE_SIZE_MIN, LINODE_PAGE_SIZE_MAX))
+
+    return size
+
+
+def linode_pages(client, endpoint, model=None, filters=None, pages=None):
+    '''
+    Yields objects of paginated list at endpoint in JSON serialized form,
+    requesting next page only once previous one is consumed, so that
+    callers which stop early do not read remaining pages, and only one
+    page is held at a time. Reads all pages or only first ones if pages
+    is given. Page size is linode_page_size setting of client.
+    '''
+    from linode_api4 import UnexpectedResponseError
+
+    page_size = client.session.page_size
+    query = '&page_size=%d' % page_size if page_size is not None else ''
+    page, last = 1, 1
+
+    while page <= last and (pages is None or page <= pages):
+        try:
+            result = client.get('%s?page=%d%s' % (endpoint, page, query), model=model, filters=filters)
+            if 'data' not in result:
+                raise UnexpectedResponseError('Problem with response!', json=result)
+        except Exception as e:
+            linode_raise_client_error(e)
+
+        last = result.get('pages', 1)
+        page = page + 1
+
+        for obj in result['data']:
+            yield obj
+
+
+def linode_objects(client, cls, filters=None, endpoint=None, model=None, parent_id=None, pages=None):
+    '''
+    Yields objects of cls of paginated list lazily, like linode_pages,
+    built with their JSON so that they are not loaded again on access.
+    '''
+    endpoint = endpoint if endpoint is not None else cls.api_list()
+
+    for obj in linode_pages(client, endpoint, model=model, filters=filters, pages=pages):
+        id = obj['id'] if 'id' in obj else obj[cls.id_attribute]
+        if parent_id is not None:
+            yield cls(client, id, parent_id, json=obj)
+        else:
+            yield cls(client, id, json=obj)
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2020, muradm <mail@muradm.net>
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from ansible.errors import AnsibleError
+from ansible.module_utils._text import to_bytes
+from contextlib import contextmanager
+from hashlib import sha256
+from json import dumps, loads
+from os.path import join
+from time import sleep, time
+from .util import log, _linode_runtime_dir
+
+
+LINODE_RATE_LIMIT_CLASSES = {
+    'GET': 'get',
+    'POST': 'write',
+    'PUT': 'write',
+    'DELETE': 'delete',
+}
+
+LINODE_RATE_LIMIT_DEFAULT = 'get=800/60,write=800/60,delete=800/60'
+
+
+def linode_rate_limits(value):
+    '''
+    Parses rate limits in form of 'get=800/60,write=100/60,delete=100/60',
+    i.e. number of requests per number of seconds for every endpoint class.
+    '''
+    limits = {}
+
+    for part in [p.strip() for p in str(value).split(',') if p.strip()]:
+        try:
+            cls, rate = part.split('=')
+            requests, period = rate.split('/')
+            limits[cls.strip()] = (int(requests), float(period))
+        except ValueError:
+            raise AnsibleError(u'invalid linode rate limit: %s' % part)
+
+        if cls.strip() not in LINODE_RATE_LIMIT_CLASSES.values():
+            raise AnsibleError(u'unknown linode rate limit class: %s' % cls)
+
+    return limits
+
+
+class LinodeRateLimiter(object):
+    '''
+    Token bucket per endpoint class, kept in a file locked on every access,
+    so that all processes using same access token draw from the same buckets.
+    Buckets are corrected by X-RateLimit-Remaining and X-RateLimit-Reset
+    headers of every response, and blocked until reset when API responds
+    with 429.
+    '''
+
+    def __init__(self, token, limits):
+        owner = sha256(to_bytes(token)).hexdigest()[:16]
+        self.path = join(_linode_runtime_dir(), 'ratelimit-%s.json' % owner)
+        self.limits = limits
+
+    def acquire(self, method):
+        cls = LINODE_RATE_LIMIT_CLASSES.get(method, 'get')
+        queued = 0.0
+
+        while True:
+            with self._state() as state:
+                bucket = self._bucket(state, cls)
+                now = time()
+
+                if bucket['blocked_until'] > now:
+                    delay = bucket['blocked_until'] - now
+                elif bucket['tokens'] >= 1:
+                    bucket['tokens'] = bucket['tokens'] - 1
+                    return queued
+                else:
+                    delay = (1 - bucket['tokens']) * \
+                        bucket['period'] / bucket['capacity']
+
+            log.vvvv('linode rate limit: %s request queued for %.2fs' %
+                     (cls, delay))
+            sleep(delay)
+            queued = queued + delay
+
+    def update(self, method, response):
+        cls = LINODE_RATE_LIMIT_CLASSES.get(method, 'get')
+        headers = response.headers
+
+        with self._state() as state:
+            bucket = self._bucket(state, cls)
+
+            remaining = _header_number(headers, 'X-RateLimit-Remaining')
+            if remaining is not None:
+                bucket['tokens'] = min(bucket['tokens'], remaining)
+
+            reset = _header_number(headers, 'X-RateLimit-Reset')
+
+            if response.status_code == 429:
+                bucket['tokens'] = 0
+                retry_after = _header_number(headers, 'Retry-After')
+                if retry_after is not None:
+                    bucket['blocked_until'] = time() + retry_after
+                elif reset is not None:
+                    bucket['blocked_until'] = reset
+                else:
+                    bucket['blocked_until'] = time() + \
+                        bucket['period'] / bucket['capacity']
+
+            elif remaining is not None and remaining < 1 and reset is not None:
+                bucket['blocked_until'] = reset
+
+    def _bucket(self, state, cls):
+        capacity, period = self.limits.get(cls, (800, 60.0))
+        bucket = state.setdefault(cls, {
+            'capacity': capacity,
+            'period': period,
+            'tokens': capacity,
+            'updated': time(),
+            'blocked_until': 0,
+        })
+        bucket['capacity'] = capacity
+        bucket['period'] = period
+
+        now = time()
+        elapsed = max(now - bucket['updated'], 0)
+        bucket['tokens'] = min(
+            bucket['capacity'],
+            bucket['tokens'] + elapsed * bucket['capacity'] / bucket['period'])
+        bucket['updated'] = now
+
+        return bucket
+
+    @contextmanager
+    def _state(self):
+        import fcntl
+
+        with open(self.path, 'a+') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                content = f.read()
+                try:
+                    state = loads(content) if content else {}
+                except ValueError:
+                    state = {}
+
+                yield state
+
+                f.seek(0)
+                f.truncate()
+                f.write(dumps(state))
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _header_number(headers, name):
+    value = headers.get(name, None)
+    if value is None:
+        return None
+
+    try:
+        return float(value)
+    except ValueError:
+        return None
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2020, muradm <mail@muradm.net>
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from random import uniform
+from time import sleep
+from .util import log
+
+
+LINODE_RETRY_STATUSES = [429, 500, 502, 503, 504]
+
+# requests which could be sent again as is, repeating them does not change
+# the outcome; POST creates are retried by linode_retry_create only
+LINODE_IDEMPOTENT_METHODS = ['GET', 'PUT', 'DELETE']
+
+
+class LinodeRetryPolicy(object):
+    def __init__(self, attempts=3, backoff=0.5, backoff_max=30.0):
+        self.attempts = attempts
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+
+    def delay(self, attempt):
+        # full jitter, so that many workers failing at once do not come
+        # back at once
+        return uniform(0, min(self.backoff_max, self.backoff * (2 ** attempt)))
+
+    def should_retry(self, method, attempt, response=None, error=None):
+        if attempt >= self.attempts:
+            return False
+
+        if error is not None:
+            from requests import ConnectTimeout, ConnectionError, Timeout
+
+            # connection was not established, so request was not sent
+            if isinstance(error, ConnectTimeout):
+                return True
+
+            return method in LINODE_IDEMPOTENT_METHODS and \
+                isinstance(error, (ConnectionError, Timeout))
+
+        return method in LINODE_IDEMPOTENT_METHODS and \
+            response.status_code in LINODE_RETRY_STATUSES
+
+    def succeeded(self, method, attempt, response):
+        '''
+        Whether request failed only because its earlier attempt, which was
+        not known to be processed, succeeded: object deleted by it is not
+        found by next one.
+        '''
+        return method == 'DELETE' and attempt > 0 and response.status_code == 404
+
+
+def linode_retry_create(client, create, lookup):
+    '''
+    Calls create. If it fails with transient error, it is not known whether
+    object was created or not, so before trying again lookup is called. If
+    it finds the object, it is returned as if create succeeded.
+    '''
+    session = client.session
+    policy = session.retry
+    attempt = 0
+
+    while True:
+        try:
+            return create()
+        except Exception as e:
+            if policy is None or attempt >= policy.attempts or not _is_transient(e):
+                raise
+
+            log.vvv('linode_retry_create: attempt %d failed: %s' %
+                    (attempt + 1, str(e)))
+
+        sleep(policy.delay(attempt))
+        attempt = attempt + 1
+        session.count('retries')
+
+        found = lookup()
+        if found is not None:
+            log.vvv('linode_retry_create: found %s created by failed attempt' %
+                    str(found))
+            return found
+
+
+def _is_transient(e):
+    from linode_api4 import ApiError
+    from requests import ConnectionError, Timeout
+
+    if isinstance(e, ApiError):
+        return e.status in LINODE_RETRY_STATUSES
+
+    return isinstance(e, (ConnectionError, Timeout))
@@ -0,0 +1,373 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2020, muradm <mail@muradm.net>
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from ansible.module_utils._text import to_bytes
+from contextlib import contextmanager
+from json import loads
+from os import getpid
+from re import compile as re_compile
+from threading import Event, Lock, local
+from time import sleep, time
+from .util import log
+
+
+_ENDPOINT_ID = re_compile(r'/[0-9]+(?=/|$)')
+_ENDPOINT_VERSION = re_compile(r'^/v[0-9]+(beta)?(?=/)')
+
+
+LINODE_RATE_LIMIT_ATTEMPTS = 5
+
+
+class LinodeSession(object):
+    '''
+    Stands in place of requests session of LinodeClient. LinodeClient passes
+    session.get/post/put/delete to its _api_call, so every API request made by
+    linode_api4 objects ends up in request() below. Connections are kept alive
+    in single mounted adapter, so that subsequent requests reuse them.
+    '''
+
+    def __init__(self, session, pool_maxsize=10, connect_timeout=10, read_timeout=60, broker=None, rate_limiter=None, retry=None, cache=None, cassette=None):
+        from requests.adapters import HTTPAdapter
+
+        self.pid = getpid()
+        self.session = session
+        self.broker = broker
+        self.rate_limiter = rate_limiter
+        self.retry = retry
+        self.cache = cache
+        self.cassette = cassette
+        self.events = None
+        self.snapshots = None
+        self.lookups = None
+        self.page_size = None
+        self.settings = None
+        self.local = local()
+        self.adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount('https://', self.adapter)
+        self.session.mount('http://', self.adapter)
+        self.timeout = (connect_timeout, read_timeout)
+        self.lock = Lock()
+        self.flights = {}
+        self.stats = {
+            'calls': 0, 'bytes': 0, 'latency': 0.0, 'wait': 0.0,
+            'requests': 0, 'retries': 0, 'coalesced': 0,
+        }
+        self.endpoints = {}
+        self.peaks = {}
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request('PUT', url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request('DELETE', url, **kwargs)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+
+        started = time()
+        response = None
+        try:
+            response = self.coalesce(method, url, **kwargs)[0]
+        finally:
+            self.measure(method, url, response, time() - started)
+
+            # snapshot may have been loaded while write was in flight;
+            # without snapshot, results remembered by lookups are dropped
+            snapshots = self.snapshots if self.snapshots is not None else self.lookups
+            if method != 'GET' and snapshots is not None:
+                amend = getattr(self.local, 'amend', None)
+                written = None
+                if amend is not None and response is not None and 200 <= response.status_code < 300:
+                    written = response.json()
+                snapshots.written(_path(url), amend, written)
+
+        return response
+
+    def measure(self, method, url, response, elapsed):
+        endpoint = '%s %s' % (method, _endpoint(url))
+        size = len(response.content) if response is not None else 0
+
+        with self.lock:
+            self.stats['calls'] = self.stats['calls'] + 1
+            self.stats['bytes'] = self.stats['bytes'] + size
+            self.stats['latency'] = self.stats['latency'] + elapsed
+
+            stats = self.endpoints.setdefault(
+                endpoint, {'calls': 0, 'bytes': 0, 'latency': 0.0})
+
+            # latencies greater than any of calls after them, by call number,
+            # so that max since any earlier snapshot is first one after it
+            peaks = self.peaks.setdefault(endpoint, [])
+            while len(peaks) > 0 and peaks[-1][1] <= elapsed:
+                peaks.pop()
+            peaks.append((stats['calls'], elapsed))
+
+            stats['calls'] = stats['calls'] + 1
+            stats['bytes'] = stats['bytes'] + size
+            stats['latency'] = stats['latency'] + elapsed
+
+    def coalesce(self, method, url, **kwargs):
+        '''
+        Identical GET requests made concurrently are sent only once, callers
+        which came while it is in flight wait for and share its response.
+        Returns response and whether it was shared.
+        '''
+        if method != 'GET':
+            return (self.dispatch(method, url, **kwargs), False)
+
+        headers = kwargs.get('headers', None) or {}
+        key = (url, headers.get('X-Filter', None),
+               headers.get('Authorization', None))
+
+        with self.lock:
+            flight = self.flights.get(key, None)
+            leader = flight is None
+            if leader:
+                flight = _LinodeFlight()
+                self.flights[key] = flight
+
+        if not leader:
+            flight.done.wait()
+            self.count('coalesced')
+            if flight.error is not None:
+                raise flight.error
+            return (flight.response, True)
+
+        try:
+            flight.response = self.dispatch(method, url, **kwargs)
+            flight.response.content  # read body once, before it is shared
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.flights[key]
+            flight.done.set()
+
+        return (flight.response, False)
+
+    @contextmanager
+    def uncached(self):
+        '''
+        Within this context reads of current thread bypass caches, for
+        polling objects until their state changes.
+        '''
+        previous = self.is_uncached()
+        self.local.uncached = True
+        try:
+            yield
+        finally:
+            self.local.uncached = previous
+
+    @contextmanager
+    def amending(self, amend):
+        '''
+        Within this context writes of current thread bring snapshot entries
+        up to date with amend, functions by entry key, instead of dropping
+        them. See LinodeSnapshot.written.
+        '''
+        previous = getattr(self.local, 'amend', None)
+        self.local.amend = amend
+        try:
+            yield
+        finally:
+            self.local.amend = previous
+
+    def is_uncached(self):
+        return getattr(self.local, 'uncached', False)
+
+    def dispatch(self, method, url, **kwargs):
+        if self.cache is None:
+            return self.forward(method, url, **kwargs)
+
+        if method == 'GET':
+            return self.cached(url, **kwargs)
+
+        # reads made while write is in flight could be stale as well
+        self.cache.invalidate()
+        try:
+            return self.forward(method, url, **kwargs)
+        finally:
+            self.cache.invalidate()
+
+    def cached(self, url, **kwargs):
+        headers = kwargs.get('headers', None) or {}
+
+        entry = None
+        if not self.is_uncached():
+            entry = self.cache.get(url, headers)
+
+        if entry is not None and entry['fresh']:
+            self.count('cached')
+            return LinodeResponse(entry['status'], entry['headers'], to_bytes(entry['body']), shared='cached')
+
+        if entry is not None:
+            kwargs['headers'] = self.cache.conditional_headers(entry, headers)
+
+        response = self.forward('GET', url, **kwargs)
+
+        if entry is not None and response.status_code == 304:
+            self.cache.refresh(url, headers, entry)
+            self.count('revalidated')
+            return LinodeResponse(entry['status'], entry['headers'], to_bytes(entry['body']), shared='cached')
+
+        # only lists are cached, objects are read by id mostly to see
+        # their current state
+        if response.status_code == 200 and 'pages' in response.json():
+            self.cache.store(url, headers, response)
+
+        return response
+
+    def forward(self, method, url, **kwargs):
+        if self.broker is not None:
+            response = self.broker.request(
+                method, url, uncached=self.is_uncached(), **kwargs)
+            if response is not None:
+                self.count('brokered')
+                self.count('retries', response.linode_retries)
+                if response.linode_shared is not None:
+                    self.count(response.linode_shared)
+                return response
+
+        return self.send(method, url, **kwargs)
+
+    def send(self, method, url, **kwargs):
+        attempt = 0
+
+        while True:
+            try:
+                response = self._send(method, url, **kwargs)
+            except Exception as e:
+                if self.retry is None or not self.retry.should_retry(method, attempt, error=e):
+                    raise
+            else:
+                if self.retry is None or not self.retry.should_retry(method, attempt, response=response):
+                    if self.retry is not None and self.retry.succeeded(method, attempt, response):
+                        log.vvv('linode session: %s %s done by earlier attempt' % (method, _path(url)))
+                        response = LinodeResponse(200, response.headers, b'{}')
+                    response.linode_retries = attempt
+                    return response
+
+            sleep(self.retry.delay(attempt))
+            attempt = attempt + 1
+            self.count('retries')
+
+    def _send(self, method, url, **kwargs):
+        if self.rate_limiter is None:
+            response = self._request(method, url, **kwargs)
+            self.count('requests')
+            return response
+
+        # requests rejected with 429 were not processed by API, so they are
+        # safe to be sent again once rate limiter lets them through
+        for _ in range(LINODE_RATE_LIMIT_ATTEMPTS):
+            self.count('queued', self.rate_limiter.acquire(method))
+            response = self._request(method, url, **kwargs)
+            self.count('requests')
+            self.rate_limiter.update(method, response)
+            if response.status_code != 429:
+                break
+            self.count('throttled')
+
+        return response
+
+    def _request(self, method, url, **kwargs):
+        if self.cassette is None:
+            return self.session.request(method, url, **kwargs)
+
+        headers = kwargs.get('headers', None)
+        data = kwargs.get('data', None)
+
+        if self.cassette.replaying:
+            self.count('replayed')
+            return self.cassette.replay(method, url, headers, data)
+
+        started = time()
+        response = self.session.request(method, url, **kwargs)
+        self.cassette.record(method, url, headers, data, response, time() - started)
+
+        return response
+
+    def count(self, stat, value=1):
+        with self.lock:
+            self.stats[stat] = self.stats.get(stat, 0) + value
+
+    def connections(self):
+        pools = self.adapter.poolmanager.pools
+        return sum([pools[k].num_connections for k in pools.keys()])
+
+    def peak(self, endpoint, since=0):
+        '''
+        Max latency of endpoint calls made after since calls of it.
+        '''
+        with self.lock:
+            for calls, elapsed in self.peaks.get(endpoint, []):
+                if calls >= since:
+                    return elapsed
+
+        return 0.0
+
+    def snapshot(self):
+        with self.lock:
+            stats = dict(self.stats)
+            stats['endpoints'] = {k: dict(v) for k, v in self.endpoints.items()}
+
+        stats['connections'] = self.connections()
+        stats['reused'] = max(stats['requests'] - stats.get('replayed', 0) - stats['connections'], 0)
+
+        return stats
+
+    def close(self):
+        self.session.close()
+
+
+def _endpoint(url):
+    return _ENDPOINT_ID.sub('/{id}', _path(url))
+
+
+def _path(url):
+    from ansible.module_utils.six.moves.urllib.parse import urlparse
+
+    return _ENDPOINT_VERSION.sub('', urlparse(url).path)
+
+
+class _LinodeFlight(object):
+    def __init__(self):
+        self.done = Event()
+        self.response = None
+        self.error = None
+
+
+class LinodeResponse(object):
+    '''
+    Minimal response object, for responses which were not received by this
+    process from the API directly. Provides only what LinodeClient uses.
+    '''
+
+    def __init__(self, status_code, headers, content, retries=0, shared=None):
+        from requests.structures import CaseInsensitiveDict
+
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = content
+        self.linode_retries = retries
+        self.linode_shared = shared
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8')
+
+    def json(self):
+        return loads(self.text)
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2020, muradm <mail@muradm.net>
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from ansible.module_utils._text import to_bytes
+from contextlib import contextmanager
+from hashlib import sha256
+from json import dumps, loads
+from os.path import join
+from time import time
+from .util import log, _linode_runtime_dir, _linode_run_id
+
+
+class LinodeSnapshot(object):
+    '''
+    Objects loaded once per run and shared by all processes of the run using
+    the same access token, so that lookups of every host are answered from
+    single list request. Entries are keyed by API path they were loaded
+    from, like linode/instances or domains/123, optionally followed by
+    suffix after #, like linode/instances#lookup. Entry is used until TTL
+    is over, or until this collection writes to its path or any path
+    below, in any process, or is amended by writer which knows how the
+    write changed it. State is kept in a file locked on every access.
+    Entry is loaded by one process at a time, others wait for it, and is
+    not stored if it was written to while loading.
+    '''
+
+    def __init__(self, token, ttl=300, scope=None):
+        owner = sha256(to_bytes(token)).hexdigest()[:16]
+        self.ttl = ttl
+        self.scope = scope or {}
+        self.path = join(_linode_runtime_dir(str(_linode_run_id())), 'snapshot-%s.json' % owner)
+
+    def get(self, key, load):
+        '''
+        Returns data of entry, loading it with load() if it is missing or
+        expired.
+        '''
+        entry = self._entry(key)
+        if entry is not None:
+            return entry['data']
+
+        # processes which miss at the same time wait for the first one
+        # to load, instead of loading the same
+        with self._locked(self._load_lock(key)):
+            entry = self._entry(key)
+            if entry is not None:
+                return entry['data']
+
+            with self._state(update=False) as state:
+                generation = state['generation']
+
+            log.vvvv('linode snapshot: loading %s' % key)
+            data = load()
+
+            with self._state() as state:
+                if not _written_since(state, key, generation):
+                    state['entries'][key] = {'loaded': time(), 'data': data}
+
+        return data
+
+    def get_many(self, key, names, load):
+        '''
+        Returns data of names within entry, as dictionary by name. Names
+        missing in entry are loaded with load(names), which returns data
+        by name, and are added to it. Names not found by load are not
+        remembered, so that they are looked up again later.
+        '''
+        entry = self._entry(key)
+        data = dict(entry['data']) if entry is not None else {}
+        if all([n in data for n in names]):
+            return data
+
+        with self._locked(self._load_lock(key)):
+            entry = self._entry(key)
+            data = dict(entry['data']) if entry is not None else {}
+            missing = [n for n in names if n not in data]
+            if len(missing) == 0:
+                return data
+
+            with self._state(update=False) as state:
+                generation = state['generation']
+
+            log.vvvv('linode snapshot: loading %d names of %s' % (len(missing), key))
+            loaded = load(missing)
+            data.update(loaded)
+
+            with self._state() as state:
+                if not _written_since(state, key, generation):
+                    entry = state['entries'].get(key, None)
+                    if entry is None or entry['loaded'] + self.ttl <= time():
+                        entry = {'loaded': time(), 'data': {}}
+                    entry['data'].update(loaded)
+                    state['entries'][key] = entry
+
+        return data
+
+    def _load_lock(self, key):
+        return '%s.%s.load' % (self.path, sha256(to_bytes(key)).hexdigest()[:16])
+
+    def _entry(self, key):
+        with self._state(update=False) as state:
+            entry = state['entries'].get(key, None)
+            if entry is not None and entry['loaded'] + self.ttl > time():
+                return entry
+        return None
+
+    def written(self, path, amend=None, response=None):
+        '''
+        Drops entries of path, of paths above it and below it. Entries
+        amend has function for, by key, are brought up to date instead
+        with amend[key](data, path, response), if write succeeded and its
+        JSON response is given, so that writer need not load them again.
+        '''
+        path = path.strip('/')
+        amend = amend if response is not None else None
+
+        with self._state() as state:
+            state['generation'] = state['generation'] + 1
+            state['written'][path] = state['generation']
+
+            for key in list(state['entries'].keys()):
+                if not _related(key, path):
+                    continue
+                if amend is not None and key in amend:
+                    log.vvvv('linode snapshot: amending %s on write to %s' % (key, path))
+                    entry = state['entries'][key]
+                    entry['data'] = amend[key](entry['data'], path, response)
+                else:
+                    log.vvvv('linode snapshot: dropping %s on write to %s' % (key, path))
+                    del state['entries'][key]
+
+    @contextmanager
+    def _locked(self, path):
+        import fcntl
+
+        with open(path, 'a+') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield f
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    @contextmanager
+    def _state(self, update=True):
+        with self._locked(self.path) as f:
+            f.seek(0)
+            content = f.read()
+            try:
+                state = loads(content) if content else {}
+            except ValueError:
+                state = {}
+            state.setdefault('entries', {})
+            state.setdefault('written', {})
+            state.setdefault('generation', 0)
+
+            yield state
+
+            if update:
+                f.seek(0)
+                f.truncate()
+                f.write(dumps(state))
+                f.flush()
+
+
+def _related(key, path):
+    # entries of the same path are told apart by suffix after #
+    key = key.split('#', 1)[0]
+    return key == path or key.startswith(path + '/') or path.startswith(key + '/')
+
+
+def _written_since(state, key, generation):
+    for path, written in state['written'].items():
+        if written > generation and _related(key, path):
+            return True
+    return False
+
@@ -45,3 +45,48 @@ def _update_if_needed(target, updated, args, field, check_mode, to_be_sorted=Fal
 class objview(object):
     def __init__(self, d):
         self.__dict__ = d
+
+
+def _linode_runtime_dir(*parts):
+    '''
+    Directory for state shared by processes of the user, created with every
+    part of it private to the user. Path is predictable, so that existing
+    one is accepted only if it is directory of the user no one else could
+    write to; otherwise another user could put there broker socket, which
+    would be sent the access token, or state files. Such one is made
+    private, older versions created it readable by others.
+    '''
+    from ansible.errors import AnsibleError
+    from os import chmod, getuid, lstat, mkdir
+    from os.path import join
+    from stat import S_IMODE, S_ISDIR
+    from tempfile import gettempdir
+
+    path = gettempdir()
+    for part in ('ansible-linode-%d' % getuid(),) + parts:
+        path = join(path, part)
+        try:
+            mkdir(path, 0o700)
+        except FileExistsError:
+            pass
+
+        st = lstat(path)
+        if not S_ISDIR(st.st_mode) or st.st_uid != getuid() or S_IMODE(st.st_mode) & 0o022:
+            raise AnsibleError(u'linode runtime directory %s is not a private directory of current user' % path)
+
+        if S_IMODE(st.st_mode) != 0o700:
+            chmod(path, 0o700)
+
+    return path
+
+
+def _linode_run_id():
+    from multiprocessing import current_process
+    from os import getpid, getppid
+
+    # action plugins are run in worker processes forked by controller, while
+    # lookup and inventory plugins are run in controller itself
+    if current_process().name == 'MainProcess':
+        return getpid()
+
+    return getppid()
@@ -152,20 +152,28 @@ LINODE_TAGS_TYPE = {'type': 'list', 'schema': {
     'type': 'string'}, 'required': False, 'default': []}
 
 
-def linode_schema():
-    try:
-        from cerberus.schema import SchemaRegistry
-    except ImportError:
-        raise AnsibleError('could not import cerberus module')
+_definitions = {}
+
+
+def _definition(name):
+    def register(f):
+        _definitions[name] = f
+        return f
+    return register
 
-    schema = SchemaRegistry()
 
-    schema.add('instance_key', {
+@_definition('instance_key')
+def _instance_key(schema):
+    return {
         'label': {'type': 'string', 'required': True},
+        'id': {'type': 'integer', 'coerce': int, 'required': False},
         'state': {'check_with': _check_state, 'required': False, 'default': 'present'},
-    })
+    }
 
-    schema.add('instance_create', {
+
+@_definition('instance_create')
+def _instance_create(schema):
+    return {
         'label': {'type': 'string', 'required': True},
         'region': {'type': 'string', 'required': True},
         'type': {'type': 'string', 'required': True},
@@ -176,9 +184,13 @@ def linode_schema():
         'authorized_keys': {'type': 'list', 'schema': {'type': 'string'}, 'required': False, 'default': []},
         'ipv4_public_rdns': {'type': 'string', 'required': False},
         'private_ip': {'type': 'boolean', 'required': False, 'default': False},
-    })
+        'wait': {'type': 'boolean', 'required': False, 'default': True},
+    }
+
 
-    schema.add('instance_update', {
+@_definition('instance_update')
+def _instance_update(schema):
+    return {
         'label': {'type': 'string', 'required': True},
         'type': {'type': 'string', 'required': False},
         'image': {'type': 'string', 'required': False},
@@ -186,43 +198,68 @@ def linode_schema():
         'tags': LINODE_TAGS_TYPE,
         'ipv4_public_rdns': {'type': 'string', 'required': False},
         'private_ip': {'type': 'boolean', 'required': False},
-    })
+    }
+
 
-    schema.add('volume_key', {
+@_definition('volume_key')
+def _volume_key(schema):
+    return {
         'label': {'type': 'string', 'required': True},
+        'id': {'type': 'integer', 'coerce': int, 'required': False},
         'state': {'check_with': _check_volume_state, 'required': False, 'default': 'detached'},
-    })
+    }
 
-    schema.add('volume_create', {
+
+@_definition('volume_create')
+def _volume_create(schema):
+    return {
         'label': {'type': 'string', 'required': True},
         'region': {'type': 'string', 'required': False},
         'size': {'type': 'integer', 'coerce': int, 'required': False, 'default': 20},
         'tags': LINODE_TAGS_TYPE,
         'instance': {'type': 'string', 'required': False},
         'state': {'check_with': _check_volume_state, 'required': False, 'default': 'detached'},
-    })
+        'wait': {'type': 'boolean', 'required': False, 'default': True},
+        'wait_timeout': {'type': 'integer', 'coerce': int, 'min': 0, 'required': False, 'default': 600},
+    }
+
 
-    schema.add('volume_update', {
+@_definition('volume_update')
+def _volume_update(schema):
+    return {
         'label': {'type': 'string', 'required': True},
         'size': {'type': 'integer', 'coerce': int, 'required': False},
         'tags': LINODE_TAGS_TYPE,
         'instance': {'type': 'string', 'required': False},
         'state': {'check_with': _check_volume_state, 'required': False, 'default': 'detached'},
-    })
+        'wait': {'type': 'boolean', 'required': False, 'default': True},
+        'wait_timeout': {'type': 'integer', 'coerce': int, 'min': 0, 'required': False, 'default': 600},
+    }
 
-    schema.add('volume_remove', {
+
+@_definition('volume_remove')
+def _volume_remove(schema):
+    return {
         'label': {'type': 'string', 'required': True},
         'force': {'type': 'boolean', 'required': False, 'default': False},
-    })
+    }
+
 
-    schema.add('domain_record_key', {
+@_definition('domain_record_key')
+def _domain_record_key(schema):
+    return {
         'domain': {'type': 'string', 'required': True},
+        'domain_id': {'type': 'integer', 'coerce': int, 'required': False},
         'type': {'check_with': _check_domain_record_type, 'required': True},
         'name': {'type': 'string', 'required': True},
+        'id': {'type': 'integer', 'coerce': int, 'required': False},
         'state': {'check_with': _check_state, 'required': False, 'default': 'present'},
-    })
+    }
+
 
-    schema.add('domain_record', {
+@_definition('domain_record')
+def _domain_record(schema):
+    return {
         'type': {'check_with': _check_domain_record_type, 'required': True},
         'name': {'type': 'string', 'required': True},
         'target': {'type': 'string', 'required': True},
@@ -233,14 +270,21 @@ def linode_schema():
         'port': {'type': 'integer', 'coerce': int, 'required': False},
         'service': {'type': 'string', 'required': False},
         'tag': {'check_with': _check_domain_record_caa_tag},
-    })
+    }
 
-    schema.add('domain_key', {
+
+@_definition('domain_key')
+def _domain_key(schema):
+    return {
         'domain': {'type': 'string', 'required': True},
+        'id': {'type': 'integer', 'coerce': int, 'required': False},
         'state': {'check_with': _check_state, 'required': False, 'default': 'present'},
-    })
+    }
+
 
-    schema.add('domain_create', {
+@_definition('domain_create')
+def _domain_create(schema):
+    return {
         'domain': {'type': 'string', 'required': True},
         'soa_email': {'type': 'string', 'required': False},
         'type': {'check_with': _check_domain_type, 'required': True},
@@ -254,9 +298,12 @@ def linode_schema():
         'axfr_ips': {'type': 'list', 'schema': {'type': 'string'}, 'required': False, 'default': []},
         'tags': LINODE_TAGS_TYPE,
         'records': {'type': 'list', 'schema': {'schema': schema.get('domain_record')}},
-    })
+    }
+
 
-    schema.add('domain_update', {
+@_definition('domain_update')
+def _domain_update(schema):
+    return {
         'domain': {'type': 'string', 'required': True},
         'soa_email': {'type': 'string', 'required': False},
         'group': {'type': 'string', 'required': False},
@@ -271,34 +318,54 @@ def linode_schema():
         'records': {'type': 'list', 'schema': {'schema': schema.get('domain_record')}},
         'keep_unknown_records': {'type': 'boolean', 'required': False, 'default': True},
         'return_unknown_records': {'type': 'boolean', 'required': False, 'default': False},
-    })
+    }
 
-    schema.add('balancer_node_key', {
+
+@_definition('balancer_node_key')
+def _balancer_node_key(schema):
+    return {
         'balancer': {'type': 'string', 'required': True},
+        'balancer_id': {'type': 'integer', 'coerce': int, 'required': False},
         'port': {'type': 'integer', 'coerce': int, 'min': 1, 'max': 65535, 'required': True},
+        'config_id': {'type': 'integer', 'coerce': int, 'required': False},
         'address': {'type': 'string', 'required': True},
+        'id': {'type': 'integer', 'coerce': int, 'required': False},
         'state': {'check_with': _check_state, 'required': False, 'default': 'present'},
-    })
+    }
+
 
-    schema.add('balancer_node_create', {
+@_definition('balancer_node_create')
+def _balancer_node_create(schema):
+    return {
         'address': {'type': 'string', 'required': True},
         'label': {'type': 'string', 'required': True},
         'mode': {'check_with': _check_balancer_node_mode, 'required': False, 'default': 'accept'},
         'weight': {'type': 'integer', 'coerce': int, 'min': 1, 'max': 255, 'required': False, 'default': 1},
-    })
+    }
+
 
-    schema.add('balancer_node_update', {
+@_definition('balancer_node_update')
+def _balancer_node_update(schema):
+    return {
         'mode': {'check_with': _check_balancer_node_mode, 'required': False, 'default': 'accept'},
         'weight': {'type': 'integer', 'coerce': int, 'min': 1, 'max': 255, 'required': False, 'default': 0},
-    })
+    }
 
-    schema.add('balancer_config_key', {
+
+@_definition('balancer_config_key')
+def _balancer_config_key(schema):
+    return {
         'balancer': {'type': 'string', 'required': True},
+        'balancer_id': {'type': 'integer', 'coerce': int, 'required': False},
         'port': {'type': 'integer', 'coerce': int, 'min': 1, 'max': 65535, 'required': True},
+        'id': {'type': 'integer', 'coerce': int, 'required': False},
         'state': {'check_with': _check_state, 'required': False, 'default': 'present'},
-    })
+    }
+
 
-    schema.add('balancer_config_create', {
+@_definition('balancer_config_create')
+def _balancer_config_create(schema):
+    return {
         'port': {'type': 'integer', 'coerce': int, 'min': 1, 'max': 65535, 'required': True},
         'protocol': {'check_with': _check_balancer_config_protocol, 'required': True},
         'algorithm': {'check_with': _check_balancer_config_algorithm, 'required': True},
@@ -329,16 +396,26 @@ def linode_schema():
 
         'keep_unknown_nodes': {'type': 'boolean', 'required': False, 'default': True},
         'return_unknown_nodes': {'type': 'boolean', 'required': False, 'default': False},
-    })
+    }
 
-    schema.add('balancer_config_update', schema.get('balancer_config_create'))
 
-    schema.add('balancer_key', {
+@_definition('balancer_config_update')
+def _balancer_config_update(schema):
+    return schema.get('balancer_config_create')
+
+
+@_definition('balancer_key')
+def _balancer_key(schema):
+    return {
         'label': {'type': 'string', 'required': True},
+        'id': {'type': 'integer', 'coerce': int, 'required': False},
         'state': {'check_with': _check_state, 'required': False, 'default': 'present'},
-    })
+    }
+
 
-    schema.add('balancer_create', {
+@_definition('balancer_create')
+def _balancer_create(schema):
+    return {
         'label': {'type': 'string', 'minlength': 3, 'maxlength': 32, 'required': True},
         'region': {'type': 'string', 'required': True},
         'client_conn_throttle': {'type': 'integer', 'coerce': int, 'min': 0, 'max': 20, 'required': False, 'default': 0},
@@ -352,9 +429,12 @@ def linode_schema():
         'return_unknown_configs': {'type': 'boolean', 'required': False, 'default': False},
 
         'ipv4_public_rdns': {'type': 'string', 'required': False},
-    })
+    }
 
-    schema.add('balancer_update', {
+
+@_definition('balancer_update')
+def _balancer_update(schema):
+    return {
         'client_conn_throttle': {'type': 'integer', 'coerce': int, 'min': 0, 'max': 20, 'required': False},
 
         # AttributeError: 'NodeBalancer' object has no attribute 'tags'
@@ -366,15 +446,55 @@ def linode_schema():
         'return_unknown_configs': {'type': 'boolean', 'required': False, 'default': False},
 
         'ipv4_public_rdns': {'type': 'string', 'required': False},
-    })
+    }
+
+
+@_definition('wait')
+def _wait(schema):
+    return {
+        'jobs': {'type': 'list', 'schema': {'type': 'dict', 'nullable': True}, 'required': True},
+        'timeout': {'type': 'integer', 'coerce': int, 'min': 0, 'required': False, 'default': 600},
+    }
+
+
+class LinodeSchema(object):
+    '''
+    Schema registry, which builds definitions on first use, so that action
+    pays only for definitions it validates against.
+    '''
+
+    def __init__(self):
+        self.schemas = {}
+
+    def get(self, name, default=None):
+        if name not in self.schemas:
+            if name not in _definitions:
+                return default
+            self.schemas[name] = _definitions[name](self)
+
+        return self.schemas[name]
 
-    return schema
+
+_schema = None
+
+
+def linode_schema():
+    global _schema
+
+    if _schema is None:
+        _schema = LinodeSchema()
+
+    return _schema
 
 
 def linode_action_input_validated(schema, definition, args):
-    from cerberus import Validator
     from json import dumps
 
+    try:
+        from cerberus import Validator
+    except ImportError:
+        raise AnsibleError('could not import cerberus module')
+
     log.vvvvv('linode_action_input_validated(%s): %s' %
               (definition, str(args)))
 
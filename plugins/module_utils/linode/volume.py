@@ -9,15 +9,24 @@ __metaclass__ = type
 from ansible.errors import AnsibleError
 from copy import deepcopy
 from datetime import datetime
-from time import sleep
 from .error import linode_raise_client_error
+from .events import linode_events_now, linode_wait_for_event
+from .filter import linode_filter, linode_find_all, linode_find_id, linode_find_many
+from .job import linode_job
+from .retry import linode_retry_create
 from .util import _filter_dict_keys, _update_if_needed
+from .client import linode_uncached, linode_wait_for_status, _linode_wait
 from .instance import instance_find
 
 
-def volume_find(client, label):
+def volume_find(client, label, id=None):
     from linode_api4 import Volume
 
+    if id is not None:
+        volume = linode_find_id(client, Volume, id, lambda v: v.label == label)
+        if volume is not None:
+            return volume
+
     try:
         return client.volumes(Volume.label == label)[0]
     except IndexError:
@@ -26,6 +35,18 @@ def volume_find(client, label):
         linode_raise_client_error(e)
 
 
+def volume_find_many(client, labels=None, tags=None, region=None):
+    from linode_api4 import Volume
+
+    criteria = {'tags': tags, 'region': region}
+
+    if labels is None:
+        volumes = linode_find_all(client, Volume, linode_filter(**criteria))
+        return {v.label: v for v in volumes}
+
+    return linode_find_many(client, Volume, 'label', labels, **criteria)
+
+
 def _ensure_attached_instance(client, args):
     if args['state'] != 'attached':
         return None
@@ -43,33 +64,43 @@ def _ensure_attached_instance(client, args):
 
 
 def volume_create(client, args, check_mode=False):
-    non_optional = ['region', 'size', 'label', 'instance']
+    non_optional = ['region', 'size', 'label', 'instance', 'wait', 'wait_timeout']
     remaining = _filter_dict_keys(args, non_optional)
 
     try:
         instance = _ensure_attached_instance(client, args)
 
         if not check_mode:
-            volume = client.volume_create(
-                region=args['region'] if instance is None else instance.region,
-                label=args['label'],
-                size=args['size'],
-                **remaining
+            since = linode_events_now()
+            volume = linode_retry_create(
+                client,
+                lambda: client.volume_create(
+                    region=args['region'] if instance is None else instance.region,
+                    label=args['label'],
+                    size=args['size'],
+                    **remaining
+                ),
+                lambda: volume_find(client, args['label']),
             )
 
-            while volume.status != 'active':
-                sleep(1)
-                volume = volume_find(client, volume.label)
+            if not args.get('wait', True):
+                result = deepcopy(volume._raw_json)
+                result['job'] = linode_job(
+                    'volume', volume, attach=instance.id if instance is not None else None)
+                return result
+
+            timeout = args.get('wait_timeout', 600)
+            _volume_wait(client, volume, 'volume_create', since, timeout=timeout)
 
             if instance is not None:
-                volume.attach(instance)
-                while volume.status != 'active':
-                    sleep(1)
-                    volume = volume_find(client, volume.label)
+                _volume_transition(client, volume, 'volume_attach', lambda: volume.attach(instance),
+                                   True, target=instance.id, timeout=timeout)
 
             result = deepcopy(volume._raw_json)
         else:
             result = _fake_volume(args)
+            if not args.get('wait', True):
+                result['job'] = linode_job('volume', result)
 
         return result
 
@@ -77,7 +108,51 @@ def volume_create(client, args, check_mode=False):
         linode_raise_client_error(e)
 
 
+# conditions of volume being done with transitions, given target of
+# transition, instance id to attach to or size to resize to
+VOLUME_TRANSITIONS = {
+    'volume_create': lambda volume, target: volume.status == 'active',
+    'volume_attach': lambda volume, target: volume.status == 'active' and volume.linode_id == target,
+    'volume_detach': lambda volume, target: volume.status == 'active' and volume.linode_id is None,
+    'volume_resize': lambda volume, target: volume.status == 'active' and volume.size >= target,
+}
+
+
+def _volume_wait(client, volume, action, since, target=None, timeout=600):
+    '''
+    Waits for volume to be done with transition, following events feed if
+    enabled, otherwise polling volume by its id with backoff. Volume is
+    refreshed in place.
+    '''
+    done = VOLUME_TRANSITIONS[action]
+
+    with linode_uncached(client):
+        if client.session.events is not None:
+            linode_wait_for_event(client, 'volume', volume.id, action, since, timeout=timeout)
+            volume._api_get()
+
+        # event of the same action made just before may match since as
+        # well, volume is polled then
+        _linode_wait(volume, lambda current: done(current, target), timeout,
+                     u'%s wait timeout for: %s' % (action, volume.label))
+
+
+def _volume_transition(client, volume, action, call, wait, target=None, timeout=600):
+    since = linode_events_now()
+    call()
+
+    if wait:
+        _volume_wait(client, volume, action, since, target=target, timeout=timeout)
+
+
 def volume_update(client, volume, args, check_mode=False):
+    wait = args.get('wait', True)
+    timeout = args.get('wait_timeout', 600)
+
+    # volume created or resized without waiting may still be busy
+    if volume.status in ['creating', 'resizing'] and wait and not check_mode:
+        linode_wait_for_status(volume, 'active', timeout=timeout)
+
     result = deepcopy(volume._raw_json)
     updated = False
 
@@ -97,7 +172,8 @@ def volume_update(client, volume, args, check_mode=False):
             result['linode_label'] = None
             updated = True
             if not check_mode:
-                volume.detach()
+                _volume_transition(client, volume, 'volume_detach', volume.detach,
+                                   wait, timeout=timeout)
 
         if args['state'] == 'attached' and volume.linode_id is None:
             instance = _ensure_attached_instance(client, args)
@@ -105,7 +181,8 @@ def volume_update(client, volume, args, check_mode=False):
             result['linode_label'] = instance.label
             updated = True
             if not check_mode:
-                volume.attach(instance)
+                _volume_transition(client, volume, 'volume_attach', lambda: volume.attach(instance),
+                                   wait, target=instance.id, timeout=timeout)
 
         if args['state'] == 'attached' and volume.linode_id is not None:
             instance = _ensure_attached_instance(client, args)
@@ -114,8 +191,11 @@ def volume_update(client, volume, args, check_mode=False):
                 result['linode_label'] = instance.label
                 updated = True
                 if not check_mode:
-                    volume.detach()
-                    volume.attach(instance)
+                    # volume can not be attached before it is detached
+                    _volume_transition(client, volume, 'volume_detach', volume.detach,
+                                       True, timeout=timeout)
+                    _volume_transition(client, volume, 'volume_attach', lambda: volume.attach(instance),
+                                       wait, target=instance.id, timeout=timeout)
 
         if 'size' in args:
             cur = volume.size
@@ -123,7 +203,8 @@ def volume_update(client, volume, args, check_mode=False):
                 updated = True
                 result['size'] = args['size']
                 if not check_mode:
-                    volume.resize(args['size'])
+                    _volume_transition(client, volume, 'volume_resize', lambda: volume.resize(args['size']),
+                                       wait, target=args['size'], timeout=timeout)
 
         return (updated, result)
 
@@ -138,7 +219,8 @@ def volume_remove(client, volume, force=False, check_mode=False):
 
         if not check_mode:
             if volume.linode_id is not None and force:
-                volume.detach()
+                # volume can not be deleted before it is detached
+                _volume_transition(client, volume, 'volume_detach', volume.detach, True)
             volume.delete()
 
         return {'status': 'deleted'}
@@ -11,8 +11,9 @@ DOCUMENTATION = r'''
 action: balancer
 short_description: Create/update/remove a linode balancer
 description:
-    - Action will query existing balancer by I(label).
-    - Linode internal IDs are not used to perform operations, thus updating balancer config
+    - Action will query existing balancer by I(label), loading it by I(id), or id remembered in
+      C(linode_ids) fact, when known.
+    - Balancer configs are matched by I(port), not by their ids, thus updating balancer config
       port here, will effectively drop old port configuration and create new port configuration
       if I(keep_unknown_configs) is set to C(False). If you change I(port) in ansible playbook,
       and I(keep_unknown_configs) is set to C(True) which is default, you effectively will
@@ -30,6 +31,13 @@ options:
         A 3..32 characters long existing balancer label.
     type: str
     required: true
+  id:
+    description:
+        Id of balancer, loaded directly by it instead of searching by I(label). Falls back to search if
+        there is no such balancer, or it has other I(label). If not given, id remembered in C(linode_ids)
+        fact is used.
+    type: int
+    required: false
   region:
     description:
         The ID of the Region to create this NodeBalancer in.
@@ -264,6 +272,44 @@ balancer:
     },
     "updated": "2020-12-27T17:38:50"
   }
+ansible_facts:
+  description:
+    - C(linode_ids) fact, ids of objects by kind and key, like label, which actions load objects by in later
+      tasks, or later runs when fact cache is enabled. Keeps ids of previous tasks and updates ids of
+      balancer.
+  returned: Always.
+  type: dict
+  sample: {"linode_ids": {"balancer": {"lb-1": 10}}}
+linode_retries:
+  description: Number of Linode API requests that were retried due to transient failures.
+  returned: Always.
+  type: int
+_linode_metrics:
+  description:
+    - Linode API usage of this task; number of API calls made through client and of requests actually
+      sent, received bytes, total latency of calls, retries, time queued by rate limiter and time spent
+      waiting for status changes, all in seconds, number of status polls, and of connections opened and
+      requests sent over already open ones. Calls, bytes and latency, with max latency of single call,
+      are given per endpoint too, keyed by method and path with object ids replaced by C({id}).
+  returned: Always.
+  type: dict
+  sample: {
+      "calls": 3,
+      "requests": 3,
+      "bytes": 1185,
+      "latency": 0.152,
+      "retries": 0,
+      "queued": 0.0,
+      "wait": 0.0,
+      "polls": 0,
+      "connections": 1,
+      "reused": 2,
+      "endpoints": {
+          "GET /nodebalancers": {"calls": 1, "bytes": 378, "latency": 0.048, "max": 0.048},
+          "PUT /nodebalancers/{id}": {"calls": 1, "bytes": 329, "latency": 0.029, "max": 0.029},
+          "GET /nodebalancers/{id}/configs": {"calls": 1, "bytes": 478, "latency": 0.075, "max": 0.075}
+      }
+  }
 '''
 
 
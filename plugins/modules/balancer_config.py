@@ -13,7 +13,8 @@ short_description: Create/update/remove a linode balancer config
 description:
     - Action will query by I(balancer) and I(port) existing cloud state.
     - Fails with AnsibleError if specified I(balancer) does exist
-    - Linode internal IDs are not used to perform operations, thus updating I(balancer) and I(port)
+    - Ids, given or remembered in C(linode_ids) fact, only spare searching, object loaded by id is
+      used only if it has the same I(balancer) and I(port), thus updating I(balancer) and I(port)
       here impossible, you will be referring to another balancer configuration. Other fields
       are updatable here.
 options:
@@ -29,6 +30,13 @@ options:
         A 3..32 characters long existing balancer label.
     type: str
     required: true
+  balancer_id:
+    description:
+        Id of balancer, loaded directly by it instead of searching by I(balancer) label. Falls back to
+        search if there is no such balancer, or it has other I(balancer) label. If not given, id remembered
+        in C(linode_ids) fact is used.
+    type: int
+    required: false
   port:
     description:
         The port this config is for. These values must be unique across configs on a single
@@ -38,6 +46,13 @@ options:
         have a balancer listening on port 443.
     type: int
     required: true
+  id:
+    description:
+        Id of config, loaded directly by it instead of searching by I(port). Falls back to search if there
+        is no such config, or it has other I(port). If not given, id remembered in C(linode_ids) fact is
+        used.
+    type: int
+    required: false
   protocol:
     description:
         The protocol this port is configured to serve. For C(http) and C(tcp), I(ssl_cert) and I(ssl_key)
@@ -293,6 +308,45 @@ balancer_config:
     "ssl_key": null,
     "stickiness": "table"
   }
+ansible_facts:
+  description:
+    - C(linode_ids) fact, ids of objects by kind and key, like label, which actions load objects by in later
+      tasks, or later runs when fact cache is enabled. Keeps ids of previous tasks and updates ids of
+      balancer and balancer config.
+  returned: Always.
+  type: dict
+  sample: {"linode_ids": {"balancer": {"lb-1": 10}, "balancer_config": {"10:80": 11}}}
+linode_retries:
+  description: Number of Linode API requests that were retried due to transient failures.
+  returned: Always.
+  type: int
+_linode_metrics:
+  description:
+    - Linode API usage of this task; number of API calls made through client and of requests actually
+      sent, received bytes, total latency of calls, retries, time queued by rate limiter and time spent
+      waiting for status changes, all in seconds, number of status polls, and of connections opened and
+      requests sent over already open ones. Calls, bytes and latency, with max latency of single call,
+      are given per endpoint too, keyed by method and path with object ids replaced by C({id}).
+  returned: Always.
+  type: dict
+  sample: {
+      "calls": 4,
+      "requests": 4,
+      "bytes": 8649,
+      "latency": 0.318,
+      "retries": 0,
+      "queued": 0.0,
+      "wait": 0.0,
+      "polls": 0,
+      "connections": 1,
+      "reused": 3,
+      "endpoints": {
+          "GET /nodebalancers/{id}": {"calls": 1, "bytes": 329, "latency": 0.065, "max": 0.065},
+          "GET /nodebalancers/{id}/configs": {"calls": 1, "bytes": 478, "latency": 0.079, "max": 0.079},
+          "GET /nodebalancers/{id}/configs/{id}/nodes": {"calls": 1, "bytes": 7380, "latency": 0.096, "max": 0.096},
+          "PUT /nodebalancers/{id}/configs/{id}": {"calls": 1, "bytes": 462, "latency": 0.078, "max": 0.078}
+      }
+  }
 '''
 
 
@@ -14,8 +14,9 @@ description:
     - Action will query by I(balancer) and I(port) existing cloud state, then by I(address)
       will manage balancer node only.
     - Fails with AnsibleError if specified I(balancer) or its I(port) configuration does exist
-    - Linode internal IDs are not used to perform operations, thus updating I(balancer), I(port)
-      and I(address) here impossible. Other fields I(label), I(mode) and I(weight) updatable here.
+    - Ids, given or remembered in C(linode_ids) fact, only spare searching, object loaded by id is
+      used only if it has the same I(balancer), I(port) and I(address), thus updating them here
+      impossible. Other fields I(label), I(mode) and I(weight) updatable here.
 options:
   state:
     description:
@@ -29,17 +30,38 @@ options:
         A 3..32 characters long existing balancer label.
     type: str
     required: true
+  balancer_id:
+    description:
+        Id of balancer, loaded directly by it instead of searching by I(balancer) label. Falls back to
+        search if there is no such balancer, or it has other I(balancer) label. If not given, id remembered
+        in C(linode_ids) fact is used.
+    type: int
+    required: false
   port:
     description:
         Port configuration on I(balancer) where to query this node by its I(address).
     type: int
     required: true
+  config_id:
+    description:
+        Id of config, loaded directly by it instead of searching by I(port). Falls back to search if there
+        is no such config, or it has other I(port). If not given, id remembered in C(linode_ids) fact is
+        used.
+    type: int
+    required: false
   address:
     description:
         The private IP Address and port in the form B(address:port) where this backend can be reached.
         This must be a B(private) IP address.
     type: str
     required: true
+  id:
+    description:
+        Id of node, loaded directly by it instead of searching by I(address). Falls back to search if there
+        is no such node, or it has other I(address). If not given, id remembered in C(linode_ids) fact is
+        used.
+    type: int
+    required: false
   label:
     description:
         A 3..32 characters long label for this node. This is for display purposes only.
@@ -109,6 +131,45 @@ balancer_node:
     "status": "UP",
     "weight": 1
   }
+ansible_facts:
+  description:
+    - C(linode_ids) fact, ids of objects by kind and key, like label, which actions load objects by in later
+      tasks, or later runs when fact cache is enabled. Keeps ids of previous tasks and updates ids of
+      balancer, balancer config and balancer node.
+  returned: Always.
+  type: dict
+  sample: {"linode_ids": {"balancer": {"lb-1": 10}, "balancer_config": {"10:80": 11}, "balancer_node": {"11:192.168.130.1:80": 12}}}
+linode_retries:
+  description: Number of Linode API requests that were retried due to transient failures.
+  returned: Always.
+  type: int
+_linode_metrics:
+  description:
+    - Linode API usage of this task; number of API calls made through client and of requests actually
+      sent, received bytes, total latency of calls, retries, time queued by rate limiter and time spent
+      waiting for status changes, all in seconds, number of status polls, and of connections opened and
+      requests sent over already open ones. Calls, bytes and latency, with max latency of single call,
+      are given per endpoint too, keyed by method and path with object ids replaced by C({id}).
+  returned: Always.
+  type: dict
+  sample: {
+      "calls": 4,
+      "requests": 4,
+      "bytes": 8317,
+      "latency": 0.282,
+      "retries": 0,
+      "queued": 0.0,
+      "wait": 0.0,
+      "polls": 0,
+      "connections": 1,
+      "reused": 3,
+      "endpoints": {
+          "GET /nodebalancers/{id}": {"calls": 1, "bytes": 329, "latency": 0.037, "max": 0.037},
+          "GET /nodebalancers/{id}/configs/{id}": {"calls": 1, "bytes": 462, "latency": 0.097, "max": 0.097},
+          "GET /nodebalancers/{id}/configs/{id}/nodes": {"calls": 1, "bytes": 7380, "latency": 0.083, "max": 0.083},
+          "POST /nodebalancers/{id}/configs/{id}/nodes": {"calls": 1, "bytes": 146, "latency": 0.065, "max": 0.065}
+      }
+  }
 '''
 
 
@@ -30,6 +30,13 @@ options:
         cannot be two Domains representing the same domain.
     type: str
     required: true
+  id:
+    description:
+        Id of domain, loaded directly by it instead of searching by I(domain). Falls back to search if there
+        is no such domain, or it has other I(domain). If not given, id remembered in C(linode_ids) fact is
+        used.
+    type: int
+    required: false
   type:
     description:
         Whether this Domain represents the authoritative source of information
@@ -229,6 +236,43 @@ domain:
       "type": "master",
       "updated": "2020-12-27T06:08:35"
   }
+ansible_facts:
+  description:
+    - C(linode_ids) fact, ids of objects by kind and key, like label, which actions load objects by in later
+      tasks, or later runs when fact cache is enabled. Keeps ids of previous tasks and updates ids of
+      domain.
+  returned: Always.
+  type: dict
+  sample: {"linode_ids": {"domain": {"example.com": 789}}}
+linode_retries:
+  description: Number of Linode API requests that were retried due to transient failures.
+  returned: Always.
+  type: int
+_linode_metrics:
+  description:
+    - Linode API usage of this task; number of API calls made through client and of requests actually
+      sent, received bytes, total latency of calls, retries, time queued by rate limiter and time spent
+      waiting for status changes, all in seconds, number of status polls, and of connections opened and
+      requests sent over already open ones. Calls, bytes and latency, with max latency of single call,
+      are given per endpoint too, keyed by method and path with object ids replaced by C({id}).
+  returned: Always.
+  type: dict
+  sample: {
+      "calls": 2,
+      "requests": 2,
+      "bytes": 677,
+      "latency": 0.064,
+      "retries": 0,
+      "queued": 0.0,
+      "wait": 0.0,
+      "polls": 0,
+      "connections": 1,
+      "reused": 1,
+      "endpoints": {
+          "GET /domains": {"calls": 1, "bytes": 363, "latency": 0.042, "max": 0.042},
+          "PUT /domains/{id}": {"calls": 1, "bytes": 314, "latency": 0.022, "max": 0.022}
+      }
+  }
 '''
 
 
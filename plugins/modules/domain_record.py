@@ -23,6 +23,13 @@ options:
     description: Domain this record should belong to.
     type: str
     required: true
+  domain_id:
+    description:
+        Id of domain, loaded directly by it instead of searching by I(domain). Falls back to search if there
+        is no such domain, or it has other I(domain). If not given, id remembered in C(linode_ids) fact is
+        used.
+    type: int
+    required: false
   type:
     description:
         The type of Record this is in the DNS system. For example, A records associate
@@ -38,6 +45,13 @@ options:
         with an IP address etc. For '@' should be explicit empty string.
     type: str
     required: true
+  id:
+    description:
+        Id of record, loaded directly by it instead of searching by type, name and target. Falls back to
+        search if there is no such record, or it has other type, name and target. If not given, id
+        remembered in C(linode_ids) fact is used.
+    type: int
+    required: false
   target:
     description:
         The target for this Record. This field’s actual usage depends on the type of record
@@ -135,6 +149,44 @@ domain_record:
       "updated": "2020-12-27T06:11:05",
       "weight": 0
   }
+ansible_facts:
+  description:
+    - C(linode_ids) fact, ids of objects by kind and key, like label, which actions load objects by in later
+      tasks, or later runs when fact cache is enabled. Keeps ids of previous tasks and updates ids of
+      domain and domain record.
+  returned: Always.
+  type: dict
+  sample: {"linode_ids": {"domain": {"example.com": 789}, "domain_record": {"789:A:www:10.0.0.1": 1011}}}
+linode_retries:
+  description: Number of Linode API requests that were retried due to transient failures.
+  returned: Always.
+  type: int
+_linode_metrics:
+  description:
+    - Linode API usage of this task; number of API calls made through client and of requests actually
+      sent, received bytes, total latency of calls, retries, time queued by rate limiter and time spent
+      waiting for status changes, all in seconds, number of status polls, and of connections opened and
+      requests sent over already open ones. Calls, bytes and latency, with max latency of single call,
+      are given per endpoint too, keyed by method and path with object ids replaced by C({id}).
+  returned: Always.
+  type: dict
+  sample: {
+      "calls": 3,
+      "requests": 3,
+      "bytes": 594,
+      "latency": 0.207,
+      "retries": 0,
+      "queued": 0.0,
+      "wait": 0.0,
+      "polls": 0,
+      "connections": 1,
+      "reused": 2,
+      "endpoints": {
+          "GET /domains/{id}": {"calls": 1, "bytes": 314, "latency": 0.034, "max": 0.034},
+          "GET /domains/{id}/records": {"calls": 1, "bytes": 49, "latency": 0.078, "max": 0.078},
+          "POST /domains/{id}/records": {"calls": 1, "bytes": 231, "latency": 0.095, "max": 0.095}
+      }
+  }
 '''
 
 from ansible.module_utils.basic import AnsibleModule
@@ -29,6 +29,13 @@ options:
     description: Linode instance label to create/update/remove.
     type: str
     required: true
+  id:
+    description:
+        Id of instance, loaded directly by it instead of searching by I(label). Falls back to search if
+        there is no such instance, or it has other I(label). If not given, id remembered in C(linode_ids)
+        fact is used.
+    type: int
+    required: false
   region:
     description: Linode region to create instance at.
     type: str
@@ -73,6 +80,13 @@ options:
     type: str
     default: None
     required: false
+  wait:
+    description:
+      - Wait for new instance to be running. If C(false), task returns right after instance is created
+        with I(job) handle, which can be waited for later in the play with M(muradm.linode.wait).
+    type: bool
+    default: true
+    required: false
 requirements: [ "linode_api4", "cerberus" ]
 notes:
   - I(group) option is being deprecated by Linode.
@@ -172,6 +186,48 @@ root_pass:
   description: The root password to linode instance.
   returned: Only `root_pass` option was not provided, so that it is generated.
   type: str
+job:
+  description: Handle of created instance to be given to M(muradm.linode.wait).
+  returned: Only when instance is created with I(wait) set to C(false).
+  type: dict
+  sample: {"kind": "instance", "id": 23557736, "label": "my-linode-1", "status": "running"}
+ansible_facts:
+  description:
+    - C(linode_ids) fact, ids of objects by kind and key, like label, which actions load objects by in later
+      tasks, or later runs when fact cache is enabled. Keeps ids of previous tasks and updates ids of
+      instance.
+  returned: Always.
+  type: dict
+  sample: {"linode_ids": {"instance": {"web-1": 123}}}
+linode_retries:
+  description: Number of Linode API requests that were retried due to transient failures.
+  returned: Always.
+  type: int
+_linode_metrics:
+  description:
+    - Linode API usage of this task; number of API calls made through client and of requests actually
+      sent, received bytes, total latency of calls, retries, time queued by rate limiter and time spent
+      waiting for status changes, all in seconds, number of status polls, and of connections opened and
+      requests sent over already open ones. Calls, bytes and latency, with max latency of single call,
+      are given per endpoint too, keyed by method and path with object ids replaced by C({id}).
+  returned: Always.
+  type: dict
+  sample: {
+      "calls": 2,
+      "requests": 2,
+      "bytes": 1830,
+      "latency": 0.412,
+      "retries": 0,
+      "queued": 0.0,
+      "wait": 0.0,
+      "polls": 0,
+      "connections": 1,
+      "reused": 1,
+      "endpoints": {
+          "GET /linode/instances": {"calls": 1, "bytes": 915, "latency": 0.201, "max": 0.201},
+          "PUT /linode/instances/{id}": {"calls": 1, "bytes": 915, "latency": 0.211, "max": 0.211}
+      }
+  }
 '''
 
 from ansible.module_utils.basic import AnsibleModule
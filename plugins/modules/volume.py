@@ -31,6 +31,13 @@ options:
         A 1..32 characters Volume’s label, which is also used in the I(filesystem_path) of the resulting volume.
     type: str
     required: true
+  id:
+    description:
+        Id of volume, loaded directly by it instead of searching by I(label). Falls back to search if there
+        is no such volume, or it has other I(label). If not given, id remembered in C(linode_ids) fact is
+        used.
+    type: int
+    required: false
   region:
     description:
         The Region to deploy this Volume in. This is only required if a I(instance) is not given and ignored
@@ -62,6 +69,24 @@ options:
     type: bool
     required: false
     default: false
+  wait:
+    description:
+      - Wait for new volume to be active and attached. If C(false), task returns right after volume is
+        created with I(job) handle, which can be waited for later in the play with M(muradm.linode.wait),
+        volume is attached to I(instance) then.
+      - For existing volume, wait for it to be attached, detached or resized. If C(false), task returns
+        right after requesting the change. Volume being moved to another instance is always waited to be
+        detached first, volume which is still being created or resized is waited for before any change.
+      - Volume is polled by its id with growing interval, or account events feed is followed if
+        C(linode_wait_strategy) is set to C(events).
+    type: bool
+    required: false
+    default: true
+  wait_timeout:
+    description: Seconds to wait for every change of volume.
+    type: int
+    required: false
+    default: 600
 requirements: [ "linode_api4", "cerberus" ]
 notes:
   - Options marked as required, are required at volume creation time.
@@ -166,6 +191,50 @@ volume:
       ],
       "updated": "2020-12-21T18:54:21",
   }
+job:
+  description: Handle of created volume to be given to M(muradm.linode.wait).
+  returned: Only when volume is created with I(wait) set to C(false).
+  type: dict
+  sample: {"kind": "volume", "id": 12345, "label": "my-volume-1", "status": "active", "attach": 23557736}
+ansible_facts:
+  description:
+    - C(linode_ids) fact, ids of objects by kind and key, like label, which actions load objects by in later
+      tasks, or later runs when fact cache is enabled. Keeps ids of previous tasks and updates ids of
+      volume.
+  returned: Always.
+  type: dict
+  sample: {"linode_ids": {"volume": {"data-1": 456}}}
+linode_retries:
+  description: Number of Linode API requests that were retried due to transient failures.
+  returned: Always.
+  type: int
+_linode_metrics:
+  description:
+    - Linode API usage of this task; number of API calls made through client and of requests actually
+      sent, received bytes, total latency of calls, retries, time queued by rate limiter and time spent
+      waiting for status changes, all in seconds, number of status polls, and of connections opened and
+      requests sent over already open ones. Calls, bytes and latency, with max latency of single call,
+      are given per endpoint too, keyed by method and path with object ids replaced by C({id}).
+  returned: Always.
+  type: dict
+  sample: {
+      "calls": 4,
+      "requests": 4,
+      "bytes": 1079,
+      "latency": 0.337,
+      "retries": 0,
+      "queued": 0.0,
+      "wait": 0.0,
+      "polls": 0,
+      "connections": 1,
+      "reused": 3,
+      "endpoints": {
+          "GET /volumes": {"calls": 1, "bytes": 49, "latency": 0.049, "max": 0.049},
+          "GET /linode/instances": {"calls": 1, "bytes": 498, "latency": 0.097, "max": 0.097},
+          "POST /volumes": {"calls": 1, "bytes": 266, "latency": 0.092, "max": 0.092},
+          "POST /volumes/{id}/attach": {"calls": 1, "bytes": 266, "latency": 0.099, "max": 0.099}
+      }
+  }
 '''
 
 from ansible.module_utils.basic import AnsibleModule
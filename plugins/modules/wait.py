@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2020, muradm <mail@muradm.net>
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+action: wait
+short_description: Wait for linode instances and volumes created without waiting
+description:
+    - Joins I(job) handles returned by M(muradm.linode.instance) and M(muradm.linode.volume) when they
+      create objects with I(wait) set to C(false). Instances are waited to be running, volumes to be
+      active, volumes which were to be attached are attached then. All objects are polled together, with
+      single list request per kind on every poll. Fails if any object is not ready in I(timeout), objects
+      which are ready are returned anyway. In check mode handles of fake objects are skipped. Since this
+      is action only plugin one could delegate it B(localhost) or event use it with B(gather_facts) turned off.
+options:
+  jobs:
+    description: List of job handles, empty ones are skipped.
+    type: list
+    elements: dict
+    required: true
+  timeout:
+    description: Seconds to wait for all objects to get ready.
+    type: int
+    default: 600
+    required: false
+requirements: [ "linode_api4", "cerberus" ]
+author:
+- muradm (@muradm)
+'''
+
+EXAMPLES = r'''
+- hosts: localhost
+  connection: local
+  tasks:
+    - muradm.linode.instance:
+        label: 'web-{{ item }}'
+        type: 'g6-standard-1'
+        image: 'linode/debian10'
+        region: 'eu-central'
+        wait: false
+      loop: '{{ range(1, 101) | list }}'
+      register: web
+
+    - muradm.linode.domain_record:
+        domain: 'example.com'
+        name: '{{ item.instance.label }}'
+        type: 'A'
+        target: '{{ item.instance.ipv4[0] }}'
+      loop: '{{ web.results }}'
+
+    - muradm.linode.wait:
+        jobs: '{{ web.results | selectattr("job", "defined") | map(attribute="job") | list }}'
+        timeout: 900
+'''
+
+RETURN = r'''
+instances:
+  description: Instances which are running, in JSON serialized form.
+  returned: Always.
+  type: list
+  elements: dict
+volumes:
+  description: Volumes which are active, and attached if they were to be, in JSON serialized form.
+  returned: Always.
+  type: list
+  elements: dict
+timed_out:
+  description: Job handles of objects which did not get ready in time.
+  returned: Always.
+  type: list
+  elements: dict
+time_to_ready:
+  description: Seconds objects took to get ready since task started, minimum, maximum, mean and percentiles.
+  returned: Always.
+  type: dict
+  sample: {"min": 0.0, "max": 41.2, "mean": 23.8, "p50": 22.5, "p95": 39.7}
+linode_retries:
+  description: Number of Linode API requests that were retried due to transient failures.
+  returned: Always.
+  type: int
+_linode_metrics:
+  description:
+    - Linode API usage of this task; number of API calls made through client and of requests actually
+      sent, received bytes, total latency of calls, retries, time queued by rate limiter and time spent
+      waiting for status changes, all in seconds, number of status polls, and of connections opened and
+      requests sent over already open ones. Calls, bytes and latency, with max latency of single call,
+      are given per endpoint too, keyed by method and path with object ids replaced by C({id}).
+  returned: Always.
+  type: dict
+  sample: {
+      "calls": 4,
+      "requests": 4,
+      "bytes": 61240,
+      "latency": 0.804,
+      "retries": 0,
+      "queued": 0.0,
+      "wait": 38.1,
+      "polls": 3,
+      "connections": 1,
+      "reused": 3,
+      "endpoints": {
+          "GET /linode/instances": {"calls": 4, "bytes": 61240, "latency": 0.804, "max": 0.305}
+      }
+  }
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+
+
+def main():
+    AnsibleModule(dict()).fail_json('wait is action')
+
+
+if __name__ == '__main__':
+    main()
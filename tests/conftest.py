@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2020, muradm <mail@muradm.net>
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+'''
+Makes collection importable as ansible_collections.muradm.linode right from
+the source tree, for tests of module_utils.
+'''
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+import sys
+
+from tempfile import mkdtemp
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+from run import _collections_path  # noqa: E402
+
+sys.path.insert(0, _collections_path(mkdtemp(prefix='linode-tests-')))
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2020, muradm <mail@muradm.net>
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+
+import pytest
+
+from ansible_collections.muradm.linode.plugins.module_utils.linode.cache import LinodeResponseCache
+from ansible_collections.muradm.linode.plugins.module_utils.linode.session import LinodeResponse
+
+
+URL = 'https://api.linode.com/v4/volumes?page=1'
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return LinodeResponseCache(str(tmp_path), 'token', ttl=60)
+
+
+def _store(cache, url=URL):
+    cache.store(url, {}, LinodeResponse(200, {'ETag': 'e'}, b'{"data": [], "pages": 1}'))
+
+
+def _unlink(path, *args, **kwargs):
+    os.unlink(path)
+    raise FileNotFoundError(path)
+
+
+def test_store_get(cache):
+    _store(cache)
+
+    entry = cache.get(URL, {})
+    assert entry['fresh']
+    assert entry['etag'] == 'e'
+    assert cache.get(URL, {'X-Filter': '{}'}) is None
+
+
+def test_get_evicted_while_read(cache, monkeypatch):
+    _store(cache)
+    monkeypatch.setattr(os, 'utime', _unlink)
+
+    assert cache.get(URL, {}) is None
+
+
+def test_store_replaced_file_removed(cache, monkeypatch):
+    monkeypatch.setattr(os, 'replace', _unlink)
+
+    _store(cache)
+
+    assert cache.get(URL, {}) is None
+    assert os.listdir(cache.path) == []
+
+
+def test_invalidate_keeps_files_being_written(cache):
+    _store(cache)
+    with open(os.path.join(cache.path, 'other.tmp'), 'w') as f:
+        f.write('{}')
+
+    cache.invalidate()
+
+    assert cache.get(URL, {}) is None
+    assert os.listdir(cache.path) == ['other.tmp']
+
+
+def test_evict_keeps_files_being_written(cache):
+    cache.max_size = 0
+    with open(os.path.join(cache.path, 'other.tmp'), 'w') as f:
+        f.write('{}')
+
+    _store(cache)
+
+    assert os.listdir(cache.path) == ['other.tmp']
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2020, muradm <mail@muradm.net>
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+'''
+Round trip of cassette: playbook of several tasks, every one run by its own
+worker, is recorded against mock API and replayed with mock stopped. Runs
+recording to the same cassette are checked without playbooks.
+'''
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+
+import pytest
+
+from mock_api import MockServer
+from run import _collections_path
+from ansible_collections.muradm.linode.plugins.module_utils.linode import cassette as linode_cassette
+from ansible_collections.muradm.linode.plugins.module_utils.linode.session import LinodeResponse
+
+
+PLAYBOOK = [{
+    'hosts': 'localhost',
+    'gather_facts': False,
+    'tasks': [
+        {'muradm.linode.instance': {
+            'label': 'i-{{ item }}', 'region': 'eu-central', 'type': 'g6-nanode-1',
+            'image': 'linode/debian10', 'root_pass': 'cassette-Pass-1234',
+        }, 'loop': [1, 2]},
+        {'muradm.linode.volume': {
+            'label': 'v-1', 'region': 'eu-central', 'size': 20, 'state': 'attached', 'instance': 'i-1',
+        }},
+        {'muradm.linode.volume': {
+            'label': 'v-1', 'region': 'eu-central', 'size': 20, 'state': 'attached', 'instance': 'i-1',
+        }, 'register': 'again'},
+        {'assert': {'that': ['not again.changed']}},
+    ],
+}]
+
+
+def _playbook(env, path):
+    process = subprocess.run(
+        [shutil.which('ansible-playbook'), '-i', 'localhost,', '-c', 'local', path],
+        env=env, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+
+    assert process.returncode == 0, process.stdout.decode('utf-8', 'replace')
+
+
+@pytest.mark.skipif(shutil.which('ansible-playbook') is None, reason='ansible-playbook is not installed')
+def test_cassette_replays_tasks_in_recorded_order(tmp_path):
+    playbook = str(tmp_path / 'playbook.yml')
+    cassette = str(tmp_path / 'cassette.jsonl')
+    with open(playbook, 'w') as f:
+        json.dump(PLAYBOOK, f)
+
+    server = MockServer().start()
+
+    env = dict(os.environ)
+    env['ANSIBLE_COLLECTIONS_PATH'] = _collections_path(str(tmp_path))
+    env['ANSIBLE_NOCOLOR'] = '1'
+    env['LINODE_API_URL'] = server.url
+    env['LINODE_ACCESS_TOKEN'] = 'cassette'
+    env['LINODE_RATE_LIMIT'] = 'false'
+    env['LINODE_CASSETTE'] = cassette
+
+    try:
+        _playbook(dict(env, LINODE_CASSETTE_MODE='record'), playbook)
+    finally:
+        server.stop()
+
+    # the same lookup is recorded with different responses by different
+    # tasks, like instance not found before it is created
+    with open(cassette, 'r') as f:
+        keys = [json.dumps(json.loads(line)['key'], sort_keys=True) for line in f]
+    assert len(keys) > len(set(keys))
+
+    # mock is stopped, any request not replayed from cassette fails
+    _playbook(dict(env, LINODE_CASSETTE_MODE='replay', LINODE_CASSETTE_LATENCY='0'), playbook)
+
+
+def _record(path, run_id, ids, monkeypatch):
+    monkeypatch.setattr(linode_cassette, '_linode_run_id', lambda: run_id)
+    cassette = linode_cassette.LinodeCassette(path, mode='record')
+    for id in ids:
+        cassette.record('GET', 'https://api.linode.com/v4/volumes/1', {}, None,
+                        LinodeResponse(200, {}, json.dumps({'id': id}).encode('utf-8')), 0.0)
+
+
+def _replay(path, run_id, monkeypatch):
+    monkeypatch.setattr(linode_cassette, '_linode_run_id', lambda: run_id)
+    cassette = linode_cassette.LinodeCassette(path, mode='replay', latency_scale=0)
+    return json.loads(cassette.replay('GET', 'https://api.linode.com/v4/volumes/1', {}, None).text)['id']
+
+
+def test_cassette_recorded_anew_by_every_run(tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
+    path = str(tmp_path / 'cassette.jsonl')
+
+    _record(path, 1, [1, 2], monkeypatch)
+
+    # workers of next run, first one starts cassette anew, others append
+    _record(path, 2, [3], monkeypatch)
+    _record(path, 2, [4], monkeypatch)
+
+    with open(path, 'r') as f:
+        assert [json.loads(line)['body']['id'] for line in f] == [3, 4]
+
+    assert [_replay(path, 3, monkeypatch) for _ in range(3)] == [3, 4, 4]
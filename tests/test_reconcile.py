@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2020, muradm <mail@muradm.net>
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+'''
+Smoke run of benchmarks/reconcile.py: every scenario is run once against
+fakes, so that reconcile functions and fakes falling out of step fail here
+instead of in benchmark runs.
+'''
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+import reconcile  # noqa: E402
+
+
+SCENARIOS = sorted(reconcile.BENCHMARK_SCENARIOS.keys())
+
+
+@pytest.fixture(scope='module')
+def modules():
+    return reconcile._module_utils()
+
+
+@pytest.fixture
+def page_size():
+    yield
+    reconcile.FakeSession.page_size = None
+
+
+@pytest.fixture(scope='module')
+def baseline():
+    with open(reconcile.BENCHMARK_BASELINE) as f:
+        return json.load(f)
+
+
+@pytest.mark.parametrize('scenario', SCENARIOS)
+def test_scenario(modules, baseline, scenario):
+    result = reconcile.measure(modules, scenario, 10, 1)
+    expected = baseline['%s/10' % scenario]
+
+    assert result['writes'] == expected['writes']
+    assert result['deepcopy_calls'] == expected['deepcopy_calls']
+
+
+@pytest.mark.parametrize('scenario', SCENARIOS)
+def test_scenario_pages(modules, page_size, scenario):
+    # lists of 60 are read in single page by default and in three of 25
+    whole = reconcile.measure(modules, scenario, 60, 1)
+    reconcile.FakeSession.page_size = 25
+    paged = reconcile.measure(modules, scenario, 60, 1)
+
+    assert paged['writes'] == whole['writes']
+    assert paged['deepcopy_calls'] == whole['deepcopy_calls']
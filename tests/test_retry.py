@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2020, muradm <mail@muradm.net>
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import pytest
+
+from linode_api4 import ApiError
+from requests import ConnectionError, ConnectTimeout, ReadTimeout
+from ansible_collections.muradm.linode.plugins.module_utils.linode.retry import (
+    LinodeRetryPolicy, linode_retry_create)
+from ansible_collections.muradm.linode.plugins.module_utils.linode.session import LinodeResponse, LinodeSession
+
+
+def _response(status):
+    return LinodeResponse(status, {}, b'{}')
+
+
+@pytest.mark.parametrize('method, error, expected', [
+    # connection was not established, nothing was sent
+    ('POST', ConnectTimeout(), True),
+    ('GET', ConnectTimeout(), True),
+    # request might have been processed
+    ('POST', ReadTimeout(), False),
+    ('POST', ConnectionError(), False),
+    ('GET', ReadTimeout(), True),
+    ('PUT', ConnectionError(), True),
+    ('DELETE', ReadTimeout(), True),
+    ('GET', ValueError(), False),
+])
+def test_should_retry_error(method, error, expected):
+    assert LinodeRetryPolicy().should_retry(method, 0, error=error) is expected
+
+
+@pytest.mark.parametrize('method, status, expected', [
+    ('GET', 429, True),
+    ('GET', 500, True),
+    ('PUT', 502, True),
+    ('DELETE', 503, True),
+    ('GET', 504, True),
+    ('POST', 503, False),
+    ('GET', 400, False),
+    ('GET', 404, False),
+    ('DELETE', 404, False),
+    ('GET', 200, False),
+])
+def test_should_retry_response(method, status, expected):
+    assert LinodeRetryPolicy().should_retry(method, 0, response=_response(status)) is expected
+
+
+def test_should_retry_attempts():
+    policy = LinodeRetryPolicy(attempts=2)
+
+    assert policy.should_retry('GET', 1, response=_response(503))
+    assert not policy.should_retry('GET', 2, response=_response(503))
+    assert not policy.should_retry('GET', 2, error=ConnectTimeout())
+
+
+def test_delay_within_backoff():
+    policy = LinodeRetryPolicy(backoff=0.5, backoff_max=3.0)
+
+    for attempt in range(10):
+        assert 0 <= policy.delay(attempt) <= min(3.0, 0.5 * (2 ** attempt))
+
+
+def test_succeeded():
+    policy = LinodeRetryPolicy()
+
+    assert policy.succeeded('DELETE', 1, _response(404))
+    assert not policy.succeeded('DELETE', 0, _response(404))
+    assert not policy.succeeded('GET', 1, _response(404))
+    assert not policy.succeeded('DELETE', 1, _response(500))
+
+
+class FakeSession(object):
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.retry = LinodeRetryPolicy(attempts=3, backoff=0)
+        self.stats = {}
+
+    def count(self, stat, value=1):
+        self.stats[stat] = self.stats.get(stat, 0) + value
+
+    # stands for requests session of LinodeSession too
+    def mount(self, prefix, adapter):
+        pass
+
+    def request(self, method, url, **kwargs):
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+class FakeClient(object):
+    def __init__(self, session):
+        self.session = session
+
+
+def _create(outcomes):
+    calls = []
+
+    def create():
+        calls.append(1)
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    return create, calls
+
+
+def test_retry_create_succeeds():
+    session = FakeSession([])
+    create, calls = _create(['created'])
+
+    assert linode_retry_create(FakeClient(session), create, lambda: None) == 'created'
+    assert len(calls) == 1
+    assert session.stats == {}
+
+
+def test_retry_create_finds_created():
+    session = FakeSession([])
+    create, calls = _create([ApiError('503', status=503)])
+
+    assert linode_retry_create(FakeClient(session), create, lambda: 'found') == 'found'
+    assert len(calls) == 1
+    assert session.stats == {'retries': 1}
+
+
+def test_retry_create_creates_again():
+    session = FakeSession([])
+    create, calls = _create([ReadTimeout(), ApiError('502', status=502), 'created'])
+
+    assert linode_retry_create(FakeClient(session), create, lambda: None) == 'created'
+    assert len(calls) == 3
+    assert session.stats == {'retries': 2}
+
+
+def test_retry_create_not_transient():
+    session = FakeSession([])
+    create, calls = _create([ApiError('400', status=400)])
+
+    with pytest.raises(ApiError):
+        linode_retry_create(FakeClient(session), create, lambda: 'found')
+    assert len(calls) == 1
+
+
+def test_retry_create_attempts():
+    session = FakeSession([])
+    create, calls = _create([ReadTimeout()] * 4)
+
+    with pytest.raises(ReadTimeout):
+        linode_retry_create(FakeClient(session), create, lambda: None)
+    assert len(calls) == 4
+
+
+def test_retry_create_without_policy():
+    session = FakeSession([])
+    session.retry = None
+    create, calls = _create([ReadTimeout()])
+
+    with pytest.raises(ReadTimeout):
+        linode_retry_create(FakeClient(session), create, lambda: 'found')
+
+
+def _session(outcomes):
+    return LinodeSession(FakeSession(outcomes), retry=LinodeRetryPolicy(attempts=3, backoff=0))
+
+
+def test_send_retried_delete_not_found():
+    # first DELETE was carried out, but its response was lost
+    session = _session([ReadTimeout(), _response(404)])
+
+    response = session.send('DELETE', 'https://api.linode.com/v4/volumes/1')
+
+    assert response.status_code == 200
+    assert response.json() == {}
+    assert response.linode_retries == 1
+
+
+def test_send_delete_not_found():
+    session = _session([_response(404)])
+
+    assert session.send('DELETE', 'https://api.linode.com/v4/volumes/1').status_code == 404
+
+
+def test_send_retried_get_not_found():
+    session = _session([_response(503), _response(404)])
+
+    assert session.send('GET', 'https://api.linode.com/v4/volumes/1').status_code == 404
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2020, muradm <mail@muradm.net>
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+'''
+Play snapshot invalidation: writes drop or amend entries of their path and
+paths above and below it, in every process of the run.
+'''
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import multiprocessing
+import tempfile
+
+import pytest
+
+from ansible_collections.muradm.linode.plugins.module_utils.linode.domain_record import (
+    _domain_records_amended, _domain_records_indexed)
+from ansible_collections.muradm.linode.plugins.module_utils.linode.session import LinodeResponse, LinodeSession
+from ansible_collections.muradm.linode.plugins.module_utils.linode.snapshot import LinodeSnapshot, _related
+
+
+RECORDS = 'domains/5/records'
+
+
+@pytest.fixture
+def snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
+    return LinodeSnapshot('token')
+
+
+def _record(id, name):
+    return {'id': id, 'type': 'A', 'name': name, 'target': '10.0.0.%d' % id}
+
+
+def _records():
+    return _domain_records_indexed({'7': _record(7, 'www'), '8': _record(8, 'mail')})
+
+
+# record writes amend records of the domain and keep domains as is
+AMEND = {
+    'domains': lambda data, path, response: data,
+    RECORDS: _domain_records_amended,
+}
+
+
+class Loads(object):
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self.loaded = []
+
+    def get(self, key, data):
+        def load():
+            self.loaded.append(key)
+            return data() if callable(data) else data
+
+        return self.snapshot.get(key, load)
+
+
+def _fill(snapshot):
+    loads = Loads(snapshot)
+    loads.get('domains', {'example.com': 5})
+    loads.get(RECORDS, _records)
+    loads.get('linode/instances', {'web-0': 1})
+    loads.get('linode/instances#lookup', {'web-0': 1})
+    return loads
+
+
+@pytest.mark.parametrize('key, path, expected', [
+    ('domains', 'domains', True),
+    ('domains', 'domains/5', True),
+    ('domains/5/records', 'domains/5/records/7', True),
+    ('domains/5/records', 'domains', True),
+    ('linode/instances#lookup', 'linode/instances/1', True),
+    ('domains/5/records', 'domains/6/records/7', False),
+    ('domains/5', 'domains/50', False),
+    ('linode/instances', 'volumes/1', False),
+])
+def test_related(key, path, expected):
+    assert _related(key, path) is expected
+
+
+def test_loaded_once(snapshot):
+    loads = _fill(snapshot)
+    _fill(snapshot)
+
+    assert loads.loaded == ['domains', RECORDS, 'linode/instances', 'linode/instances#lookup']
+
+
+def test_write_to_child_drops_parents(snapshot):
+    _fill(snapshot)
+
+    snapshot.written('/domains/5/records/7')
+
+    loads = _fill(snapshot)
+    assert loads.loaded == ['domains', RECORDS]
+
+
+def test_write_to_parent_drops_children(snapshot):
+    _fill(snapshot)
+
+    snapshot.written('domains/5')
+
+    loads = _fill(snapshot)
+    assert loads.loaded == ['domains', RECORDS]
+
+
+def test_write_drops_entries_with_suffix(snapshot):
+    _fill(snapshot)
+
+    snapshot.written('linode/instances/1')
+
+    loads = _fill(snapshot)
+    assert loads.loaded == ['linode/instances', 'linode/instances#lookup']
+
+
+def test_create_amends(snapshot):
+    _fill(snapshot)
+
+    snapshot.written(RECORDS, AMEND, _record(9, 'ftp'))
+
+    loads = Loads(snapshot)
+    records = loads.get(RECORDS, _records)
+    loads.get('domains', {})
+    assert loads.loaded == []
+    assert sorted(records['ids'].keys()) == ['7', '8', '9']
+    assert records['index']['A:ftp:10.0.0.9'] == '9'
+
+
+def test_update_amends(snapshot):
+    _fill(snapshot)
+
+    snapshot.written(RECORDS + '/7', AMEND, dict(_record(7, 'www'), target='10.0.1.7'))
+
+    records = snapshot.get(RECORDS, None)
+    assert records['ids']['7']['target'] == '10.0.1.7'
+    assert records['index'] == {'A:www:10.0.1.7': '7', 'A:mail:10.0.0.8': '8'}
+
+
+def test_delete_removes_entry(snapshot):
+    _fill(snapshot)
+
+    snapshot.written(RECORDS + '/7', AMEND, {})
+
+    records = snapshot.get(RECORDS, None)
+    assert sorted(records['ids'].keys()) == ['8']
+    assert records['index'] == {'A:mail:10.0.0.8': '8'}
+
+
+def test_failed_write_drops_amended(snapshot):
+    _fill(snapshot)
+
+    # no response, write failed or its outcome is not known
+    snapshot.written(RECORDS + '/7', AMEND, None)
+
+    loads = _fill(snapshot)
+    assert loads.loaded == ['domains', RECORDS]
+
+
+def test_write_while_loading_not_stored(snapshot):
+    loads = Loads(snapshot)
+
+    def load():
+        snapshot.written(RECORDS + '/7')
+        return _records()
+
+    loads.get(RECORDS, load)
+    loads.get(RECORDS, _records)
+
+    assert loads.loaded == [RECORDS, RECORDS]
+
+
+def _worker(queue):
+    # snapshot of the same token and run, in forked worker
+    snapshot = LinodeSnapshot('token')
+    loads = Loads(snapshot)
+    loads.get(RECORDS, _records)
+    snapshot.written(RECORDS + '/7', AMEND, {})
+    snapshot.written('linode/instances/1')
+    queue.put(loads.loaded)
+
+
+def test_second_process_sees_writes(snapshot):
+    _fill(snapshot)
+
+    context = multiprocessing.get_context('fork')
+    queue = context.Queue()
+    worker = context.Process(target=_worker, args=(queue,))
+    worker.start()
+    worker.join(30)
+
+    assert worker.exitcode == 0
+    # worker used entry loaded here
+    assert queue.get(timeout=5) == []
+
+    loads = _fill(snapshot)
+    assert loads.loaded == ['linode/instances', 'linode/instances#lookup']
+    assert sorted(snapshot.get(RECORDS, None)['ids'].keys()) == ['8']
+
+
+class FakeRequests(object):
+    # stands for requests session of LinodeSession
+    def mount(self, prefix, adapter):
+        pass
+
+    def request(self, method, url, **kwargs):
+        return LinodeResponse(200, {}, b'{}')
+
+
+def test_lookups_dropped_by_writes_without_snapshot(snapshot):
+    session = LinodeSession(FakeRequests())
+    session.lookups = snapshot
+    loads = Loads(snapshot)
+    loads.get('volumes#lookup', {'data': 1})
+    loads.get('linode/instances#lookup', {'web-0': 1})
+
+    session.request('DELETE', 'https://api.linode.com/v4/volumes/1')
+
+    loads.get('volumes#lookup', {'data': 1})
+    loads.get('linode/instances#lookup', {'web-0': 1})
+    assert loads.loaded == ['volumes#lookup', 'linode/instances#lookup', 'volumes#lookup']
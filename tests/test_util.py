@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2020, muradm <mail@muradm.net>
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+import stat
+import tempfile
+
+import pytest
+
+from ansible.errors import AnsibleError
+from ansible_collections.muradm.linode.plugins.module_utils.linode.util import _linode_runtime_dir
+
+
+@pytest.fixture
+def tmpdir(tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
+    return tmp_path
+
+
+def _base(tmpdir):
+    return str(tmpdir / ('ansible-linode-%d' % os.getuid()))
+
+
+def test_runtime_dir_is_private(tmpdir):
+    path = _linode_runtime_dir('1')
+
+    assert path == os.path.join(_base(tmpdir), '1')
+    for p in [_base(tmpdir), path]:
+        assert stat.S_IMODE(os.lstat(p).st_mode) == 0o700
+
+    # existing private one is accepted
+    assert _linode_runtime_dir('1') == path
+
+
+def test_runtime_dir_readable_by_others(tmpdir):
+    os.mkdir(_base(tmpdir), 0o700)
+    os.chmod(_base(tmpdir), 0o755)
+
+    _linode_runtime_dir('1')
+
+    assert stat.S_IMODE(os.lstat(_base(tmpdir)).st_mode) == 0o700
+
+
+def test_runtime_dir_writable_by_others(tmpdir):
+    os.mkdir(_base(tmpdir), 0o700)
+    os.chmod(_base(tmpdir), 0o777)
+
+    with pytest.raises(AnsibleError):
+        _linode_runtime_dir('1')
+
+
+def test_runtime_dir_symlink(tmpdir):
+    target = str(tmpdir / 'elsewhere')
+    os.mkdir(target, 0o700)
+    os.symlink(target, _base(tmpdir))
+
+    with pytest.raises(AnsibleError):
+        _linode_runtime_dir()
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2020, muradm <mail@muradm.net>
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from contextlib import contextmanager
+
+from ansible_collections.muradm.linode.plugins.module_utils.linode import client as linode_client, filter as linode_filter
+
+
+class FakeSession(object):
+    def count(self, stat, value=1):
+        pass
+
+    @contextmanager
+    def uncached(self):
+        yield
+
+
+class FakeClient(object):
+    def __init__(self):
+        self.session = FakeSession()
+        self.statuses = {}
+
+
+class FakeObject(object):
+    def __init__(self, client, id, status):
+        self._client = client
+        self.id = id
+        self.status = status
+        self._raw_json = {'id': id, 'status': status}
+
+    def _populate(self, json):
+        self.status = json['status']
+
+
+class FakeInstance(FakeObject):
+    pass
+
+
+class FakeVolume(FakeObject):
+    pass
+
+
+def _find_many(client, cls, field, values):
+    return {i: cls(client, i, client.statuses[(cls, i)]) for i in values}
+
+
+def test_wait_for_all_same_id_of_different_types(monkeypatch):
+    monkeypatch.setattr(linode_filter, 'linode_find_many', _find_many)
+    monkeypatch.setattr(linode_client, 'sleep', lambda delay: None)
+
+    client = FakeClient()
+    instance = FakeInstance(client, 1, 'provisioning')
+    volume = FakeVolume(client, 1, 'active')
+    other = FakeVolume(client, 2, 'creating')
+    client.statuses = {(FakeInstance, 1): 'running', (FakeVolume, 2): 'active'}
+
+    waited = linode_client.linode_wait_for_all(
+        [instance, volume, other], {FakeInstance: 'running', FakeVolume: 'active'})
+
+    assert waited['ready'] == [instance, volume, other]
+    assert waited['timed_out'] == []
+    assert sorted(waited['ready_in'].keys(), key=lambda k: (k[0].__name__, k[1])) == [
+        (FakeInstance, 1), (FakeVolume, 1), (FakeVolume, 2)]
+    assert waited['ready_in'][(FakeVolume, 1)] == 0.0
+    assert waited['time_to_ready']['min'] == 0.0
+    assert waited['polls'] == 1